@@ -12,6 +12,104 @@ const routes = {
     'about': ['components/about.html']
 };
 
+/**
+ * Blog listing index written by build_blog.py (components/blog/index.json):
+ * page_size, posts, pages and tags [{name, slug, posts, pages}]. Revalidated
+ * on each load, since it changes whenever a post is added.
+ */
+let blogIndexPromise = null;
+
+function loadBlogIndex() {
+    if (!blogIndexPromise) {
+        blogIndexPromise = fetch('components/blog/index.json', { cache: 'no-cache' })
+            .then(response => response.ok ? response.json() : null)
+            .catch(() => null); // Not built: resolve sub-routes without checking them
+    }
+    return blogIndexPromise;
+}
+
+/**
+ * Resolves a page name to the components it loads.
+ * The blog listing is split into pages and tag shards by build_blog.py,
+ * addressed by sub-routes of 'blog':
+ *   blog          -> components/blog.html (page 1)
+ *   blog/2        -> components/blog/page-2.html
+ *   blog/tag/spa  -> components/blog/tag/spa.html
+ *   blog/tag/spa/2 -> components/blog/tag/spa-2.html
+ * Sub-routes are checked against the blog index; a page or tag it does not
+ * list resolves to the first listing page.
+ * @param {string} pageName - A route key, optionally with a sub-route
+ */
+async function resolveComponents(pageName) {
+    const parts = pageName.split('/');
+    if (parts[0] === 'blog' && parts.length > 1) {
+        const index = await loadBlogIndex();
+        const inRange = (number, pages) => !index || (/^\d+$/.test(number) && Number(number) >= 1 && Number(number) <= pages);
+        if (parts[1] === 'tag' && parts[2]) {
+            const number = parts[3] || '1';
+            const tag = index ? index.tags.find(entry => entry.slug === parts[2]) : null;
+            if (index && (!tag || !inRange(number, tag.pages))) return routes['blog'];
+            const page = (number !== '1') ? `-${number}` : '';
+            return [`components/blog/tag/${parts[2]}${page}.html`];
+        }
+        if (parts[1] === '1' || !inRange(parts[1], index ? index.pages : 0)) return routes['blog'];
+        return [`components/blog/page-${parts[1]}.html`];
+    }
+    return routes[pageName] || routes['home'];
+}
+
+/**
+ * True if the page name (e.g. a URL hash) is a known route or a sub-route of one.
+ */
+function isRoute(pageName) {
+    return Boolean(routes[pageName.split('/')[0]]);
+}
+
+/**
+ * Route manifest written by build_site.py: route -> content-hashed bundle
+ * holding all of the route's components. Bundle names change with their
+ * content, so bundles are cached normally; only the manifest is revalidated.
+ */
+let routeManifestPromise = null;
+
+function loadRouteManifest() {
+    if (!routeManifestPromise) {
+        routeManifestPromise = fetch('assets/bundles/manifest.json', { cache: 'no-cache' })
+            .then(response => response.ok ? response.json() : {})
+            .catch(() => ({})); // Not built: fetch components directly
+    }
+    return routeManifestPromise;
+}
+
+/**
+ * Returns the HTML of a page: its bundle if one was built, otherwise its
+ * components fetched in parallel. Each component is wrapped in a <div>
+ * (bundles already contain the same wrappers).
+ * @param {string} pageName - A route key, optionally with a sub-route
+ */
+async function fetchPageHtml(pageName) {
+    const manifest = await loadRouteManifest();
+    const bundle = manifest[pageName];
+    if (bundle) {
+        const response = await fetch(bundle);
+        if (response.ok) return response.text();
+    }
+
+    // Sub-routes (blog pages) and unbundled builds
+    const components = await resolveComponents(pageName);
+    const parts = await Promise.all(components.map(async componentPath => {
+        // Cache busting for development; bundles and fingerprinted components
+        // (name.<hash>.html, see build_site.py) are cacheable as they are
+        const url = /\.[0-9a-f]{12}\.html$/.test(componentPath)
+            ? componentPath
+            : `${componentPath}?v=${new Date().getTime()}`;
+        const response = await fetch(url);
+        if (!response.ok) throw new Error(`Failed to load ${componentPath}`);
+        return `<div>${await response.text()}</div>`;
+    }));
+    return parts.join('');
+}
+
 /**
  * Loads page content dynamically
  * @param {string} pageName - The key in the routes object
@@ -26,21 +124,9 @@ async function loadPage(pageName) {
     // Scroll to top
     mainContent.scrollTop = 0;
 
-    // Get components for this route
-    const components = routes[pageName] || routes['home'];
-
     try {
-        for (const componentPath of components) {
-            // Cache busting for development
-            const response = await fetch(`${componentPath}?v=${new Date().getTime()}`);
-            if (!response.ok) throw new Error(`Failed to load ${componentPath}`);
-            const html = await response.text();
-
-            // Create a wrapper div or append directly
-            const wrapper = document.createElement('div');
-            wrapper.innerHTML = html;
-            mainContent.appendChild(wrapper);
-        }
+        // One request per route (see fetchPageHtml)
+        mainContent.innerHTML = await fetchPageHtml(pageName);
     } catch (error) {
         console.error('Error loading page:', error);
         mainContent.innerHTML = '<div class="container"><p>Error loading content.</p></div>';
@@ -65,7 +151,9 @@ function updateActiveNav(pageName) {
      * Highlights the link corresponding to the current page.
      */
     // Map 'resume' alias to 'home' for highlighting
-    const targetPage = (pageName === 'resume') ? 'home' : pageName;
+    // Sub-routes (e.g. 'blog/2') highlight their parent
+    const basePage = pageName.split('/')[0];
+    const targetPage = (basePage === 'resume') ? 'home' : basePage;
 
     document.querySelectorAll('.nav-menu li a').forEach(link => {
         link.classList.remove('active');
@@ -115,13 +203,31 @@ function updateDownloadLinks(pageName) {
 }
 
 
+/**
+ * Activates a page prerendered by build_site.py (<route>/index.html): the
+ * content is already in place, so only the navigation state is updated.
+ * @param {string} pageName - The route the page was prerendered for
+ */
+function hydratePage(pageName) {
+    updateActiveNav(pageName);
+    updateDownloadLinks(pageName);
+}
+
 // Initial Load
 document.addEventListener('DOMContentLoaded', () => {
     // Check for hash in URL (e.g. #about)
     const hash = window.location.hash.substring(1);
 
+    // Prerendered route pages hydrate instead of fetching their own content again
+    const mainContent = document.getElementById('content-area');
+    const prerendered = mainContent ? mainContent.dataset.prerendered : null;
+    if (prerendered && (!hash || hash === prerendered)) {
+        hydratePage(prerendered);
+        return;
+    }
+
     // Validate hash against routes, default to 'home'
-    const page = routes[hash] ? hash : 'home';
+    const page = isRoute(hash) ? hash : 'home';
 
     loadPage(page);
 });
@@ -129,7 +235,7 @@ document.addEventListener('DOMContentLoaded', () => {
 // Handle Back/Forward Browser Buttons
 window.addEventListener('hashchange', () => {
     const hash = window.location.hash.substring(1);
-    if (routes[hash]) {
+    if (isRoute(hash)) {
         loadPage(hash);
     }
 });
@@ -0,0 +1,117 @@
+/**
+ * Client-side site search over the prebuilt index (assets/search-index.json),
+ * written by build_blog.py and generate.py (see engine/search_index.py).
+ * The index is fetched once, on first use; queries never touch the server.
+ */
+let searchIndexPromise = null;
+
+function loadSearchIndex() {
+    if (!searchIndexPromise) {
+        searchIndexPromise = fetch('assets/search-index.json')
+            .then(response => {
+                if (!response.ok) throw new Error('Failed to load search index');
+                return response.json();
+            })
+            .catch(error => {
+                searchIndexPromise = null; // Retry on the next query
+                throw error;
+            });
+    }
+    return searchIndexPromise;
+}
+
+/**
+ * Ids of the documents containing a term that starts with `word`.
+ * The prefix table narrows the scan to terms sharing the first two characters.
+ */
+function matchWord(index, word) {
+    const ids = new Set();
+    const bounds = index.prefixes[word.substring(0, 2)];
+    if (!bounds) return ids;
+    for (let position = bounds[0]; position < bounds[1]; position++) {
+        if (!index.terms[position].startsWith(word)) continue;
+        let id = 0;
+        for (const delta of index.postings[position]) {
+            id += delta;
+            ids.add(id);
+        }
+    }
+    return ids;
+}
+
+/**
+ * Documents matching every word of the query (each word as a prefix),
+ * ignoring the stop words the index was built without.
+ * @param {string} query - Free text, e.g. "sage pipe"
+ * @returns {Promise<Array<{url: string, title: string, summary: string}>>}
+ */
+async function searchSite(query) {
+    let words = (query.toLowerCase().match(/[a-z0-9]+/g) || []).filter(word => word.length > 1);
+    if (!words.length) return [];
+    const index = await loadSearchIndex();
+    // Stop words are not in the index; keeping them would empty every result.
+    // A last word still being typed ("in" -> "infra") is kept if it prefixes a term.
+    const stopWords = new Set(index.stop_words || []);
+    const typing = /[a-z0-9]$/i.test(query);
+    words = words.filter((word, position) => !stopWords.has(word) ||
+        (typing && position === words.length - 1 && matchWord(index, word).size > 0));
+    if (!words.length) return [];
+
+    let matches = null;
+    for (const word of words) {
+        const ids = matchWord(index, word);
+        matches = matches ? new Set([...matches].filter(id => ids.has(id))) : ids;
+        if (!matches.size) break;
+    }
+    return [...matches].map(id => {
+        const [url, title, summary] = index.docs[id];
+        return { url, title, summary };
+    });
+}
+
+function renderSearchResults(results, list) {
+    list.innerHTML = '';
+    for (const result of results) {
+        const item = document.createElement('li');
+        const link = document.createElement('a');
+        link.href = result.url;
+        link.textContent = result.title;
+        const summary = document.createElement('p');
+        summary.textContent = result.summary;
+        item.appendChild(link);
+        item.appendChild(summary);
+        list.appendChild(item);
+    }
+    if (!results.length) {
+        list.innerHTML = '<li class="search-empty">No results</li>';
+    }
+}
+
+document.addEventListener('DOMContentLoaded', () => {
+    const input = document.getElementById('site-search');
+    const list = document.getElementById('search-results');
+    if (!input || !list) return;
+
+    // Start the download as soon as the user shows interest
+    input.addEventListener('focus', () => loadSearchIndex().catch(() => {}), { once: true });
+    input.addEventListener('input', async () => {
+        const query = input.value;
+        if (!query.trim()) {
+            list.innerHTML = '';
+            return;
+        }
+        try {
+            const results = await searchSite(query);
+            if (input.value === query) renderSearchResults(results, list); // Drop stale responses
+        } catch (error) {
+            console.error('Search failed:', error);
+        }
+    });
+    // Clear the results once one is opened
+    list.addEventListener('click', event => {
+        if (event.target.closest('a')) {
+            input.value = '';
+            list.innerHTML = '';
+        }
+    });
+});
@@ -1,109 +1,348 @@
 import os
+import re
+import json
+import argparse
 import yaml
-import markdown
 from pathlib import Path
 from datetime import datetime
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from jinja2 import Template
 
+from engine.scheduler import resolve_worker_count
+from engine.manifest import BlogManifest, hash_bytes
+from engine.markdown_cache import convert_markdown
+from engine import html_minify
+from engine.html_minify import minify_html
+from engine.search_index import SearchIndex, SEARCH_INDEX_PATH, html_text
+
 # Config
 BASE_DIR = Path(__file__).parent
 DATA_DIR = BASE_DIR / "data" / "blog"
 OUTPUT_DIR = BASE_DIR / "blog"
 COMPONENT_OUTPUT = BASE_DIR / "components" / "blog.html"
+INDEX_DIR = BASE_DIR / "components" / "blog"
 TEMPLATE_PATH = BASE_DIR / "templates" / "blog_post.html"
+MANIFEST_PATH = BASE_DIR / ".blog_manifest.json"
+
+# Pipeline sizing (see generate_blog). At most two batches of posts (the one
+# being converted and the one being written) hold full content at a time.
+BATCH_SIZE = 32
+READ_THREADS = 8
 
-def render_markdown(file_path):
+# Posts per listing page (components/blog.html, components/blog/...)
+POSTS_PER_PAGE = 10
+
+def read_source(file_path):
     with open(file_path, "r", encoding="utf-8") as f:
-        # Split Frontmatter and Content
-        raw = f.read()
-        parts = raw.split("---", 2)
-        if len(parts) < 3:
-            print(f"Skipping {file_path}: Invalid Frontmatter")
-            return None
-        
-        frontmatter = yaml.safe_load(parts[1])
-        md_content = parts[2]
-        
-        html_content = markdown.markdown(md_content, extensions=['fenced_code', 'codehilite'])
-        
-        return {
-            "meta": frontmatter,
-            "content": html_content
-        }
+        return file_path, f.read()
 
-def generate_blog():
-    # Ensure output dir exists
-    OUTPUT_DIR.mkdir(exist_ok=True)
+def convert_post(source):
+    """
+    Splits frontmatter from a post's raw text and converts the Markdown body
+    (including code highlighting). Runs in the conversion worker processes.
+    Args:
+        source (tuple): (file_path, raw text) from read_source().
+    Returns:
+        dict: {'file', 'meta', 'content'}, or None if the frontmatter is invalid.
+    """
+    file_path, raw = source
+    # Split Frontmatter and Content
+    parts = raw.split("---", 2)
+    if len(parts) < 3:
+        print(f"Skipping {file_path}: Invalid Frontmatter")
+        return None
     
-    posts = []
+    frontmatter = yaml.safe_load(parts[1])
+    md_content = parts[2]
     
-    # Load Template
-    with open(TEMPLATE_PATH, "r", encoding="utf-8") as f:
-        template_str = f.read()
-        template = Template(template_str)
+    # Shared Markdown instance and highlight cache (see engine/markdown_cache.py)
+    html_content = convert_markdown(md_content)
+    
+    return {
+        "file": file_path,
+        "meta": frontmatter,
+        "content": html_content
+    }
 
-    # Process each MD file
-    for md_file in DATA_DIR.glob("*.md"):
-        print(f"Processing {md_file.name}...")
-        data = render_markdown(md_file)
-        if not data:
-            continue
-            
-        meta = data['meta']
-        slug = meta.get('slug', md_file.stem)
-        output_file = OUTPUT_DIR / f"{slug}.html"
-        
-        # Render Standalone Page
-        final_html = template.render(
-            title=meta['title'],
-            date=meta['date'],
-            tags=meta['tags'],
-            summary=meta.get('summary', ''),
-            content=data['content']
-        )
-        
+def batches(items, size):
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+def write_pages(pages, minify=True):
+    for output_file, html in pages:
         with open(output_file, "w", encoding="utf-8") as out:
-            out.write(final_html)
-            
-        # Add to list for component
-        posts.append({
-            "title": meta['title'],
-            "date": meta['date'],
-            "summary": meta.get('summary', ''),
-            "tags": meta['tags'],
-            "link": f"blog/{slug}.html"
-        })
+            out.write(minify_html(html) if minify else html)
 
-    # Sort posts by date (newest first)
-    posts.sort(key=lambda x: x['date'], reverse=True)
-    
-    # Generate Component List HTML
-    component_html = '<div class="container"><h1>Blog</h1><div class="blog-list">'
+def listing_entry(meta, slug):
+    return {
+        "title": meta['title'],
+        "date": meta['date'],
+        "summary": meta.get('summary', ''),
+        "tags": meta['tags'],
+        "link": f"blog/{slug}.html"
+    }
+
+def builder_fingerprint(minify=True):
+    """Hash of this script, the post template and the minifier (if used); a change invalidates every built post."""
+    minifier = Path(html_minify.__file__).read_bytes() if minify else b'unminified'
+    return hash_bytes(Path(__file__).read_bytes() + TEMPLATE_PATH.read_bytes() + minifier)
+
+def tag_slug(tag):
+    return re.sub(r'[^a-z0-9]+', '-', str(tag).lower()).strip('-') or 'tag'
+
+def listing_path(page, tag=None):
+    """
+    Component file of one listing page, relative to the site root. Page 1 of
+    all posts stays at components/blog.html (the router's 'blog' route).
+    """
+    if tag:
+        suffix = f"-{page}" if page > 1 else ""
+        return f"components/blog/tag/{tag}{suffix}.html"
+    return "components/blog.html" if page == 1 else f"components/blog/page-{page}.html"
+
+def listing_route(page, tag=None):
+    """Hash route of a listing page (see resolveComponents in assets/js/router.js)."""
+    route = f"blog/tag/{tag}" if tag else "blog"
+    return f"#{route}/{page}" if page > 1 else f"#{route}"
+
+def render_listing(posts, page, pages, tag=None, tag_name=None, tags=()):
+    """Renders one listing page (a slice of posts) as an HTML component."""
+    html = ['<div class="container"><h1>Blog</h1>']
+    if tag:
+        html.append(f'<p class="blog-filter">Posts tagged <strong>{tag_name}</strong> &middot; '
+                    f'<a href="{listing_route(1)}">All posts</a></p>')
+    elif tags:
+        links = "".join(f'<a class="tag" href="{listing_route(1, slug)}">{name}</a>' for slug, name, _ in tags)
+        html.append(f'<div class="blog-tags">{links}</div>')
+    html.append('<div class="blog-list">')
     
     for post in posts:
-        tags_html = "".join([f'<span class="tag">{t}</span>' for t in post['tags']])
-        component_html += f"""
+        tags_html = "".join([f'<a class="tag" href="{listing_route(1, tag_slug(t))}">{t}</a>' for t in post['tags']])
+        html.append(f"""
         <div class="blog-card">
             <h3><a href="{post['link']}">{post['title']}</a></h3>
             <div class="meta">{post['date']} • {tags_html}</div>
             <p>{post['summary']}</p>
             <a href="{post['link']}" class="read-more">Read Article &rarr;</a>
         </div>
-        """
+        """)
+    
+    html.append('</div>')
+    if pages > 1:
+        html.append('<nav class="blog-pager">')
+        if page > 1:
+            html.append(f'<a href="{listing_route(page - 1, tag)}">&larr; Newer</a>')
+        html.append(f'<span>Page {page} of {pages}</span>')
+        if page < pages:
+            html.append(f'<a href="{listing_route(page + 1, tag)}">Older &rarr;</a>')
+        html.append('</nav>')
+    html.append('</div>')
+    return "".join(html)
+
+def paginate(posts, page_size):
+    return [posts[start:start + page_size] for start in range(0, len(posts), page_size)] or [[]]
+
+def write_blog_index(posts, page_size=POSTS_PER_PAGE, minify=True):
+    """
+    Writes the blog listing as small components instead of one page with every post:
+    - components/blog.html and components/blog/page-<n>.html: all posts, page_size per page
+    - components/blog/tag/<tag>[-<n>].html: the same, per tag
+    - components/blog/index.json: page and tag counts, which the router checks sub-routes against
+    Shards left over from a previous build (e.g. a tag no longer used) are removed.
+    Args:
+        posts (list): Listing entries, newest first.
+        page_size (int): Posts per listing page.
+        minify (bool): Minify the listing components.
+    """
+    by_tag = {}
+    for post in posts:
+        for tag in post['tags']:
+            slug = tag_slug(tag)
+            by_tag.setdefault(slug, (tag, []))[1].append(post)
+    tags = sorted((slug, name, tagged) for slug, (name, tagged) in by_tag.items())
+
+    shards = {}
+    pages = paginate(posts, page_size)
+    for number, page_posts in enumerate(pages, 1):
+        shards[listing_path(number)] = render_listing(page_posts, number, len(pages), tags=tags)
+    tag_index = []
+    for slug, name, tagged in tags:
+        tag_pages = paginate(tagged, page_size)
+        for number, page_posts in enumerate(tag_pages, 1):
+            shards[listing_path(number, slug)] = render_listing(page_posts, number, len(tag_pages), slug, name)
+        tag_index.append({"name": name, "slug": slug, "posts": len(tagged), "pages": len(tag_pages)})
+
+    index = {"page_size": page_size, "posts": len(posts), "pages": len(pages), "tags": tag_index}
+    if minify:
+        shards = {path: minify_html(html) for path, html in shards.items()}
+    shards["components/blog/index.json"] = json.dumps(index, separators=(',', ':'), ensure_ascii=False)
+
+    INDEX_DIR.mkdir(exist_ok=True)
+    for existing in INDEX_DIR.rglob("*"):
+        if existing.is_file() and existing.relative_to(BASE_DIR).as_posix() not in shards:
+            existing.unlink()
+    for path, content in shards.items():
+        output = BASE_DIR / path
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(content)
+
+def generate_blog(jobs=1, batch_size=BATCH_SIZE, force=False, page_size=POSTS_PER_PAGE, minify=True):
+    """
+    Builds the post pages, the blog list component, the blog's part of the
+    search index (engine/search_index.py) and the sitemap.
+
+    Posts flow through a pipeline in batches: the next batch's files are read
+    on a thread pool while the current batch is converted (Markdown and code
+    highlighting, on a process pool when jobs > 1), rendered and handed to a
+    writer thread. Only listing metadata is kept for the whole blog.
+
+    The build is incremental (see engine.manifest.BlogManifest): unchanged
+    posts are not re-rendered, so their pages keep their mtime (the sitemap's
+    <lastmod>); pages of deleted posts are removed; the listing components
+    (see write_blog_index) are only rewritten when the listing changes.
+    Args:
+        jobs (int): Conversion worker processes (0 = one per CPU core, 1 = in-process).
+        batch_size (int): Posts per batch.
+        force (bool): Ignore the manifest and rebuild every post.
+        page_size (int): Posts per listing page.
+        minify (bool): Minify the post pages and listing components.
+    """
+    # Ensure output dir exists
+    OUTPUT_DIR.mkdir(exist_ok=True)
+    
+    posts = []
+    manifest = BlogManifest(MANIFEST_PATH, BASE_DIR, builder_fingerprint(minify))
+    search = SearchIndex(BASE_DIR / SEARCH_INDEX_PATH)
+    # Unchanged posts keep their indexed terms; without an index every post must be converted
+    if force or not search.path.exists():
+        manifest.entries = {}
     
-    component_html += '</div></div>'
+    # Load Template
+    with open(TEMPLATE_PATH, "r", encoding="utf-8") as f:
+        template_str = f.read()
+        template = Template(template_str)
+
+    md_files = sorted(DATA_DIR.glob("*.md"))
+    workers = resolve_worker_count(jobs, len(md_files))
+    converter = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    convert = converter.map if converter else map
+    sources_seen = set()
+    stale_outputs = []
+    rendered = 0
+
+    with ThreadPoolExecutor(max_workers=READ_THREADS) as readers, \
+         ThreadPoolExecutor(max_workers=1) as writer:
+        pending_write = None
+        file_batches = batches(md_files, batch_size)
+        batch = next(file_batches, None)
+        reads = [readers.submit(read_source, path) for path in batch or []]
+        try:
+            while batch:
+                sources = [read.result() for read in reads]
+                # Prefetch the next batch while this one is converted
+                batch = next(file_batches, None)
+                reads = [readers.submit(read_source, path) for path in batch or []]
+
+                # Unchanged posts only contribute their recorded listing entry
+                changed = []
+                source_hashes = {}
+                for file_path, raw in sources:
+                    key = manifest.key(file_path)
+                    sources_seen.add(key)
+                    source_hashes[key] = hash_bytes(raw.encode('utf-8'))
+                    meta = manifest.fresh_meta(key, source_hashes[key])
+                    if meta is None:
+                        changed.append((file_path, raw))
+                    else:
+                        posts.append(listing_entry(meta, meta.get('slug', file_path.stem)))
+
+                pages = []
+                for data in convert(convert_post, changed):
+                    if not data:
+                        continue
+                    print(f"Processing {data['file'].name}...")
+                    
+                    meta = data['meta']
+                    slug = meta.get('slug', data['file'].stem)
+                    output_file = OUTPUT_DIR / f"{slug}.html"
+                    
+                    # Render Standalone Page
+                    final_html = template.render(
+                        title=meta['title'],
+                        date=meta['date'],
+                        tags=meta['tags'],
+                        summary=meta.get('summary', ''),
+                        content=data['content']
+                    )
+                    pages.append((output_file, final_html))
+                    rendered += 1
+                    
+                    # Add to list for component (as recorded, so fresh and cached entries compare alike)
+                    key = manifest.key(data['file'])
+                    moved_from = manifest.record(key, source_hashes[key], meta, output_file)
+                    if moved_from:
+                        stale_outputs.append(moved_from)
+                    posts.append(listing_entry(manifest.entries[key]['meta'], slug))
+                    search.add(f"blog/{slug}.html", meta['title'],
+                               " ".join([meta.get('summary', ''), " ".join(map(str, meta['tags'])),
+                                         html_text(data['content'])]),
+                               'blog', summary=meta.get('summary', ''))
+
+                # One batch is written while the next is converted; waiting for
+                # the previous write first bounds memory to two batches
+                if pending_write:
+                    pending_write.result()
+                pending_write = writer.submit(write_pages, pages, minify)
+            if pending_write:
+                pending_write.result()
+        finally:
+            if converter:
+                converter.shutdown()
+
+    # Remove pages of deleted posts (and old pages of renamed slugs)
+    stale_outputs += manifest.prune(sources_seen)
+    live_outputs = manifest.outputs()
+    for output in stale_outputs:
+        stale_path = BASE_DIR / output
+        if output not in live_outputs and stale_path.exists():
+            print(f"Removing {output} (source deleted or renamed)")
+            stale_path.unlink()
+
+    # Sort posts by date (newest first)
+    posts.sort(key=lambda x: x['date'], reverse=True)
     
-    with open(COMPONENT_OUTPUT, "w", encoding="utf-8") as f:
-        f.write(component_html)
+    # The page size is part of the listing: changing it re-shards the index
+    listing_changed = manifest.update_listing({'page_size': page_size, 'minify': minify, 'posts': posts})
+    if listing_changed or not COMPONENT_OUTPUT.exists():
+        write_blog_index(posts, page_size, minify)
+    if rendered or stale_outputs or listing_changed:
+        search.retain('blog', {post['link'] for post in posts})
+        search.save()
+    manifest.save()
         
-    print(f"Successfully generated {len(posts)} posts.")
+    print(f"Successfully generated {len(posts)} posts ({rendered} rendered, {len(posts) - rendered} up to date).")
 
-    # 4. Update Sitemap
-    try:
-        from generate_sitemap import generate_sitemap
-        generate_sitemap()
-    except Exception as e:
-        print(f"Warning: Failed to generate sitemap: {e}")
+    # 4. Update Sitemap (only when a page was added, changed or removed)
+    if rendered or stale_outputs or listing_changed or not (BASE_DIR / "sitemap.xml").exists():
+        try:
+            from generate_sitemap import generate_sitemap
+            generate_sitemap()
+        except Exception as e:
+            print(f"Warning: Failed to generate sitemap: {e}")
 
 if __name__ == "__main__":
-    generate_blog()
+    parser = argparse.ArgumentParser(description="Build the blog pages, list component and sitemap")
+    parser.add_argument('--jobs', '-j', type=int, default=1, help='Worker processes for Markdown conversion (0 = one per CPU core)')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='Posts read, converted and written per pipeline batch')
+    parser.add_argument('--force', action='store_true', help='Rebuild every post, ignoring the blog manifest')
+    parser.add_argument('--page-size', type=int, default=POSTS_PER_PAGE, help='Posts per blog listing page')
+    parser.add_argument('--no-minify', action='store_true', help='Write pages and listing components unminified')
+    args = parser.parse_args()
+    generate_blog(jobs=args.jobs, batch_size=max(1, args.batch_size), force=args.force,
+                  page_size=max(1, args.page_size), minify=not args.no_minify)
@@ -0,0 +1,46 @@
+import argparse
+from pathlib import Path
+
+from engine.site_bundle import build_route_bundles
+from engine.site_compress import Compressor
+from engine.site_fingerprint import Fingerprinter
+from engine.site_output import SITE_DIR, copy_sources
+from engine.site_prerender import prerender_routes
+from generate_sitemap import BASE_URL, generate_sitemap
+
+BASE_DIR = Path(__file__).parent
+
+def build_site(base_dir=BASE_DIR, jobs=0, force=False):
+    """
+    Post-build stages for the static site. Run after generate.py and
+    build_blog.py, whose components and pages it packages. The site is built
+    in base_dir/_site (the directory to deploy); the sources are only read.
+    1. Copy: the served sources are mirrored into _site (engine/site_output.py).
+    2. Fingerprinting: content-hashed copies of scripts, styles, images and components,
+       referenced from index.html, the components and the pages (engine/site_fingerprint.py).
+    3. Route bundles: one cacheable fragment per route in router.js's table
+       (engine/site_bundle.py), built from the rewritten components, so the
+       asset URLs inside bundles are hashed too.
+    4. Prerendering: <route>/index.html with the route's content in place, for
+       crawlers and first paint (engine/site_prerender.py). _site/sitemap.xml is
+       written afterwards, so it lists them.
+    5. Compression: .gz/.br siblings of every text output, for servers that send
+       precompressed files (engine/site_compress.py). Runs last, on the final bytes.
+    Args:
+        jobs (int): Compression worker processes (0 = one per CPU core, 1 = in-process).
+        force (bool): Recompress every file, even if unchanged since the last build.
+    """
+    site_dir = Path(base_dir) / SITE_DIR
+    copy_sources(base_dir, site_dir)
+    Fingerprinter(site_dir).run()
+    build_route_bundles(site_dir)
+    prerender_routes(site_dir, BASE_URL)
+    generate_sitemap(site_dir)
+    Compressor(site_dir).run(jobs=jobs, force=force)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Package the generated components for the static site")
+    parser.add_argument('--jobs', '-j', type=int, default=0, help='Worker processes for compression (0 = one per CPU core)')
+    parser.add_argument('--force', action='store_true', help='Recompress every output, ignoring the compression manifest')
+    args = parser.parse_args()
+    build_site(jobs=args.jobs, force=args.force)
@@ -0,0 +1,116 @@
+import copy
+from pathlib import Path
+
+# Output file extension per format
+FORMAT_EXTENSIONS = {'docx': 'docx', 'html': 'html', 'md': 'md', 'pdf': 'pdf'}
+
+# Layout families a matrix layout entry may define (same keys as generate.get_targets_config)
+LAYOUT_FAMILIES = ('docx', 'web', 'pdf')
+
+DEFAULT_NAME = "{layout}-{theme}-{content}"
+
+def deep_merge(base, overrides):
+    """
+    Returns a copy of `base` with `overrides` merged in recursively.
+    Nested dicts are merged key by key; any other value replaces the base value.
+    """
+    merged = copy.deepcopy(base)
+    for key, value in (overrides or {}).items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = deep_merge(merged[key], value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+def substitute_content_keys(sections, substitutions):
+    """
+    Swaps 'content_key' references in a layout before it is resolved.
+    e.g. {'summary_data_eng': 'summary_acme'} makes every block that pulls
+    'summary_data_eng' from the store pull 'summary_acme' instead.
+    Args:
+        sections (list): The 'sections' list of a layout (modified in place).
+        substitutions (dict): old content_key -> new content_key.
+    Returns:
+        list: The same sections list.
+    """
+    if not substitutions:
+        return sections
+    for block in sections:
+        config = block.get('config')
+        if config and config.get('content_key') in substitutions:
+            config['content_key'] = substitutions[config['content_key']]
+    return sections
+
+def _layout_paths(value, base_dir):
+    """A matrix layout is either one file for every format or a {docx/web/pdf: file} mapping."""
+    if isinstance(value, dict):
+        return {family: base_dir / value[family] for family in LAYOUT_FAMILIES if family in value}
+    return {family: base_dir / value for family in LAYOUT_FAMILIES}
+
+def expand_matrix(matrix, base_dir):
+    """
+    Expands a variants matrix (layouts x themes x content substitutions) into
+    the individual variants to render.
+
+    Matrix format:
+        output_dir: output/variants         # relative to the project root
+        formats: [docx, html, md, pdf]      # default: all
+        name: "{layout}-{theme}-{content}"  # output file stem
+        layouts:
+          resume: {docx: data/resume_docx.yaml, web: data/resume.yaml, pdf: data/resume_pdf.yaml}
+          data_eng: data/resume_data_eng.yaml
+        themes:                             # overrides deep-merged into style.yaml's theme
+          default: {}
+          green: {primary_color: "#1b5e20"}
+        content:                            # content_key substitutions
+          default: {}
+          acme: {summary_data_eng: summary_acme}
+
+    Args:
+        matrix (dict): The parsed matrix file.
+        base_dir (Path): Project root, layout paths are relative to it.
+    Returns:
+        dict: variant name -> {'layouts', 'theme', 'content', 'substitutions'}, in matrix order.
+    """
+    layouts = matrix.get('layouts') or {}
+    themes = matrix.get('themes') or {'default': {}}
+    contents = matrix.get('content') or {'default': {}}
+    name_format = matrix.get('name', DEFAULT_NAME)
+
+    if not layouts:
+        raise ValueError("Variants matrix defines no 'layouts'")
+
+    variants = {}
+    for layout_name, layout_value in layouts.items():
+        layout_paths = _layout_paths(layout_value, Path(base_dir))
+        for theme_name in themes:
+            for content_name, substitutions in contents.items():
+                name = name_format.format(layout=layout_name, theme=theme_name, content=content_name)
+                if name in variants:
+                    raise ValueError(f"Variant name '{name}' is not unique; adjust 'name' in the matrix")
+                variants[name] = {
+                    'layouts': layout_paths,
+                    'theme': theme_name,
+                    'content': content_name,
+                    'substitutions': substitutions or {},
+                }
+    return variants
+
+def build_themes(base_theme, matrix):
+    """Resolves every theme variant once, up front, so workers never re-merge them."""
+    themes = matrix.get('themes') or {'default': {}}
+    return {name: deep_merge(base_theme, overrides) for name, overrides in themes.items()}
+
+def plan_variant_jobs(variants, matrix):
+    """One (variant, format) job per variant and requested format, skipping formats without a layout."""
+    formats = matrix.get('formats') or ['docx', 'html', 'md', 'pdf']
+    unknown = [fmt for fmt in formats if fmt not in FORMAT_EXTENSIONS]
+    if unknown:
+        raise ValueError(f"Unknown format(s) in variants matrix: {', '.join(unknown)}")
+    jobs = []
+    for name, variant in variants.items():
+        for fmt in formats:
+            family = 'web' if fmt in ('html', 'md') else fmt
+            if family in variant['layouts']:
+                jobs.append((name, fmt))
+    return jobs
@@ -0,0 +1,140 @@
+import re
+from pathlib import Path
+from collections.abc import Mapping
+
+import yaml
+
+from engine.profiler import stage
+from engine.yaml_cache import SafeLoader
+
+# A top-level mapping key at column 0: `key:` / `"key":` followed by whitespace or EOL
+TOP_LEVEL_KEY = re.compile(rb'^("(?P<dq>[^"]*)"|\'(?P<sq>[^\']*)\'|(?P<plain>[A-Za-z0-9_][^:#\s]*))\s*:(\s|$)')
+
+# Anchors (&name) and aliases (*name) can reference across entries, which breaks
+# per-entry parsing. Files using them are loaded whole instead (false positives
+# only cost speed, never correctness).
+ANCHOR_OR_ALIAS = re.compile(rb'(^|[\s\[{,:-])[&*][A-Za-z0-9_-]')
+
+class ContentStore(Mapping):
+    """
+    Lazily-loaded view of the global content store (store.yaml).
+
+    Instead of parsing the whole store up front, each source file is scanned
+    once for its top-level keys and the byte range of every entry. An entry is
+    only read and parsed the first time a layout asks for it, so the cost of
+    a build scales with the keys a layout references rather than the size of
+    the store.
+
+    Sources may be a single store.yaml and/or a sharded directory of YAML files
+    (e.g. data/store/*.yaml); later sources win if a key is defined twice.
+    Files that cannot be split safely (anchors/aliases, non-mapping documents)
+    fall back to a full parse of that file.
+    """
+
+    def __init__(self, sources):
+        """
+        Args:
+            sources (list): Paths of YAML files, each a mapping of content keys.
+        """
+        self.sources = [Path(p) for p in sources]
+        self._index = {}      # key -> (path, start, end) or (path, None, None) for whole-file sources
+        self._entries = {}    # key -> parsed value
+        self._whole_files = {}
+        with stage('store.index'):
+            for path in self.sources:
+                self._index_file(path)
+
+    @classmethod
+    def from_paths(cls, store_file, shard_dir=None):
+        """Builds a store from store.yaml plus an optional shard directory (*.yaml, sorted by name)."""
+        sources = []
+        if store_file and Path(store_file).exists():
+            sources.append(Path(store_file))
+        if shard_dir and Path(shard_dir).is_dir():
+            sources.extend(sorted(Path(shard_dir).glob('*.yaml')))
+        return cls(sources)
+
+    # --- INDEXING ---
+
+    def _index_file(self, path):
+        data = path.read_bytes()
+        if ANCHOR_OR_ALIAS.search(data):
+            self._index_whole_file(path)
+            return
+
+        file_index = {}
+        current_key, current_start = None, None
+        offset = 0
+        for line in data.splitlines(keepends=True):
+            first = line[:1]
+            if first in (b' ', b'\t', b'#', b'\r', b'\n', b''):
+                pass # Continuation, comment or blank line
+            elif line.startswith(b'---') and current_key is None:
+                pass # Document start marker before the first entry
+            else:
+                match = TOP_LEVEL_KEY.match(line)
+                if not match:
+                    # Not a plain flat mapping (flow style, sequences, multi-doc...)
+                    self._index_whole_file(path)
+                    return
+                if current_key is not None:
+                    file_index[current_key] = (path, current_start, offset)
+                raw_key = match.group('dq') or match.group('sq') or match.group('plain')
+                current_key = raw_key.decode('utf-8')
+                current_start = offset
+            offset += len(line)
+        if current_key is not None:
+            file_index[current_key] = (path, current_start, offset)
+
+        for key, location in file_index.items():
+            self._entries.pop(key, None)
+            self._index[key] = location
+
+    def _index_whole_file(self, path):
+        loaded = self._load_whole_file(path)
+        for key, value in loaded.items():
+            self._index[key] = (path, None, None)
+            self._entries[key] = value
+
+    def _load_whole_file(self, path):
+        if path not in self._whole_files:
+            with open(path, 'r', encoding='utf-8') as f:
+                loaded = yaml.load(f, Loader=SafeLoader) or {}
+            if not isinstance(loaded, dict):
+                print(f"WARNING: Store file {path} is not a mapping; ignoring it.")
+                loaded = {}
+            self._whole_files[path] = loaded
+        return self._whole_files[path]
+
+    # --- LOOKUP ---
+
+    def _load_entry(self, key):
+        path, start, end = self._index[key]
+        if start is None:
+            return self._load_whole_file(path).get(key)
+
+        with open(path, 'rb') as f:
+            f.seek(start)
+            chunk = f.read(end - start)
+        parsed = yaml.load(chunk.decode('utf-8'), Loader=SafeLoader)
+        if not isinstance(parsed, dict) or list(parsed) != [key]:
+            # The slice did not parse as a single entry; trust a full parse instead
+            return self._load_whole_file(path).get(key)
+        return parsed[key]
+
+    def __getitem__(self, key):
+        if key not in self._entries:
+            if key not in self._index:
+                raise KeyError(key)
+            with stage('store.parse'):
+                self._entries[key] = self._load_entry(key)
+        return self._entries[key]
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
@@ -0,0 +1,332 @@
+import re
+
+# Minifier for generated pages and components, applied when they are saved:
+# HTML whitespace is collapsed, comments and duplicate attributes dropped,
+# and inline <style> blocks are minified as CSS (see minify_css).
+
+# Elements whose content is not HTML text; <style> content is minified as CSS
+RAW_ELEMENTS = ('pre', 'textarea', 'script', 'style')
+
+# Whitespace next to these tags is never rendered (it is at the start or end
+# of a line box), so it can be dropped instead of collapsed to one space
+BLOCK_TAGS = frozenset("""
+!doctype address article aside blockquote body br center dd details dialog div dl dt fieldset figcaption
+figure footer form h1 h2 h3 h4 h5 h6 head header hr html li link main meta nav ol p pre section summary
+table tbody td tfoot th thead title tr ul
+""".split())
+
+TOKEN = re.compile(r"""
+    (?P<comment><!--.*?-->)
+  | (?P<raw><(?P<raw_name>pre|textarea|script|style)\b(?:"[^"]*"|'[^']*'|[^'">])*>)(?P<raw_body>.*?)(?P<raw_end></(?P=raw_name)\s*>)
+  | (?P<tag></?[a-zA-Z!?](?:"[^"]*"|'[^']*'|[^'">])*>)
+  | (?P<text>[^<]+|<)
+""", re.S | re.I | re.X)
+TAG_NAME = re.compile(r'</?([a-zA-Z0-9!?-]+)')
+ATTRIBUTE = re.compile(r"""([^\s"'>/=]+)(?:\s*=\s*("[^"]*"|'[^']*'|[^\s"'=<>`]+))?""")
+HTML_SPACE = re.compile(r'[ \t\n\r\f]+')  # Not \s: &nbsp; (U+00A0) is content
+
+# CSS: strings are copied as is, comments removed
+CSS_STRING_OR_COMMENT = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|/\*.*?\*/', re.S)
+CSS_CLASS = re.compile(r'\.(-?[_a-zA-Z][\w-]*)')
+IMPORTANT = re.compile(r'\s*!\s*important\s*$', re.I)
+# At-rules whose block holds rules (the others hold declarations, e.g. @page)
+NESTED_AT_RULES = ('media', 'supports', 'container', 'layer', 'document')
+
+def tag_name(tag):
+    match = TAG_NAME.match(tag)
+    return match.group(1).lower() if match else ''
+
+def split_outside(text, separator):
+    """Splits on `separator` outside strings, parentheses and brackets."""
+    parts, depth, quote, start = [], 0, None, 0
+    for i, char in enumerate(text):
+        if quote:
+            if char == quote and text[i - 1] != '\\':
+                quote = None
+        elif char in '"\'':
+            quote = char
+        elif char in '([':
+            depth += 1
+        elif char in ')]':
+            depth = max(0, depth - 1)
+        elif char == separator and not depth:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return parts
+
+def collapse_css(text, tight=''):
+    """Collapses whitespace outside strings and removes it around the characters in `tight`."""
+    out, depth, quote, pending_space = [], 0, None, False
+    for i, char in enumerate(text):
+        if quote:
+            out.append(char)
+            if char == quote and text[i - 1] != '\\':
+                quote = None
+            continue
+        if char.isspace():
+            pending_space = True
+            continue
+        if pending_space and out and not (depth == 0 and (char in tight or out[-1] in tight)):
+            out.append(' ')
+        pending_space = False
+        if char in '"\'':
+            quote = char
+        elif char in '([':
+            depth += 1
+        elif char in ')]':
+            depth = max(0, depth - 1)
+        out.append(char)
+    return ''.join(out)
+
+def parse_declarations(body):
+    """Returns [(property, value, important)], whitespace collapsed."""
+    declarations = []
+    for part in split_outside(body, ';'):
+        name, colon, value = part.partition(':')
+        name = name.strip()
+        if not colon or not name:
+            if part.strip():
+                declarations.append((collapse_css(part).strip(), None, False))
+            continue
+        important = bool(IMPORTANT.search(value))
+        value = IMPORTANT.sub('', value)
+        if not name.startswith('--'):  # Custom property values are kept as written
+            value = collapse_css(value, ',')
+        declarations.append((name, value.strip(), important))
+    return declarations
+
+def repeats(later, earlier):
+    """
+    True if declaration `later` (in the same or a later rule with the same
+    selector) is an exact repeat of `earlier`: same property, value and
+    !important. Declarations with different values are all kept, since an
+    earlier one is the fallback for browsers that reject a later one
+    (`height: 100vh; height: 100dvh`, `display: block; display: grid`).
+    """
+    if later[1] is None or earlier[1] is None:
+        return False
+    return later[0].lower() == earlier[0].lower() and later[1:] == earlier[1:]
+
+def drop_repeated(declarations, later=()):
+    """Removes declarations repeated by a later one in the list or in `later`."""
+    kept = []
+    for declaration in reversed(declarations):
+        if not any(repeats(other, declaration) for other in kept + list(later)):
+            kept.append(declaration)
+    kept.reverse()
+    return kept
+
+def serialize_declarations(declarations):
+    return ';'.join(name if value is None else f"{name}:{value}{'!important' if important else ''}"
+                    for name, value, important in declarations)
+
+def minify_declarations(text):
+    """Minifies a declaration list, e.g. an HTML style attribute."""
+    return serialize_declarations(drop_repeated(parse_declarations(text)))
+
+def selector_classes(selector):
+    """Classes an element must have to match `selector` (:not(...), [attr] and strings ignored)."""
+    depth, plain = 0, []
+    for char in CSS_STRING_OR_COMMENT.sub('', selector):
+        if char in '([':
+            depth += 1
+        elif char in ')]':
+            depth = max(0, depth - 1)
+        elif not depth:
+            plain.append(char)
+    return set(CSS_CLASS.findall(''.join(plain)))
+
+def find_block_end(css, start):
+    """Index of the '}' closing the block that starts after css[start - 1] == '{'."""
+    depth, quote = 1, None
+    for i in range(start, len(css)):
+        char = css[i]
+        if quote:
+            if char == quote and css[i - 1] != '\\':
+                quote = None
+        elif char in '"\'':
+            quote = char
+        elif char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if not depth:
+                return i
+    return len(css)
+
+def parse_rules(css, top_level=True):
+    """
+    Parses a stylesheet (comments already removed) into a list of
+    ('rule', selector, body), ('at', prelude, body) and ('statement', text).
+    Like a browser, a stray '}' at the top level becomes part of the next
+    rule's selector (making that rule invalid); inside a block it ends the block.
+    """
+    items, pos, prelude_start, quote, depth = [], 0, 0, None, 0
+    while pos < len(css):
+        char = css[pos]
+        if quote:
+            if char == quote and css[pos - 1] != '\\':
+                quote = None
+        elif char in '"\'':
+            quote = char
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth = max(0, depth - 1)
+        elif not depth and char == ';' and css[prelude_start:pos].strip().startswith('@'):
+            items.append(('statement', css[prelude_start:pos].strip()))
+            prelude_start = pos + 1
+        elif not depth and char == '{':
+            end = find_block_end(css, pos + 1)
+            prelude = css[prelude_start:pos].strip()
+            items.append(('at' if prelude.startswith('@') else 'rule', prelude, css[pos + 1:end]))
+            pos = prelude_start = end + 1
+            continue
+        elif not depth and char == '}' and not top_level:
+            break
+        pos += 1
+    return items
+
+def minify_rules(items, classes, prune):
+    """Minifies parsed rules; drops dead selectors (if `prune`), repeated declarations and empty rules."""
+    out = []
+    later = {}  # selector -> declarations of later rules with that exact selector
+    for item in reversed(items):
+        kind = item[0]
+        if kind == 'statement':
+            out.append(collapse_css(item[1]) + ';')
+            continue
+        prelude, body = item[1], item[2]
+        if kind == 'at':
+            name = re.match(r'@([\w-]+)', prelude)
+            name = name.group(1).lower() if name else ''
+            prelude = collapse_css(prelude, ':,')
+            if name in NESTED_AT_RULES or name.endswith('keyframes'):
+                # Keyframe selectors (from, 50%) are not classes: never pruned
+                inner = minify_rules(parse_rules(body, top_level=False), classes,
+                                     prune and not name.endswith('keyframes'))
+            else:
+                inner = serialize_declarations(drop_repeated(parse_declarations(body)))
+            if inner:
+                out.append(f"{prelude}{{{inner}}}")
+            continue
+
+        selectors = [collapse_css(selector, ',>+~').strip() for selector in split_outside(prelude, ',')]
+        if prune and classes is not None:
+            selectors = [selector for selector in selectors if selector_classes(selector) <= classes]
+        if not selectors:
+            continue
+        selector = ','.join(selectors)
+        declarations = drop_repeated(parse_declarations(body), later.get(selector, ()))
+        later.setdefault(selector, []).extend(declarations)
+        if declarations:
+            out.append(f"{selector}{{{serialize_declarations(declarations)}}}")
+    out.reverse()
+    return ''.join(out)
+
+def minify_css(css, classes=None):
+    """
+    Minifies a stylesheet: comments and whitespace removed, declarations
+    repeated later in the same rule or in a later rule with the same
+    selector dropped, empty rules removed.
+    Args:
+        css (str): Stylesheet text.
+        classes (set, optional): Class names used by the document. When given,
+                                 selectors needing any other class are removed.
+    Returns:
+        str: The minified stylesheet.
+    """
+    css = CSS_STRING_OR_COMMENT.sub(lambda match: match.group(1) or '', css)
+    return minify_rules(parse_rules(css), classes, classes is not None)
+
+def minify_tag(tag):
+    """Start tag with whitespace collapsed, duplicate attributes (the browser keeps the first) and duplicate classes removed."""
+    name_match = TAG_NAME.match(tag)
+    end = -2 if tag.endswith('/>') else -1
+    attributes, seen = [], set()
+    for name, value in ATTRIBUTE.findall(tag[name_match.end():end]):
+        key = name.lower()
+        if key in seen:
+            continue
+        seen.add(key)
+        if value[:1] in '"\'' and value:
+            quote, inner = value[0], value[1:-1]
+            if key == 'class':
+                inner = ' '.join(dict.fromkeys(inner.split()))
+            elif key == 'style' and '&' not in inner:
+                inner = minify_declarations(inner)
+            value = f"{quote}{inner}{quote}"
+        attributes.append(f"{name}={value}" if value else name)
+    return '<' + ' '.join([name_match.group(1)] + attributes) + ('/>' if end == -2 else '>')
+
+def used_classes(tokens):
+    classes = set()
+    for match in tokens:
+        tag = match.group('tag') or match.group('raw')
+        if tag and not tag.startswith(('</', '<!')):
+            for name, value in ATTRIBUTE.findall(tag):
+                if name.lower() == 'class':
+                    classes.update(value.strip('"\'').split())
+    return classes
+
+def minify_html(html, prune_css=True):
+    """
+    Minifies an HTML page or component.
+    - Whitespace runs become one space, and are removed next to block-level
+      tags; <pre>, <textarea> and <script> content is kept as is.
+    - Comments are removed (except conditional comments).
+    - Tags: duplicate attributes and classes removed, style attributes minified.
+    - <style> blocks are minified with minify_css. With `prune_css`, rules
+      for classes that appear in no class attribute of this document are
+      dropped, unless the document has a <script> (which could add classes).
+    Args:
+        html (str): The document.
+        prune_css (bool): Remove CSS rules for classes the document does not use.
+    Returns:
+        str: The minified document.
+    """
+    tokens = [match for match in TOKEN.finditer(html)
+              if not (match.group('comment') and not match.group('comment').startswith('<!--[if'))]
+    has_script = any((match.group('raw_name') or '').lower() == 'script' for match in tokens)
+    classes = used_classes(tokens) if prune_css and not has_script else None
+
+    # Adjacent text (e.g. around a removed comment) is one text node
+    nodes = []  # (kind, text, tag name)
+    for match in tokens:
+        if match.group('text') is not None:
+            if nodes and nodes[-1][0] == 'text':
+                nodes[-1] = ('text', nodes[-1][1] + match.group('text'), '')
+            else:
+                nodes.append(('text', match.group('text'), ''))
+        elif match.group('raw'):
+            name = match.group('raw_name').lower()
+            body = match.group('raw_body')
+            if name == 'style':
+                body = minify_css(body, classes)
+                if not body:
+                    continue  # Nothing left to apply
+            nodes.append(('raw', minify_tag(match.group('raw')) + body + f"</{name}>", name))
+        elif match.group('comment'):
+            nodes.append(('raw', match.group('comment'), ''))
+        else:
+            tag = match.group('tag')
+            name = tag_name(tag)
+            if tag.startswith('</'):
+                tag = f"</{name}>"
+            elif not tag.startswith(('<!', '<?')):
+                tag = minify_tag(tag)
+            nodes.append(('tag', tag, name))
+
+    out = []
+    for i, (kind, text, name) in enumerate(nodes):
+        if kind != 'text':
+            out.append(text)
+            continue
+        text = HTML_SPACE.sub(' ', text)
+        if i == 0 or nodes[i - 1][2] in BLOCK_TAGS:
+            text = text.lstrip(' ')
+        if i == len(nodes) - 1 or nodes[i + 1][2] in BLOCK_TAGS:
+            text = text.rstrip(' ')
+        out.append(text)
+    return ''.join(out)
@@ -0,0 +1,228 @@
+import json
+import hashlib
+from pathlib import Path
+
+MANIFEST_VERSION = 1
+
+def hash_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+def hash_value(value):
+    """
+    Content hash of a parsed YAML value (a store entry or a theme subtree).
+    Uses canonical JSON so key order in the YAML file does not matter.
+    """
+    canonical = json.dumps(value, sort_keys=True, default=str, ensure_ascii=False)
+    return hash_bytes(canonical.encode('utf-8'))
+
+class BuildManifest:
+    """
+    Records, per build output, the content hashes of everything it was built from:
+    - files: layout YAML, style.yaml, store.yaml (+ shards) and templates (raw bytes)
+    - code: the generator/renderer sources
+    - store_keys: each store.yaml entry pulled in by resolve_references
+    - theme: each top-level subtree of the theme
+    - options: command-line options that change the output (e.g. --external-css)
+
+    Freshness is checked coarse-to-fine. If every file hash still matches, the
+    output is skipped without parsing any YAML. Only when style.yaml or a store file
+    changed are they loaded, and then only the recorded keys/subtrees are compared,
+    so editing an unrelated store entry does not trigger a rebuild.
+    """
+
+    def __init__(self, path, base_dir):
+        self.path = Path(path)
+        self.base_dir = Path(base_dir)
+        self.entries = {}
+        self._file_hashes = {}
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == MANIFEST_VERSION:
+                    self.entries = data.get('outputs', {})
+            except (OSError, ValueError) as e:
+                print(f"Warning: Ignoring unreadable build manifest {self.path}: {e}")
+
+    def _rel(self, path):
+        try:
+            return Path(path).resolve().relative_to(self.base_dir.resolve()).as_posix()
+        except ValueError:
+            return Path(path).as_posix()
+
+    def file_hash(self, path):
+        """Hashes a file's bytes (memoized for the lifetime of the manifest). Missing files hash to None."""
+        key = self._rel(path)
+        if key not in self._file_hashes:
+            full = self.base_dir / key
+            self._file_hashes[key] = hash_bytes(full.read_bytes()) if full.exists() else None
+        return self._file_hashes[key]
+
+    def code_hash(self, source_paths):
+        """Single fingerprint over all generator source files."""
+        digest = hashlib.sha256()
+        for path in sorted(self._rel(p) for p in source_paths):
+            digest.update(path.encode('utf-8'))
+            digest.update((self.file_hash(path) or '').encode('utf-8'))
+        return digest.hexdigest()
+
+    def is_fresh(self, key, files, code, get_theme, get_store, theme_file, store_files, options=None):
+        """
+        Returns True if the output recorded under `key` can be reused.
+        Args:
+            key (str): Output id, e.g. 'resume/docx'.
+            files (list): The output's current input files (layout, style, store, templates).
+            code (str): Current code_hash() of the generator.
+            get_theme (callable): Returns the parsed theme (only called if style.yaml changed).
+            get_store (callable): Returns the content store (only called if a store file changed).
+            theme_file (Path): Path of style.yaml.
+            store_files (list): store.yaml and any store shard files.
+            options (dict, optional): Output-affecting options the build runs with; must match the recorded ones.
+        """
+        entry = self.entries.get(key)
+        if not entry or entry.get('code') != code:
+            return False
+        if entry.get('options', {}) != json_safe(options or {}):
+            return False # Built with different options (e.g. inline vs external CSS)
+        if not (self.base_dir / entry['output']).exists():
+            return False
+        if set(entry['files']) != {self._rel(p) for p in files}:
+            return False # An input (e.g. a store shard) was added or removed
+
+        theme_rel = self._rel(theme_file)
+        store_rels = {self._rel(p) for p in store_files}
+        theme_changed = store_changed = False
+        for path, recorded in entry['files'].items():
+            if self.file_hash(path) == recorded:
+                continue
+            if path == theme_rel:
+                theme_changed = True
+            elif path in store_rels:
+                store_changed = True
+            else:
+                return False
+
+        # Fine-grained checks, only when the coarse file hash moved
+        if theme_changed:
+            theme = get_theme()
+            for name, recorded in entry['theme'].items():
+                if hash_value(theme.get(name)) != recorded:
+                    return False
+            if set(theme) != set(entry['theme']):
+                return False
+        if store_changed:
+            store = get_store()
+            for name, recorded in entry['store_keys'].items():
+                if hash_value(store.get(name)) != recorded:
+                    return False
+
+        # Still fresh: remember the new file hashes so the next run takes the fast path
+        if theme_changed or store_changed:
+            for path in entry['files']:
+                entry['files'][path] = self.file_hash(path)
+        return True
+
+    def record(self, key, output, files, code, theme, store, store_keys, options=None):
+        """Stores the dependency hashes for a successfully built output."""
+        self.entries[key] = {
+            'output': self._rel(output),
+            'files': {self._rel(p): self.file_hash(p) for p in files},
+            'code': code,
+            'theme': {name: hash_value(value) for name, value in theme.items()},
+            'store_keys': {name: hash_value(store.get(name)) for name in sorted(store_keys)},
+            'options': json_safe(options or {}),
+        }
+
+    def discard(self, key):
+        self.entries.pop(key, None)
+
+    def save(self):
+        data = {'version': MANIFEST_VERSION, 'outputs': self.entries}
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+
+def json_safe(value):
+    """The value as it reads back from a JSON manifest (e.g. YAML dates become 'YYYY-MM-DD')."""
+    return json.loads(json.dumps(value, sort_keys=True, default=str, ensure_ascii=False))
+
+class BlogManifest:
+    """
+    Records, per blog post source (data/blog/*.md), the hash of its raw text,
+    its frontmatter and the page it was rendered to, plus a hash of the blog
+    list built from all posts.
+
+    A post whose source hash matches (and whose page still exists) is not
+    re-rendered; its listing entry is rebuilt from the recorded frontmatter.
+    `code` fingerprints the builder and page template: when it changes, every
+    entry is dropped and all posts are rebuilt.
+    """
+
+    def __init__(self, path, base_dir, code):
+        self.path = Path(path)
+        self.base_dir = Path(base_dir)
+        self.code = code
+        self.entries = {}
+        self.listing = None
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == MANIFEST_VERSION and data.get('code') == code:
+                    self.entries = data.get('posts', {})
+                    self.listing = data.get('listing')
+            except (OSError, ValueError) as e:
+                print(f"Warning: Ignoring unreadable blog manifest {self.path}: {e}")
+
+    def key(self, path):
+        try:
+            return Path(path).resolve().relative_to(self.base_dir.resolve()).as_posix()
+        except ValueError:
+            return Path(path).as_posix()
+
+    def fresh_meta(self, key, source_hash):
+        """Returns the recorded frontmatter if the post at `key` is unchanged and built, else None."""
+        entry = self.entries.get(key)
+        if not entry or entry['source'] != source_hash:
+            return None
+        if not (self.base_dir / entry['output']).exists():
+            return None
+        return entry['meta']
+
+    def record(self, key, source_hash, meta, output):
+        """
+        Stores a rendered post.
+        Returns:
+            str: The post's previous output path if it moved (e.g. a new slug), else None.
+        """
+        previous = self.entries.get(key, {}).get('output')
+        output = self.key(output)
+        self.entries[key] = {'source': source_hash, 'meta': json_safe(meta), 'output': output}
+        return previous if previous and previous != output else None
+
+    def prune(self, keep):
+        """
+        Drops entries whose source is not in `keep` (deleted posts).
+        Returns:
+            list: Output paths (relative to base_dir) of the dropped posts.
+        """
+        removed = [key for key in self.entries if key not in keep]
+        return [self.entries.pop(key)['output'] for key in removed]
+
+    def discard(self, key):
+        self.entries.pop(key, None)
+
+    def outputs(self):
+        return {entry['output'] for entry in self.entries.values()}
+
+    def update_listing(self, listing):
+        """Records the blog list's hash. Returns True if it differs from the last build."""
+        digest = hash_value(listing)
+        changed = digest != self.listing
+        self.listing = digest
+        return changed
+
+    def save(self):
+        data = {'version': MANIFEST_VERSION, 'code': self.code,
+                'listing': self.listing, 'posts': self.entries}
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, sort_keys=True)
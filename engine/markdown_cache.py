@@ -0,0 +1,107 @@
+import markdown
+from markdown.extensions import Extension
+from markdown.extensions.attr_list import get_attrs_and_remainder
+from markdown.extensions.codehilite import CodeHilite, HiliteTreeprocessor, parse_hl_lines
+from markdown.extensions.fenced_code import FencedBlockPreprocessor
+
+from engine.manifest import hash_value
+
+MARKDOWN_EXTENSIONS = ['fenced_code', 'codehilite']
+
+# Per-process state: one Markdown instance (extensions loaded once) and the
+# highlighted HTML of every code block seen so far, keyed by content hash.
+_markdown = None
+_highlight_cache = {}
+
+def highlight(src, shebang=True, **config):
+    """
+    CodeHilite(src, **config).hilite(shebang), memoized by content: a snippet
+    shared by several posts (same source, language and options) is lexed by
+    Pygments only once.
+    """
+    key = hash_value([src.strip('\n'), shebang, repr(sorted(config.items()))])
+    html = _highlight_cache.get(key)
+    if html is None:
+        html = _highlight_cache[key] = CodeHilite(src, **config).hilite(shebang)
+    return html
+
+class CachedFencedBlockPreprocessor(FencedBlockPreprocessor):
+    """
+    Fenced code blocks (```lang, ```{.lang .class hl_lines="1"}), highlighted
+    through highlight() with the codehilite configuration in `hilite_config`.
+    """
+
+    hilite_config = {}
+
+    def run(self, lines):
+        text = "\n".join(lines)
+        index = 0
+        while True:
+            match = self.FENCED_BLOCK_RE.search(text, index)
+            if not match:
+                break
+            lang, classes, config = match.group('lang'), [], {}
+            if match.group('attrs'):
+                attrs, remainder = get_attrs_and_remainder(match.group('attrs'))
+                if remainder:  # Unbalanced braces: not a fenced block
+                    index = match.end('attrs')
+                    continue
+                _, classes, config = self.handle_attrs(attrs)
+                lang = classes.pop(0) if classes else None
+            elif match.group('hl_lines'):
+                config['hl_lines'] = parse_hl_lines(match.group('hl_lines'))
+
+            local_config = dict(self.hilite_config, **config)
+            if classes:
+                # Pygments may append a suffix to the last class, so cssclass stays last
+                local_config['css_class'] = f"{' '.join(classes)} {local_config['css_class']}"
+            html = highlight(match.group('code'), shebang=False, lang=lang,
+                             style=local_config.pop('pygments_style', 'default'), **local_config)
+            placeholder = self.md.htmlStash.store(html)
+            text = f"{text[:match.start()]}\n{placeholder}\n{text[match.end():]}"
+            index = match.start() + 1 + len(placeholder)
+        return text.split("\n")
+
+class CachedHiliteTreeprocessor(HiliteTreeprocessor):
+    """Indented code blocks, highlighted through highlight()."""
+
+    def run(self, root):
+        for block in root.iter('pre'):
+            if len(block) == 1 and block[0].tag == 'code' and block[0].text is not None:
+                local_config = self.config.copy()
+                html = highlight(self.code_unescape(block[0].text), tab_length=self.md.tab_length,
+                                 style=local_config.pop('pygments_style', 'default'), **local_config)
+                placeholder = self.md.htmlStash.store(html)
+                # Replaced by the stashed HTML when the document is serialized
+                block.clear()
+                block.tag = 'p'
+                block.text = placeholder
+
+class CachedHighlightExtension(Extension):
+    """
+    Routes the code blocks of one Markdown instance through highlight() by
+    registering subclasses of the fenced_code and codehilite processors
+    (same names, priorities and configuration). Must be listed after both
+    extensions; other Markdown instances in the process are not affected.
+    """
+
+    def extendMarkdown(self, md):
+        hilite_config = md.treeprocessors['hilite'].config
+        fenced = CachedFencedBlockPreprocessor(md, md.preprocessors['fenced_code_block'].config)
+        fenced.hilite_config = hilite_config
+        md.preprocessors.register(fenced, 'fenced_code_block', 25)
+        hiliter = CachedHiliteTreeprocessor(md)
+        hiliter.config = hilite_config
+        md.treeprocessors.register(hiliter, 'hilite', 30)
+
+def get_markdown():
+    """Returns this process's Markdown instance, creating it on first use."""
+    global _markdown
+    if _markdown is None:
+        _markdown = markdown.Markdown(extensions=MARKDOWN_EXTENSIONS + [CachedHighlightExtension()])
+    return _markdown
+
+def convert_markdown(text):
+    """Same output as markdown.markdown(text, extensions=MARKDOWN_EXTENSIONS), without per-call setup."""
+    # reset() clears per-document state (stashed HTML, references, footnotes)
+    return get_markdown().reset().convert(text)
@@ -0,0 +1,136 @@
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+# The active Profiler of this process (None = profiling off, stage() is a no-op)
+_profiler = None
+_NO_PROFILE = nullcontext()
+
+def add_record(records, name, calls, wall, cpu, peak_kb):
+    record = records.setdefault(name, {'calls': 0, 'wall': 0.0, 'cpu': 0.0, 'peak_kb': 0.0})
+    record['calls'] += calls
+    record['wall'] += wall
+    record['cpu'] += cpu
+    record['peak_kb'] = max(record['peak_kb'], peak_kb)
+
+def merge_records(into, records):
+    """Folds records collected elsewhere (e.g. in a worker process) into `into`."""
+    for name, record in (records or {}).items():
+        add_record(into, name, record['calls'], record['wall'], record['cpu'], record['peak_kb'])
+    return into
+
+class Profiler:
+    """
+    Collects wall time, CPU time and peak memory per named build stage.
+
+    Stages nest (e.g. 'block.docx.text_block' inside 'render.docx'); each
+    stage's time includes its children. Memory is the peak traced allocation
+    above the stage's starting point (tracemalloc), so it only covers Python
+    allocations and is reported as the maximum over all calls.
+    """
+
+    def __init__(self):
+        self.records = {}  # stage -> {'calls', 'wall', 'cpu', 'peak_kb'}
+        self._stack = []
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def measure(self, name):
+        current, peak = tracemalloc.get_traced_memory()
+        if self._stack:
+            # Keep the enclosing stage's peak before resetting the counter for this one
+            self._stack[-1]['peak'] = max(self._stack[-1]['peak'], peak)
+        tracemalloc.reset_peak()
+        frame = {'start': current, 'peak': current}
+        self._stack.append(frame)
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            frame['peak'] = max(frame['peak'], tracemalloc.get_traced_memory()[1])
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1]['peak'] = max(self._stack[-1]['peak'], frame['peak'])
+            add_record(self.records, name, 1, wall, cpu, (frame['peak'] - frame['start']) / 1024)
+
+    def take(self):
+        """Returns the records collected so far and starts over (one set per job)."""
+        records, self.records = self.records, {}
+        return records
+
+def enable():
+    """
+    Turns profiling on for this process (idempotent). Also installs the block
+    probe, so every block handler in every renderer is measured as
+    'block.<format>.<type>'.
+    """
+    global _profiler
+    if _profiler is None:
+        _profiler = Profiler()
+        from renderers.registry import set_block_probe
+        set_block_probe(lambda fmt, block_type: stage(f"block.{fmt}.{block_type}"))
+    return _profiler
+
+def is_enabled():
+    return _profiler is not None
+
+def stage(name):
+    """
+    Context manager measuring one stage when profiling is on.
+    Usage:
+        with stage('yaml.load'):
+            data = ...
+    """
+    if _profiler is None:
+        return _NO_PROFILE
+    return _profiler.measure(name)
+
+def take_records():
+    """Records of this process since the last call ({} when profiling is off)."""
+    return _profiler.take() if _profiler is not None else {}
+
+def build_report(job_records, main_records, total_wall):
+    """
+    Combines per-job and main-process records into one report.
+    Args:
+        job_records (dict): job label (e.g. 'resume/docx') -> records.
+        main_records (dict): Records of stages run outside any job (loading style, indexing the store).
+        total_wall (float): Wall time of the whole build.
+    Returns:
+        dict: JSON-serializable report with per-stage totals and per-job breakdowns.
+    """
+    totals = merge_records({}, main_records)
+    for records in job_records.values():
+        merge_records(totals, records)
+    return {
+        'total_wall': total_wall,
+        'stages': totals,
+        'main': main_records,
+        'jobs': job_records,
+    }
+
+def write_report(report, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"Saved profile to: {path}")
+
+def format_report(report, limit=40):
+    """Human-readable table of the slowest stages (by summed wall time)."""
+    stages = sorted(report['stages'].items(), key=lambda item: item[1]['wall'], reverse=True)
+    width = max([30] + [len(name) for name, _ in stages[:limit]])
+    lines = [
+        "--- Profile (stages include nested stages; times summed over all jobs) ---",
+        f"{'stage':<{width}} {'calls':>6} {'wall':>9} {'cpu':>9} {'peak mem':>10}",
+    ]
+    for name, record in stages[:limit]:
+        lines.append(f"{name:<{width}} {record['calls']:>6} {record['wall']:8.3f}s {record['cpu']:8.3f}s "
+                     f"{record['peak_kb']:8.0f}KB")
+    if len(stages) > limit:
+        lines.append(f"... {len(stages) - limit} more stage(s) in the JSON report")
+    lines.append(f"Build wall time: {report['total_wall']:.3f}s")
+    return "\n".join(lines)
@@ -0,0 +1,130 @@
+import io
+import os
+import copy
+import time
+import traceback
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor
+
+from engine import profiler
+
+# Order in which formats are scheduled for a target.
+# This is also the order results are reported in, so output is deterministic.
+FORMAT_ORDER = ['docx', 'html', 'md', 'pdf']
+
+# Per-process state set by the pool initializer (see _init_worker).
+_worker_state = {}
+
+def plan_jobs(targets, fmt):
+    """
+    Expands the selected targets and format into a flat list of build jobs.
+    Args:
+        targets (list): Target names, e.g. ['resume', 'cv'].
+        fmt (str): A single format ('docx', 'html', ...) or 'all'.
+    Returns:
+        list: (target, format) tuples in deterministic order.
+    """
+    formats = FORMAT_ORDER if fmt == 'all' else [fmt]
+    return [(target, f) for target in targets for f in formats]
+
+def resolve_worker_count(jobs_arg, job_count):
+    """
+    Turns the --jobs value into an actual worker count.
+    0 (or a negative value) means "one worker per CPU core".
+    Never spawns more workers than there are jobs.
+    """
+    if jobs_arg is None or jobs_arg <= 0:
+        jobs_arg = os.cpu_count() or 1
+    return max(1, min(jobs_arg, job_count))
+
+def _init_worker(job_fn, context, shared, profile=False):
+    """Pool initializer: ships the shared build context to each worker once."""
+    if profile:
+        profiler.enable()
+    _worker_state['job_fn'] = job_fn
+    _worker_state['context'] = context
+    _worker_state['shared'] = shared
+
+def _execute(job_fn, context, job, shared=()):
+    """
+    Runs a single job, capturing its console output and timing.
+    Each job gets its own deep copy of the context so renderers that mutate
+    the theme (e.g. HtmlRenderer.preprocess_theme_colors) cannot leak state
+    into other jobs. This keeps serial and parallel builds byte-identical.
+    Keys listed in `shared` are read-only inputs (e.g. the content store) and
+    are passed by reference instead, so their caches persist across jobs.
+    """
+    log = io.StringIO()
+    result = {'job': job, 'output': None, 'error': None}
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    with redirect_stdout(log):
+        try:
+            kwargs = {key: value if key in shared else copy.deepcopy(value)
+                      for key, value in context.items()}
+            result['output'] = job_fn(job, **kwargs)
+        except Exception:
+            result['error'] = traceback.format_exc()
+    result['wall'] = time.perf_counter() - wall_start
+    result['cpu'] = time.process_time() - cpu_start
+    result['log'] = log.getvalue()
+    # Stages measured during this job (see engine/profiler.py), {} unless profiling
+    result['profile'] = profiler.take_records()
+    return result
+
+def _run_in_worker(job):
+    return _execute(_worker_state['job_fn'], _worker_state['context'], job, _worker_state['shared'])
+
+def run_jobs(jobs, job_fn, context, max_workers=1, shared=(), profile=False):
+    """
+    Executes build jobs, either in-process or on a process pool.
+    Args:
+        jobs (list): (target, format) tuples from plan_jobs().
+        job_fn (callable): Module-level function called as job_fn(job, **context).
+                           Must be picklable when max_workers > 1.
+        context (dict): Shared, picklable inputs (theme, store data, paths).
+        max_workers (int): Number of worker processes. 1 runs serially.
+        shared (tuple): Context keys passed by reference instead of deep-copied per job.
+        profile (bool): Enable the profiler in worker processes (see engine/profiler.py).
+    Returns:
+        list: One result dict per job, in the same order as `jobs`.
+    """
+    if max_workers <= 1:
+        return [_execute(job_fn, context, job, shared) for job in jobs]
+
+    with ProcessPoolExecutor(max_workers=max_workers,
+                             initializer=_init_worker,
+                             initargs=(job_fn, context, shared, profile)) as executor:
+        # executor.map preserves submission order regardless of completion order
+        return list(executor.map(_run_in_worker, jobs))
+
+def print_results(results):
+    """
+    Replays each job's captured output in job order, followed by a timing table.
+    Returns:
+        int: Number of failed jobs.
+    """
+    current_target = None
+    for result in results:
+        target_name, fmt = result['job']
+        if target_name != current_target:
+            print(f"\n--- Generating Target: {target_name} ---")
+            current_target = target_name
+        if result['log']:
+            print(result['log'], end='')
+        if result['error']:
+            print(f"ERROR in {target_name}/{fmt}:\n{result['error']}")
+
+    print("\n--- Build Summary ---")
+    failures = 0
+    total_wall = 0.0
+    width = max([20] + [len('/'.join(result['job'])) for result in results])
+    for result in results:
+        label = '/'.join(result['job'])
+        status = 'FAILED' if result['error'] else 'ok'
+        if result['error']:
+            failures += 1
+        total_wall += result['wall']
+        print(f"{label:<{width}} {result['wall']:7.2f}s wall {result['cpu']:7.2f}s cpu  {status}")
+    print(f"{len(results)} job(s), {failures} failed, {total_wall:.2f}s summed job time")
+    return failures
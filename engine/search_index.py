@@ -0,0 +1,144 @@
+import re
+import json
+from html.parser import HTMLParser
+from pathlib import Path
+
+SEARCH_INDEX_VERSION = 1
+
+# Site-relative location of the index (fetched by assets/js/search.js)
+SEARCH_INDEX_PATH = Path('assets') / 'search-index.json'
+
+# Terms are lowercase words of 2+ characters; these carry no meaning for search.
+# The list is shipped in the index so the client drops them from queries too.
+STOP_WORDS = frozenset("""
+an and are as at be but by can do for from has have how in is it its of on or our so that the their them
+then there these they this to was we were what when which who will with you your
+""".split())
+WORD = re.compile(r'[a-z0-9]+')
+SUMMARY_LENGTH = 160
+
+def tokenize(text):
+    """Distinct search terms of a text."""
+    return {word for word in WORD.findall(text.lower()) if len(word) > 1 and word not in STOP_WORDS}
+
+class _TextExtractor(HTMLParser):
+    SKIP = {'script', 'style'}
+
+    def __init__(self):
+        super().__init__()
+        self.parts = []
+        self.skipping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP:
+            self.skipping += 1
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP and self.skipping:
+            self.skipping -= 1
+
+    def handle_data(self, data):
+        if not self.skipping:
+            self.parts.append(data)
+
+def html_text(html):
+    """Visible text of an HTML fragment, whitespace collapsed."""
+    extractor = _TextExtractor()
+    extractor.feed(html)
+    extractor.close()
+    return ' '.join(' '.join(extractor.parts).split())
+
+class SearchIndex:
+    """
+    Prebuilt inverted index for client-side search (assets/js/search.js).
+
+    Several builders share one index file: build_blog.py adds blog posts and
+    generate.py the resume/CV components. Each document is keyed by its URL
+    and tagged with its source, so a builder replaces only its own documents.
+
+    The file is laid out for a single small, well-compressing download:
+        docs:     [[url, title, summary], ...]         (document id = position)
+        sources:  owning builder per document          (used by the builders only)
+        terms:    sorted list of terms                 (neighbours share prefixes)
+        postings: per term, ascending document ids, delta-encoded
+        prefixes: 2-character prefix -> [first, end) range in terms
+        stop_words: words never indexed, which the client removes from queries
+    A query word is matched as a prefix: the client looks up its first two
+    characters, scans that slice of terms and merges their postings.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.documents = {}  # url -> {'title', 'summary', 'source', 'terms'}
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == SEARCH_INDEX_VERSION:
+                    self.documents = self.decode(data)
+            except (OSError, ValueError) as e:
+                print(f"Warning: Rebuilding unreadable search index {self.path}: {e}")
+
+    @staticmethod
+    def decode(data):
+        documents = {}
+        for (url, title, summary), source in zip(data['docs'], data['sources']):
+            documents[url] = {'title': title, 'summary': summary, 'source': source, 'terms': set()}
+        urls = [doc[0] for doc in data['docs']]
+        for term, deltas in zip(data['terms'], data['postings']):
+            doc_id = 0
+            for delta in deltas:
+                doc_id += delta
+                documents[urls[doc_id]]['terms'].add(term)
+        return documents
+
+    def add(self, url, title, text, source, summary=None):
+        """
+        Adds or replaces the document at `url`.
+        Args:
+            url (str): Link the result opens (a page path or a '#route').
+            title (str): Result title; its words are indexed too.
+            text (str): Plain text to index (see html_text).
+            source (str): Which builder owns the document, e.g. 'blog'.
+            summary (str): Result snippet; defaults to the start of `text`.
+        """
+        if summary is None:
+            summary = text[:SUMMARY_LENGTH].rsplit(' ', 1)[0] if len(text) > SUMMARY_LENGTH else text
+        self.documents[url] = {'title': title, 'summary': summary, 'source': source,
+                               'terms': tokenize(title) | tokenize(text)}
+
+    def retain(self, source, urls):
+        """Drops the documents of `source` whose URL is not in `urls` (e.g. deleted posts)."""
+        for url in [url for url, doc in self.documents.items() if doc['source'] == source and url not in urls]:
+            del self.documents[url]
+
+    def encode(self):
+        urls = sorted(self.documents)
+        postings = {}
+        for doc_id, url in enumerate(urls):
+            for term in self.documents[url]['terms']:
+                postings.setdefault(term, []).append(doc_id)
+        terms = sorted(postings)
+        prefixes = {}
+        for position, term in enumerate(terms):
+            bounds = prefixes.setdefault(term[:2], [position, position])
+            bounds[1] = position + 1
+        encoded = []
+        for term in terms:
+            ids = postings[term]
+            encoded.append([ids[0]] + [ids[i] - ids[i - 1] for i in range(1, len(ids))])
+        return {
+            'version': SEARCH_INDEX_VERSION,
+            'docs': [[url, self.documents[url]['title'], self.documents[url]['summary']] for url in urls],
+            'sources': [self.documents[url]['source'] for url in urls],
+            'terms': terms,
+            'postings': encoded,
+            'prefixes': prefixes,
+            'stop_words': sorted(STOP_WORDS),
+        }
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(self.encode(), f, separators=(',', ':'), ensure_ascii=False)
+        print(f"Search index: {len(self.documents)} document(s) -> {self.path}")
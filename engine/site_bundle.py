@@ -0,0 +1,89 @@
+import re
+import json
+from pathlib import Path
+
+from engine.manifest import hash_bytes
+from engine.html_minify import minify_html
+
+# Site-relative paths
+ROUTER_JS = Path('assets') / 'js' / 'router.js'
+BUNDLE_DIR = Path('assets') / 'bundles'
+ROUTE_MANIFEST = BUNDLE_DIR / 'manifest.json'
+
+# The route table in router.js is the single source of truth:
+#     const routes = { 'home': ['components/resume.html', ...], ... };
+ROUTES_BLOCK = re.compile(r'const routes = \{(.*?)\};', re.S)
+ROUTE_ENTRY = re.compile(r"'([\w-]+)'\s*:\s*\[([^\]]*)\]")
+QUOTED = re.compile(r"'([^']*)'")
+
+def read_routes(base_dir):
+    """
+    Parses the `routes` table of assets/js/router.js.
+    Returns:
+        dict: route name -> list of component paths (site-relative), in table order.
+    """
+    source = (Path(base_dir) / ROUTER_JS).read_text(encoding='utf-8')
+    block = ROUTES_BLOCK.search(source)
+    if not block:
+        raise ValueError(f"No 'const routes = {{...}};' table found in {ROUTER_JS}")
+    return {name: QUOTED.findall(components) for name, components in ROUTE_ENTRY.findall(block.group(1))}
+
+def bundle_html(base_dir, components):
+    """
+    One route's components as a single fragment. Each component is wrapped in
+    a <div>, exactly as router.js wraps components it fetches one by one.
+    Components are minified; their CSS is kept whole, since hand-written
+    components may style the page around them.
+    """
+    parts = []
+    for component in components:
+        html = minify_html((Path(base_dir) / component).read_text(encoding='utf-8'), prune_css=False)
+        parts.append(f"<div>{html}</div>")
+    return "".join(parts)
+
+def build_route_bundles(base_dir):
+    """
+    Writes one content-hashed bundle per route, assets/bundles/<route>.<hash>.html,
+    and the route manifest (route -> bundle path) that router.js loads.
+
+    Bundle names change whenever their content does, so they can be cached
+    indefinitely; routes with the same components (e.g. 'home' and 'resume')
+    share one file. The bundles of the previous build stay for one more
+    build, for clients whose cached route manifest still names them; older
+    ones are removed.
+    Returns:
+        dict: The route manifest.
+    """
+    base_dir = Path(base_dir)
+    bundle_dir = base_dir / BUNDLE_DIR
+    bundle_dir.mkdir(parents=True, exist_ok=True)
+    previous = {}
+    if (base_dir / ROUTE_MANIFEST).exists():
+        try:
+            with open(base_dir / ROUTE_MANIFEST, 'r', encoding='utf-8') as f:
+                previous = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Ignoring unreadable route manifest {ROUTE_MANIFEST.as_posix()}: {e}")
+
+    manifest = {}
+    bundles = {}  # content hash -> site-relative bundle path
+    for route, components in read_routes(base_dir).items():
+        html = bundle_html(base_dir, components)
+        data = html.encode('utf-8')
+        digest = hash_bytes(data)[:12]
+        if digest not in bundles:
+            bundles[digest] = (BUNDLE_DIR / f"{route}.{digest}.html").as_posix()
+            path = base_dir / bundles[digest]
+            if not path.exists():
+                path.write_bytes(data)
+        manifest[route] = bundles[digest]
+
+    live = set(bundles.values()) | set(previous.values())
+    for existing in bundle_dir.glob('*.html'):
+        if existing.relative_to(base_dir).as_posix() not in live:
+            existing.unlink()
+
+    with open(base_dir / ROUTE_MANIFEST, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    print(f"Bundled {len(manifest)} route(s) into {len(bundles)} file(s) -> {ROUTE_MANIFEST.as_posix()}")
+    return manifest
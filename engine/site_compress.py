@@ -0,0 +1,157 @@
+import gzip
+import json
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+from engine.manifest import MANIFEST_VERSION, hash_bytes
+from engine.scheduler import resolve_worker_count
+
+try:
+    import brotli  # Optional: `pip install brotli`
+except ImportError:
+    brotli = None
+
+# Records the source hash of every compressed file (gitignored)
+COMPRESS_MANIFEST = Path('.compress_manifest.json')
+
+# Served text outputs: generated pages and components, the prerendered route
+# pages, the Markdown downloads written by generate.py (not README.md or other
+# notes in the root), the sitemap and the assets (with their hashed copies)
+COMPRESS_GLOBS = (
+    '*.html',
+    'resume.md',
+    'cv.md',
+    '*.xml',
+    '*/index.html',
+    'blog/*.html',
+    'pages/*.html',
+    'components/**/*.html',
+    'components/**/*.json',
+    'assets/**/*.html',
+    'assets/**/*.css',
+    'assets/**/*.js',
+    'assets/**/*.json',
+)
+COMPRESS_SUFFIXES = ('.html', '.css', '.js', '.md', '.xml', '.json')
+
+def compress_gzip(data):
+    # mtime=0 keeps the output reproducible: same input, same .gz bytes
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+def compress_brotli(data):
+    return brotli.compress(data, mode=brotli.MODE_TEXT, quality=11)
+
+def compressors():
+    """Available encodings: file suffix -> compress function."""
+    encodings = {'.gz': compress_gzip}
+    if brotli is not None:
+        encodings['.br'] = compress_brotli
+    return encodings
+
+def compress_file(path):
+    """
+    Writes the precompressed siblings of one file (page.html -> page.html.gz,
+    page.html.br). A variant that would not be smaller than the file itself is
+    not kept, so the server falls back to the original.
+    Returns:
+        list: The suffixes of the variants kept, e.g. ['.gz', '.br'].
+    """
+    path = Path(path)
+    data = path.read_bytes()
+    kept = []
+    for suffix, compress in compressors().items():
+        target = path.with_name(path.name + suffix)
+        compressed = compress(data)
+        if len(compressed) < len(data):
+            target.write_bytes(compressed)
+            kept.append(suffix)
+        elif target.exists():
+            target.unlink()
+    return kept
+
+class Compressor:
+    """
+    Precompresses the site's text outputs, so a static server can send
+    the .gz/.br file as is (e.g. nginx `gzip_static` / `brotli_static`)
+    instead of compressing each response.
+
+    Files are compressed at maximum level (gzip 9, brotli 11) on a process
+    pool. COMPRESS_MANIFEST records each file's hash and the variants written;
+    unchanged files are skipped, so a rebuild only compresses what changed.
+    Brotli is optional: without the package only .gz files are written, and
+    the .br files appear on the first run after it is installed.
+    """
+
+    def __init__(self, base_dir):
+        self.base_dir = Path(base_dir)
+        self.path = self.base_dir / COMPRESS_MANIFEST
+        self.encodings = sorted(compressors())
+        self.entries = {}
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == MANIFEST_VERSION:
+                    self.entries = data.get('files', {})
+            except (OSError, ValueError) as e:
+                print(f"Warning: Ignoring unreadable compression manifest {self.path}: {e}")
+
+    def sources(self):
+        seen = set()
+        for pattern in COMPRESS_GLOBS:
+            for path in sorted(self.base_dir.glob(pattern)):
+                if path.is_file() and path.suffix in COMPRESS_SUFFIXES and path not in seen:
+                    seen.add(path)
+                    yield path
+
+    def is_fresh(self, key, source_hash):
+        entry = self.entries.get(key)
+        if not entry or entry['source'] != source_hash or entry['encodings'] != self.encodings:
+            return False
+        return all((self.base_dir / (key + suffix)).exists() for suffix in entry['kept'])
+
+    def remove_variants(self, key):
+        for suffix in ('.gz', '.br'):
+            variant = self.base_dir / (key + suffix)
+            if variant.exists():
+                variant.unlink()
+
+    def run(self, jobs=0, force=False):
+        """
+        Compresses every changed output and removes the variants of outputs
+        that no longer exist (e.g. fingerprinted copies from older builds).
+        Args:
+            jobs (int): Worker processes (0 = one per CPU core, 1 = in-process).
+            force (bool): Recompress every file, ignoring the manifest.
+        Returns:
+            list: Site-relative paths of the files compressed in this run.
+        """
+        if brotli is None:
+            print("Note: brotli is not installed (pip install brotli); writing .gz files only")
+        hashes = {}
+        pending = []
+        for path in self.sources():
+            key = path.relative_to(self.base_dir).as_posix()
+            hashes[key] = hash_bytes(path.read_bytes())
+            if force or not self.is_fresh(key, hashes[key]):
+                pending.append(key)
+
+        workers = resolve_worker_count(jobs, len(pending))
+        paths = [self.base_dir / key for key in pending]
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                kept = list(pool.map(compress_file, paths, chunksize=8))
+        else:
+            kept = [compress_file(path) for path in paths]
+        for key, suffixes in zip(pending, kept):
+            self.entries[key] = {'source': hashes[key], 'encodings': self.encodings, 'kept': suffixes}
+
+        for key in [key for key in self.entries if key not in hashes]:
+            self.remove_variants(key)
+            del self.entries[key]
+
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({'version': MANIFEST_VERSION, 'files': self.entries}, f, indent=2, sort_keys=True)
+        print(f"Compressed {len(pending)} of {len(hashes)} file(s) ({', '.join(self.encodings)}); "
+              f"{len(hashes) - len(pending)} unchanged")
+        return pending
@@ -0,0 +1,152 @@
+import os
+import re
+import json
+from pathlib import Path
+
+from engine.manifest import hash_bytes
+
+ASSET_MANIFEST = Path('assets') / 'asset-manifest.json'
+
+# Assets served under a content-hashed name, in dependency order: an asset may
+# reference those before it (e.g. search.js fetches the search index, the
+# router's route table lists the components), so their hashed names are known
+# when its own copy is written and hashed.
+FINGERPRINT_GLOBS = (
+    'assets/img/**/*',
+    'assets/search-index.json',
+    'components/*.html',
+    'assets/css/*.css',
+    'assets/js/*.js',
+)
+# Text assets whose references are rewritten in their hashed copy
+TEXT_SUFFIXES = ('.html', '.css', '.js', '.json')
+
+# Stable-named entry points whose references are rewritten in place (in the
+# build output only: see engine/site_output.py)
+REWRITE_GLOBS = (
+    'index.html',
+    'components/*.html',
+    'blog/*.html',
+    'pages/*.html',
+    'projects/*.html',
+)
+
+HASH_LENGTH = 12
+HASHED_NAME = re.compile(rf'\.[0-9a-f]{{{HASH_LENGTH}}}$')
+
+def is_hashed(path):
+    """True for a fingerprinted copy, e.g. style.0123456789ab.css."""
+    return bool(HASHED_NAME.search(Path(path).stem))
+
+def hashed_name(path, digest):
+    path = Path(path)
+    return path.with_name(f"{path.stem}.{digest[:HASH_LENGTH]}{path.suffix}")
+
+def reference_pattern(asset):
+    """
+    Matches references to `asset` (site-relative, e.g. 'assets/css/style.css'),
+    with any '../' prefix and with or without a previous fingerprint, so
+    rewriting an already rewritten file just swaps the hash.
+
+    Only URLs are matched: quoted values (HTML attributes, JS strings) and CSS
+    url(...). Paths mentioned in text or highlighted code samples (e.g. a blog
+    post describing <code>assets/js/router.js</code>) are left alone.
+    """
+    stem, suffix = asset.rsplit('.', 1)
+    return re.compile(rf'((?:["\'`]|url\()(?:\.\./)*){re.escape(stem)}(?:\.[0-9a-f]{{{HASH_LENGTH}}})?'
+                      rf'\.{re.escape(suffix)}(?=["\'`)?#])')
+
+class Fingerprinter:
+    """
+    Gives static assets content-hashed names so they can be cached forever.
+
+    Runs on the build output (base_dir is _site/, never the repository):
+    each asset gets a copy named name.<hash>.ext next to it; the original
+    stays, so external links keep working. References are then pointed at
+    the copies: inside later assets' copies and, in place, in the entry
+    points (index.html, components, blog and standalone pages).
+    The copies of the previous build stay for one more build, so pages
+    still cached by clients can load the assets they name; older copies
+    are removed.
+    """
+
+    def __init__(self, base_dir):
+        self.base_dir = Path(base_dir)
+        self.manifest = {}   # original -> hashed (site-relative)
+        self.patterns = []   # (compiled reference_pattern, hashed path)
+        self.previous = {}   # manifest of the previous build
+        path = self.base_dir / ASSET_MANIFEST
+        if path.exists():
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.previous = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Warning: Ignoring unreadable asset manifest {path}: {e}")
+
+    def rewrite(self, text):
+        for pattern, hashed in self.patterns:
+            text = pattern.sub(lambda match: match.group(1) + hashed, text)
+        return text
+
+    def assets(self):
+        seen = set()
+        for pattern in FINGERPRINT_GLOBS:
+            for path in sorted(self.base_dir.glob(pattern)):
+                if path.is_file() and not is_hashed(path) and path not in seen:
+                    seen.add(path)
+                    yield path
+
+    def fingerprint(self, path):
+        if path.suffix in TEXT_SUFFIXES:
+            data = self.rewrite(path.read_text(encoding='utf-8')).encode('utf-8')
+        else:
+            data = path.read_bytes()
+        target = hashed_name(path, hash_bytes(data))
+        if not target.exists():
+            target.write_bytes(data)
+        original = path.relative_to(self.base_dir).as_posix()
+        hashed = target.relative_to(self.base_dir).as_posix()
+        self.manifest[original] = hashed
+        self.patterns.append((reference_pattern(original), hashed))
+
+    def remove_stale_copies(self):
+        live = {self.base_dir / hashed for hashed in list(self.manifest.values()) + list(self.previous.values())}
+        for original in self.manifest:
+            path = self.base_dir / original
+            for copy in path.parent.glob(f"{path.stem}.*{path.suffix}"):
+                if copy not in live and is_hashed(copy) and copy.stem.rsplit('.', 1)[0] == path.stem:
+                    copy.unlink()
+
+    def rewrite_entry_points(self):
+        changed = []
+        for pattern in REWRITE_GLOBS:
+            for path in sorted(self.base_dir.glob(pattern)):
+                if is_hashed(path):
+                    continue
+                text = path.read_text(encoding='utf-8')
+                rewritten = self.rewrite(text)
+                if rewritten != text:
+                    # Only references changed: keep the copied source's mtime (the sitemap's <lastmod>)
+                    stat = path.stat()
+                    path.write_text(rewritten, encoding='utf-8')
+                    os.utime(path, (stat.st_atime, stat.st_mtime))
+                    changed.append(path.relative_to(self.base_dir).as_posix())
+        return changed
+
+    def run(self):
+        """
+        Fingerprints every asset, rewrites the entry points and writes
+        assets/asset-manifest.json (original path -> hashed path).
+        Returns:
+            dict: The manifest.
+        """
+        for path in self.assets():
+            self.fingerprint(path)
+        self.remove_stale_copies()
+        changed = self.rewrite_entry_points()
+        with open(self.base_dir / ASSET_MANIFEST, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        print(f"Fingerprinted {len(self.manifest)} asset(s); updated references in {len(changed)} file(s)")
+        for path in changed:
+            print(f"  {path}")
+        return self.manifest
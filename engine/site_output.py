@@ -0,0 +1,90 @@
+import json
+import shutil
+from pathlib import Path
+
+# The deployable site (gitignored). build_site.py copies the served sources
+# here and runs every later stage on the copies, so the sources in the
+# repository are never rewritten.
+SITE_DIR = Path('_site')
+
+# Records the sources copied into SITE_DIR, so removed sources are removed there too
+SOURCE_LIST = Path('.site_sources.json')
+
+# Served files, site-relative. Generated downloads are matched by name so that
+# README.md and other notes in the root stay out of the site. sitemap.xml is
+# not copied: build_site.py writes the site's own, listing the route pages.
+SITE_GLOBS = (
+    'index.html',
+    'google*.html',
+    'robots.txt',
+    'resume.pdf',
+    'resume.docx',
+    'resume.md',
+    'cv.pdf',
+    'cv.docx',
+    'cv.md',
+    'assets/**/*',
+    'components/**/*',
+    'blog/*.html',
+    'pages/*.html',
+    'projects/*.html',
+)
+# Precompressed variants are written by the compression stage, not copied
+SKIPPED_SUFFIXES = ('.gz', '.br')
+
+def site_sources(base_dir):
+    """
+    Yields the served source files under base_dir, in SITE_GLOBS order.
+    """
+    base_dir = Path(base_dir)
+    seen = set()
+    for pattern in SITE_GLOBS:
+        for path in sorted(base_dir.glob(pattern)):
+            if path.is_file() and path.suffix not in SKIPPED_SUFFIXES and path not in seen:
+                seen.add(path)
+                yield path
+
+def copy_sources(base_dir, site_dir):
+    """
+    Mirrors the served sources into site_dir. A file is copied only when its
+    bytes differ from the copy (copy2 keeps the source mtime, which the
+    sitemap reports), and copies of sources that no longer exist are deleted.
+    Files the later stages write themselves (hashed copies, bundles, route
+    pages) are not sources and are left alone.
+    Returns:
+        list: Site-relative paths of the files copied in this run.
+    """
+    base_dir = Path(base_dir)
+    site_dir = Path(site_dir)
+    site_dir.mkdir(parents=True, exist_ok=True)
+    list_path = site_dir / SOURCE_LIST
+    previous = []
+    if list_path.exists():
+        try:
+            with open(list_path, 'r', encoding='utf-8') as f:
+                previous = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Ignoring unreadable source list {list_path}: {e}")
+
+    sources = []
+    copied = []
+    for path in site_sources(base_dir):
+        key = path.relative_to(base_dir).as_posix()
+        sources.append(key)
+        target = site_dir / key
+        if target.exists() and target.read_bytes() == path.read_bytes():
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(path, target)
+        copied.append(key)
+
+    for key in sorted(set(previous) - set(sources)):
+        target = site_dir / key
+        if target.exists():
+            print(f"Removing {SITE_DIR.as_posix()}/{key} (source no longer exists)")
+            target.unlink()
+
+    with open(list_path, 'w', encoding='utf-8') as f:
+        json.dump(sources, f, indent=2)
+    print(f"Copied {len(copied)} of {len(sources)} source file(s) to {site_dir}")
+    return copied
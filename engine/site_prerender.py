@@ -0,0 +1,57 @@
+import re
+from pathlib import Path
+
+from engine.site_bundle import read_routes, bundle_html
+
+SHELL = Path('index.html')
+
+# The root page is the shell itself; its route is rendered client-side
+SHELL_ROUTE = 'home'
+CONTENT_AREA = re.compile(r'(<main\b[^>]*\bid="content-area"[^>]*>)(.*?)(</main>)', re.S)
+PRERENDER_MARKER = 'data-prerendered="'
+
+def prerender_route(shell, route, html, base_url):
+    """
+    Returns the shell page with `html` (the route's components) in
+    #content-area. The page lives one directory down (<route>/index.html):
+    <base href="../"> keeps every relative URL resolving as on the root page,
+    and the canonical/social URLs point at the route's own address.
+    """
+    match = CONTENT_AREA.search(shell)
+    if not match:
+        raise ValueError(f'No <main id="content-area"> element in {SHELL}')
+    opening = match.group(1).replace('id="content-area"', f'id="content-area" {PRERENDER_MARKER}{route}"', 1)
+    page = shell[:match.start()] + opening + html + match.group(3) + shell[match.end():]
+    page = page.replace('<head>', '<head>\n    <base href="../">', 1)
+    return page.replace(f'"{base_url}/"', f'"{base_url}/{route}/"')
+
+def prerender_routes(base_dir, base_url):
+    """
+    Writes <route>/index.html for every route in router.js's table (except
+    the root page's own route), so crawlers and first paint get the content
+    without running the router. The router hydrates these pages instead of
+    fetching them again. Pages are only rewritten when their content changed
+    (their mtime is the sitemap's <lastmod>); pages of removed routes are deleted.
+    Returns:
+        list: Site-relative paths of the prerendered pages.
+    """
+    base_dir = Path(base_dir)
+    shell = (base_dir / SHELL).read_text(encoding='utf-8')
+    routes = read_routes(base_dir)
+    written = []
+    for route, components in routes.items():
+        if route == SHELL_ROUTE:
+            continue
+        page = prerender_route(shell, route, bundle_html(base_dir, components), base_url)
+        path = base_dir / route / 'index.html'
+        path.parent.mkdir(exist_ok=True)
+        if not path.exists() or path.read_text(encoding='utf-8') != page:
+            path.write_text(page, encoding='utf-8')
+        written.append(path.relative_to(base_dir).as_posix())
+
+    for existing in base_dir.glob('*/index.html'):
+        if existing.parent.name not in routes and PRERENDER_MARKER in existing.read_text(encoding='utf-8'):
+            print(f"Removing {existing.relative_to(base_dir).as_posix()} (route no longer exists)")
+            existing.unlink()
+    print(f"Prerendered {len(written)} route page(s)")
+    return written
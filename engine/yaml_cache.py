@@ -0,0 +1,96 @@
+import os
+import pickle
+import hashlib
+import tempfile
+from pathlib import Path
+
+import yaml
+
+# Prefer the libyaml-backed loader (C extension) when PyYAML was built with it.
+# It accepts the same documents as SafeLoader but parses several times faster.
+SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+CACHE_VERSION = 1
+
+class YamlCache:
+    """
+    Persistent cache of parsed YAML documents.
+
+    Each source file maps to one pickle file in `cache_dir` holding the parsed
+    data together with the source's mtime, size and SHA-256. Lookups are:
+    1. In-memory hit (same process, unchanged stat) -> unpickle, no disk I/O.
+    2. On-disk entry with matching mtime+size -> unpickle, no hashing.
+    3. mtime/size moved but content hash matches (e.g. after `git checkout`) -> reuse.
+    4. Otherwise parse with SafeLoader and rewrite the entry.
+
+    Callers always receive a fresh object (unpickled), so mutating the result
+    never corrupts the cache.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = Path(cache_dir)
+        self._memory = {}
+
+    def _entry_path(self, source):
+        name = hashlib.sha1(str(source).encode('utf-8')).hexdigest()
+        return self.cache_dir / f"{name}.pickle"
+
+    def _read_entry(self, entry_path):
+        try:
+            with open(entry_path, 'rb') as f:
+                entry = pickle.load(f)
+            if entry.get('version') == CACHE_VERSION:
+                return entry
+        except (OSError, pickle.PickleError, EOFError, AttributeError, ValueError):
+            pass
+        return None
+
+    def _write_entry(self, entry_path, entry):
+        # Write to a temp file and rename, so parallel build workers never see a partial entry
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, entry_path)
+        except OSError as e:
+            print(f"Warning: Could not write YAML cache entry {entry_path}: {e}")
+
+    def load(self, path):
+        """
+        Returns the parsed content of the YAML file at `path`.
+        Args:
+            path (Path): The YAML file.
+        Returns:
+            The parsed YAML content (a new object on every call).
+        """
+        source = Path(path).resolve()
+        stat = source.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+
+        cached = self._memory.get(source)
+        if cached and cached[0] == stamp:
+            return pickle.loads(cached[1])
+
+        entry_path = self._entry_path(source)
+        entry = self._read_entry(entry_path)
+        if entry and (entry['mtime_ns'], entry['size']) == stamp:
+            payload = entry['payload']
+        else:
+            raw = source.read_bytes()
+            digest = hashlib.sha256(raw).hexdigest()
+            if entry and entry['sha256'] == digest:
+                payload = entry['payload']
+            else:
+                data = yaml.load(raw.decode('utf-8'), Loader=SafeLoader)
+                payload = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+            self._write_entry(entry_path, {
+                'version': CACHE_VERSION,
+                'mtime_ns': stat.st_mtime_ns,
+                'size': stat.st_size,
+                'sha256': digest,
+                'payload': payload,
+            })
+
+        self._memory[source] = (stamp, payload)
+        return pickle.loads(payload)
@@ -1,26 +1,41 @@
-import yaml
 import sys
+import time
+import traceback
 import argparse
 from pathlib import Path
+from collections import ChainMap
+from engine.scheduler import plan_jobs, resolve_worker_count, run_jobs, print_results
+from engine.manifest import BuildManifest
+from engine.yaml_cache import YamlCache
+from engine import profiler
+from engine.content_store import ContentStore
+from engine.search_index import SearchIndex, SEARCH_INDEX_PATH, html_text
+from engine.batch import FORMAT_EXTENSIONS, expand_matrix, build_themes, plan_variant_jobs, substitute_content_keys
 from renderers.docx_renderer import DocxRenderer
+from renderers.docx_stream import StreamingDocxWriter
 from renderers.html_renderer import HtmlRenderer
-from renderers.pdf_renderer import PdfRenderer
+from renderers.pdf_renderer import PdfRenderer, PdfRenderPool, PDF_ENGINES
 from renderers.md_renderer import MdRenderer
 
 # --- 1. CONFIG & UTILS ---
 
+# Parsed YAML is cached on disk (see engine/yaml_cache.py), so unchanged
+# style/store/layout files are unpickled instead of re-parsed on every run.
+YAML_CACHE = YamlCache(Path(__file__).parent / '.cache' / 'yaml')
+
 def load_yaml(path):
     """
     Safely loads a YAML file with UTF-8 encoding.
+    Uses libyaml's CSafeLoader when available and the persistent parse cache.
     Args:
         path (Path): The pathlib Path to the file.
     Returns:
         dict: The parsed YAML content.
     """
-    with open(path, 'r', encoding='utf-8') as f:
-        return yaml.safe_load(f)
+    with profiler.stage('yaml.load'):
+        return YAML_CACHE.load(path)
 
-def resolve_references(content_list, store_data):
+def resolve_references(content_list, store_data, used_keys=None):
     """
     Merging Logic (The "Decentralized Engine"):
     Iterates through the content list (layout).
@@ -34,74 +49,55 @@ def resolve_references(content_list, store_data):
     
     Args:
         content_list (list): The 'sections' list from a layout YAML.
-        store_data (dict): The global content store.
+        store_data (Mapping): The global content store (a dict or a ContentStore).
+        used_keys (set, optional): If given, every 'content_key' referenced by the
+                                   layout is added to it (used by incremental builds).
     
     Returns:
         list: A new list of section blocks with content resolved.
     """
-    if not store_data:
+    if not store_data and used_keys is None:
         return content_list
+    store_data = store_data or {}
         
     resolved_list = []
     for block in content_list:
         # Create a copy to avoid mutating original loaded data deeply if cached
         block_copy = block.copy()
-        config = block_copy.get('config', {}).copy()
+        layout_config = block_copy.get('config', {})
+        store_item = None
         
-        content_key = config.get('content_key')
+        content_key = layout_config.get('content_key')
         if content_key:
-            # Fetch from store
+            if used_keys is not None:
+                used_keys.add(content_key)
+            # Fetch from store (only this entry is parsed when store_data is a ContentStore)
             store_item = store_data.get(content_key)
-            if store_item:
-                # Merge logic: Store content acts as base, Layout config overrides
-                # But typically store has 'items', 'title', etc.
-                # We merge store_item INTO config.
-                # So if layout has 'page_break_before: true', it stays.
-                # If store has 'title: ABC', it is added.
-                merged_config = store_item.copy()
-                merged_config.update(config) # Layout wins conflicts
-                config = merged_config
-            else:
+            if not store_item:
                 print(f"WARNING: Content key '{content_key}' not found in store.")
         
+        if store_item:
+            # Merge logic: Store content acts as base, Layout config overrides.
+            # So if layout has 'page_break_before: true', it stays.
+            # If store has 'title: ABC', it is added.
+            # Copy-on-write: the ChainMap looks keys up in the layout config first
+            # (layout wins conflicts), then the store item, without copying either.
+            # Writes by renderers land in the empty front dict.
+            config = ChainMap({}, layout_config, store_item)
+        else:
+            config = layout_config.copy()
+        
         block_copy['config'] = config
         resolved_list.append(block_copy)
     return resolved_list
 
-# --- MAIN EXECUTION ---
-
-def main():
+def get_targets_config(base_dir):
     """
-    The Build Orchestrator.
-    1. Parses arguments (--target resume/cv/all).
-    2. Loads Global Style (style.yaml) and Content Store (store.yaml).
-    3. Iterates through selected targets.
-    4. Calls specific renderers (DocxRenderer, HtmlRenderer, PdfRenderer) for each format.
+    Returns the layout files for each target.
+    Each target has specific layout files for each format family.
+    'web' is shared for HTML and MD.
     """
-    parser = argparse.ArgumentParser(description="Multi-Format Generator")
-    parser.add_argument('--target', choices=['resume', 'cv', 'all', 'word_test', 'data_eng'], default='resume', help='Target document to generate')
-    parser.add_argument('--format', choices=['html', 'pdf', 'docx', 'md', 'all'], default='all', help='Output format')
-    args = parser.parse_args()
-
-    # Paths
-    base_dir = Path(__file__).parent
-    
-    # Load Style
-    style_path = base_dir / 'config' / 'style.yaml'
-    print(f"Loading Style: {style_path}")
-    theme = load_yaml(style_path).get('theme', {})
-
-    # Load Store (Global Content Repository)
-    store_path = base_dir / 'data' / 'store.yaml'
-    store_data = {}
-    if store_path.exists():
-        print(f"Loading Store: {store_path}")
-        store_data = load_yaml(store_path)
-
-    # Define Targets Config
-    # Each target has specific layout files for each format family.
-    # 'web' is shared for HTML and MD.
-    targets_config = {
+    return {
         'resume': {
             'pdf': base_dir / 'data' / 'resume_pdf.yaml',
             'docx': base_dir / 'data' / 'resume_docx.yaml',
@@ -124,87 +120,470 @@ def main():
         }
     }
 
+def load_and_resolve(path, store_data, used_keys=None):
+    """Helper to load a YAML layout file and resolve its references against store.yaml"""
+    if not path.exists():
+        print(f"Error: Layout file not found: {path}")
+        return None
+    print(f"Loading Content: {path}")
+    raw = load_yaml(path)
+    
+    if isinstance(raw, dict):
+         sections = raw.get('sections', [])
+    else:
+         sections = raw
+         
+    with profiler.stage('resolve_references'):
+        resolved = resolve_references(sections, store_data, used_keys)
+    
+    if isinstance(raw, dict):
+         raw['sections'] = resolved
+         return raw
+    else:
+         return {'sections': resolved}
+
+# Which layout family (key in get_targets_config) each output format is built from.
+FORMAT_LAYOUTS = {'docx': 'docx', 'html': 'web', 'md': 'web', 'pdf': 'pdf'}
+
+# DOCX backends: DocxRenderer (whole document in memory) or StreamingDocxWriter.
+DOCX_WRITERS = ('python-docx', 'streaming')
+
+# Formats rendered through templates/ (the PDF is rendered from HTML).
+TEMPLATE_FORMATS = ('html', 'pdf')
+
+def render_job(job, theme, store_data, base_dir, pdf_options=None, render_options=None):
+    """
+    Renders a single (target, format) build job.
+    This is the unit of work handed to the scheduler, so it must stay a
+    module-level function (picklable for the process pool).
+    Args:
+        job (tuple): (target_name, format), format is one of docx/html/md/pdf.
+        theme (dict): The resolved theme from style.yaml.
+        store_data (Mapping): The global content store (a ContentStore).
+        base_dir (Path): Project root.
+        pdf_options (dict, optional): 'engine' and 'defer' (see render_output).
+        render_options (dict, optional): 'external_css', 'minify' and 'docx_writer' (see render_output).
+    Returns:
+        dict: 'path' of the written output (None if nothing was rendered),
+              'store_keys', the store.yaml keys the layout pulled in, and
+              'pdf_task' when PDF conversion was deferred to the PdfRenderPool.
+    """
+    target_name, fmt = job
+    result = {'path': None, 'store_keys': []}
+    config_map = get_targets_config(base_dir).get(target_name)
+    if not config_map:
+        print(f"Unknown target: {target_name}")
+        return result
+
+    used_keys = set()
+    content = load_and_resolve(config_map[FORMAT_LAYOUTS[fmt]], store_data, used_keys)
+    result['store_keys'] = sorted(used_keys)
+    if not content:
+        return result
+
+    # HTML components live under components/, every other format in the project root
+    if fmt == 'html':
+        output_path = base_dir / "components" / f"{target_name}.html"
+    else:
+        output_path = base_dir / f"{target_name}.{fmt}"
+    result['path'] = render_output(fmt, content, theme, base_dir, output_path,
+                                   pdf_options=pdf_options, deferred=result, render_options=render_options)
+    return result
+
+def render_output(fmt, content, theme, base_dir, output_path, html_renderer=None,
+                  pdf_options=None, deferred=None, render_options=None):
+    """
+    Renders resolved content into a single output file.
+    Args:
+        fmt (str): docx, html, md or pdf.
+        content (dict): Layout with references resolved (see load_and_resolve).
+        theme (dict): The resolved theme.
+        base_dir (Path): Project root (locates templates/).
+        output_path (Path): Where to write the result.
+        html_renderer (HtmlRenderer, optional): Reused for html/pdf instead of creating a new one.
+        pdf_options (dict, optional): 'engine' (see PDF_ENGINES) and 'defer'. When 'defer' is set,
+                                      the PDF's HTML is rendered here but the conversion is stored
+                                      as deferred['pdf_task'] for a PdfRenderPool to run later.
+        deferred (dict, optional): Receives 'pdf_task' when the conversion is deferred.
+        render_options (dict, optional): 'external_css' links a shared hashed stylesheet from
+                                         HTML components instead of inlining the CSS.
+                                         'minify': False writes HTML unminified.
+                                         'docx_writer': 'streaming' writes DOCX with
+                                         StreamingDocxWriter instead of DocxRenderer.
+    Returns:
+        Path: output_path.
+    """
+    render_options = render_options or {}
+
+    # 1. Render DOCX (Source: *_docx.yaml)
+    if fmt == 'docx' and render_options.get('docx_writer') == 'streaming':
+        # Renders and saves in one pass, streaming document.xml into the zip
+        with profiler.stage('docx.render'):
+            StreamingDocxWriter(theme).write(content, output_path)
+
+    elif fmt == 'docx':
+        with profiler.stage('docx.render'):
+            renderer_docx = DocxRenderer(theme)
+            renderer_docx.render(content)
+        renderer_docx.save(output_path)
+
+    # 2. Render Web/MD (Source: *.yaml)
+    elif fmt == 'html':
+        renderer_html = html_renderer or HtmlRenderer(theme, base_dir,
+                                                      external_css=render_options.get('external_css', False),
+                                                      minify=render_options.get('minify', True))
+        with profiler.stage('html.render'):
+            html_content = renderer_html.render(content, mode='web')
+        renderer_html.save(html_content, output_path)
+
+    elif fmt == 'md':
+        renderer_md = MdRenderer(theme)
+        with profiler.stage('md.render'):
+            md_content = renderer_md.render(content)
+        renderer_md.save(md_content, output_path)
+
+    # 3. Render PDF (Source: *_pdf.yaml)
+    # PDF generation uses wkhtmltopdf which takes HTML input.
+    # The PDF has its own layout (page breaks etc), so we generate a
+    # TEMPORARY HTML from the PDF layout, and then convert THAT to PDF.
+    elif fmt == 'pdf':
+        renderer_html_for_pdf = html_renderer or HtmlRenderer(theme, base_dir)
+        with profiler.stage('pdf.render_html'):
+            html_for_pdf = renderer_html_for_pdf.render(content, mode='pdf')
+        
+        footer_config = content.get('config', {}).get('footer')
+        pdf_options = pdf_options or {}
+        if pdf_options.get('defer') and deferred is not None:
+            deferred['pdf_task'] = (html_for_pdf, str(output_path), footer_config, theme)
+            return output_path
+
+        renderer_pdf = PdfRenderer(theme, engine=pdf_options.get('engine', 'wkhtmltopdf'))
+        if not renderer_pdf.render_from_html(html_for_pdf, str(output_path), footer_config=footer_config):
+            raise RuntimeError(f"PDF conversion failed for {output_path}")
+
+    return output_path
+
+# Per-process HtmlRenderer per theme variant, reused across batch jobs
+# so the Jinja environment and template are only set up once per worker.
+_batch_html_renderers = {}
+
+def render_variant(job, variants, themes, store_data, base_dir, output_dir, pdf_options=None,
+                   render_options=None):
+    """
+    Renders a single (variant, format) batch job (see engine/batch.py).
+    Module-level so the scheduler can ship it to pool workers.
+    Args:
+        job (tuple): (variant_name, format).
+        variants (dict): Expanded variants from expand_matrix().
+        themes (dict): Theme name -> fully merged theme.
+        store_data (Mapping): The global content store.
+        base_dir (Path): Project root.
+        output_dir (Path): Directory receiving all variant outputs.
+        pdf_options (dict, optional): See render_output.
+        render_options (dict, optional): See render_output.
+    Returns:
+        dict: 'path' of the written output (None if nothing was rendered),
+              plus 'pdf_task' when PDF conversion was deferred.
+    """
+    name, fmt = job
+    variant = variants[name]
+    layout_path = variant['layouts'][FORMAT_LAYOUTS[fmt]]
+    if not layout_path.exists():
+        print(f"Error: Layout file not found: {layout_path}")
+        return {'path': None}
+
+    raw = load_yaml(layout_path)
+    if not isinstance(raw, dict):
+        raw = {'sections': raw}
+    sections = substitute_content_keys(raw.get('sections', []), variant['substitutions'])
+    with profiler.stage('resolve_references'):
+        raw['sections'] = resolve_references(sections, store_data)
+
+    theme = themes[variant['theme']]
+    html_renderer = None
+    if fmt in TEMPLATE_FORMATS:
+        html_renderer = _batch_html_renderers.get(variant['theme'])
+        if html_renderer is None:
+            render_options = render_options or {}
+            html_renderer = _batch_html_renderers[variant['theme']] = HtmlRenderer(
+                theme, base_dir, external_css=render_options.get('external_css', False),
+                minify=render_options.get('minify', True))
+
+    output_path = output_dir / f"{name}.{FORMAT_EXTENSIONS[fmt]}"
+    result = {'path': None}
+    result['path'] = render_output(fmt, raw, theme, base_dir, output_path, html_renderer=html_renderer,
+                                   pdf_options=pdf_options, deferred=result, render_options=render_options)
+    return result
+
+def convert_deferred_pdfs(results, theme, pdf_options):
+    """
+    Runs the PDF conversions deferred by render_output on a PdfRenderPool of
+    long-lived renderer workers. Conversion output and time are folded back
+    into each job's result, so print_results reports them as usual.
+    """
+    pending = [result for result in results
+               if result['output'] and result['output'].get('pdf_task')]
+    if not pending:
+        return
+
+    workers = resolve_worker_count(pdf_options['workers'], len(pending))
+    print(f"Converting {len(pending)} PDF(s) with {pdf_options['engine']} on {workers} renderer worker(s)")
+    with PdfRenderPool(theme, workers=workers, engine=pdf_options['engine'],
+                       profile=profiler.is_enabled()) as pool:
+        futures = [(result, pool.submit(*result['output'].pop('pdf_task'))) for result in pending]
+
+    for result, future in futures:
+        try:
+            outcome = future.result()
+        except Exception:
+            result['error'] = traceback.format_exc()
+            continue
+        result['log'] += outcome['log']
+        result['wall'] += outcome['wall']
+        profiler.merge_records(result['profile'], outcome['profile'])
+        if not outcome['ok']:
+            result['error'] = f"PDF conversion failed for {result['output']['path']}"
+
+def run_batch(matrix_path, base_dir, jobs_arg, get_theme, get_store, pdf_options=None, render_options=None):
+    """
+    Batch mode: expands a variants matrix and renders every variant in one run.
+    Theme variants, the content store and the layouts are loaded once; each
+    worker process then reuses its renderers across all of its variants.
+    Returns:
+        tuple: (number of failed jobs, job results, profiler records of the setup stages).
+    """
+    print(f"Loading Variants Matrix: {matrix_path}")
+    matrix = load_yaml(matrix_path) or {}
+    variants = expand_matrix(matrix, base_dir)
+    jobs = plan_variant_jobs(variants, matrix)
+    output_dir = base_dir / matrix.get('output_dir', 'output/variants')
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    workers = resolve_worker_count(jobs_arg, len(jobs))
+    print(f"Expanded {len(variants)} variant(s) into {len(jobs)} job(s) on {workers} worker(s)")
+
+    context = {
+        'variants': variants,
+        'themes': build_themes(get_theme(), matrix),
+        'store_data': get_store(),
+        'base_dir': base_dir,
+        'output_dir': output_dir,
+        'pdf_options': pdf_options,
+        'render_options': render_options,
+    }
+    main_records = profiler.take_records()
+    results = run_jobs(jobs, render_variant, context, max_workers=workers,
+                       shared=('variants', 'store_data'), profile=profiler.is_enabled())
+    if pdf_options and pdf_options.get('defer'):
+        convert_deferred_pdfs(results, get_theme(), pdf_options)
+    failures = print_results(results)
+    return failures, results, main_records
+
+def job_input_files(job, base_dir):
+    """Files (besides generator code) whose bytes an output depends on."""
+    target_name, fmt = job
+    config_map = get_targets_config(base_dir).get(target_name, {})
+    files = [base_dir / 'config' / 'style.yaml'] + store_files(base_dir)
+    if FORMAT_LAYOUTS[fmt] in config_map:
+        files.append(config_map[FORMAT_LAYOUTS[fmt]])
+    if fmt in TEMPLATE_FORMATS:
+        files.extend(sorted((base_dir / 'templates').rglob('*.html')))
+    return files
+
+def job_options(job, pdf_options, render_options):
+    """Command-line options that change a job's output; recorded in the build manifest with its inputs."""
+    fmt = job[1]
+    if fmt == 'html':
+        return {'external_css': render_options['external_css'], 'minify': render_options['minify']}
+    if fmt == 'docx':
+        return {'docx_writer': render_options['docx_writer']}
+    if fmt == 'pdf':
+        return {'pdf_engine': pdf_options['engine']}
+    return {}
+
+def store_files(base_dir):
+    """store.yaml plus any shard files under data/store/ (see engine/content_store.py)."""
+    files = [base_dir / 'data' / 'store.yaml']
+    shard_dir = base_dir / 'data' / 'store'
+    if shard_dir.is_dir():
+        files.extend(sorted(shard_dir.glob('*.yaml')))
+    return files
+
+def report_profile(results, main_records, build_start, path):
+    """Writes the --profile JSON report and prints the summary table."""
+    job_records = {'/'.join(result['job']): result.get('profile', {}) for result in results}
+    report = profiler.build_report(job_records, main_records, time.perf_counter() - build_start)
+    print()
+    print(profiler.format_report(report))
+    profiler.write_report(report, path)
+
+def generator_sources(base_dir):
+    """Python sources that define how outputs are rendered (a change invalidates every output)."""
+    sources = [base_dir / 'generate.py']
+    for package in ('engine', 'renderers'):
+        sources.extend(sorted((base_dir / package).glob('*.py')))
+    return sources
+
+# --- MAIN EXECUTION ---
+
+# HTML components added to the site search index: target -> (result title, route)
+SEARCH_PAGES = {
+    'resume': ('Resume', '#home'),
+    'cv': ('Detailed C.V.', '#cv'),
+}
+
+def update_search_index(results, base_dir):
+    """Re-indexes the resume/CV components built by this run (see engine/search_index.py)."""
+    built = [result for result in results
+             if not result['error'] and result['output'] and result['output']['path']
+             and result['job'][1] == 'html' and result['job'][0] in SEARCH_PAGES]
+    if not built:
+        return
+    index = SearchIndex(base_dir / SEARCH_INDEX_PATH)
+    for result in built:
+        title, route = SEARCH_PAGES[result['job'][0]]
+        html = Path(result['output']['path']).read_text(encoding='utf-8')
+        index.add(route, title, html_text(html), 'pages')
+    index.save()
+
+def add_execution_options(parser, default=None):
+    """Options shared by regular and batch builds. `default` overrides every option's default (for subparsers)."""
+    def pick(value):
+        return value if default is None else default
+    parser.add_argument('--jobs', '-j', type=int, default=pick(1), help='Number of parallel worker processes (0 = one per CPU core)')
+    parser.add_argument('--pdf-engine', choices=PDF_ENGINES, default=pick('wkhtmltopdf'), help='PDF backend (weasyprint renders in-process, no wkhtmltopdf spawns)')
+    parser.add_argument('--pdf-workers', type=int, default=pick(0),
+                        help='Convert PDFs on a pool of N long-lived renderer workers (-1 = one per CPU core, 0 = convert inside each job)')
+    parser.add_argument('--profile', nargs='?', const='build_profile.json', default=pick(None), metavar='PATH',
+                        help='Record wall/CPU time and memory per build stage and block; write a JSON report (default: build_profile.json)')
+    parser.add_argument('--docx-writer', choices=DOCX_WRITERS, default=pick('python-docx'),
+                        help='DOCX backend (streaming writes document.xml section by section, lower memory)')
+    parser.add_argument('--external-css', action='store_true', default=pick(False),
+                        help='Link one shared, content-hashed stylesheet from HTML components instead of inlining the CSS')
+    parser.add_argument('--no-minify', action='store_true', default=pick(False),
+                        help='Write HTML components unminified (faster builds, e.g. while editing templates)')
+
+def main():
+    """
+    The Build Orchestrator.
+    1. Parses arguments (--target resume/cv/all, --jobs N, --incremental).
+       `generate.py batch variants.yaml` switches to batch mode (see run_batch).
+    2. Plans one job per (target, format) pair.
+    3. In incremental mode, drops jobs whose recorded inputs are unchanged.
+    4. Loads Global Style (style.yaml) and indexes the Content Store (store.yaml + data/store/ shards)
+       if anything is left to build. Store entries are parsed lazily, only when a layout references them.
+    5. Runs the jobs serially or on a process pool and reports per-job timing.
+    """
+    parser = argparse.ArgumentParser(description="Multi-Format Generator")
+    parser.add_argument('--target', choices=['resume', 'cv', 'all', 'word_test', 'data_eng'], default='resume', help='Target document to generate')
+    parser.add_argument('--format', choices=['html', 'pdf', 'docx', 'md', 'all'], default='all', help='Output format')
+    parser.add_argument('--incremental', action='store_true', help='Skip outputs whose inputs are unchanged since the last incremental build')
+    add_execution_options(parser)
+    subparsers = parser.add_subparsers(dest='command')
+    batch_parser = subparsers.add_parser('batch', help='Render every variant of a layouts x themes x content matrix')
+    batch_parser.add_argument('matrix', type=Path, help='Variants matrix YAML (see engine/batch.py)')
+    # Also accepted after 'batch'; SUPPRESS keeps the subparser from resetting values given before it
+    add_execution_options(batch_parser, default=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    pdf_options = {
+        'engine': args.pdf_engine,
+        'workers': args.pdf_workers,
+        'defer': args.pdf_workers != 0,
+    }
+    render_options = {'external_css': args.external_css, 'minify': not args.no_minify, 'docx_writer': args.docx_writer}
+    if args.profile:
+        profiler.enable()
+
+    # Paths
+    base_dir = Path(__file__).parent
+    style_path = base_dir / 'config' / 'style.yaml'
+    store_path = base_dir / 'data' / 'store.yaml'
+    store_shard_dir = base_dir / 'data' / 'store'
+
+    # Style and Store are loaded lazily: a no-op incremental build never parses them.
+    loaded = {}
+
+    def get_theme():
+        if 'theme' not in loaded:
+            print(f"Loading Style: {style_path}")
+            loaded['theme'] = load_yaml(style_path).get('theme', {})
+        return loaded['theme']
+
+    def get_store():
+        # Index Store (Global Content Repository)
+        if 'store' not in loaded:
+            print(f"Indexing Store: {store_path}")
+            loaded['store'] = ContentStore.from_paths(store_path, store_shard_dir)
+        return loaded['store']
+
+    if args.command == 'batch':
+        build_start = time.perf_counter()
+        failures, results, main_records = run_batch(args.matrix, base_dir, args.jobs, get_theme, get_store,
+                                                    pdf_options, render_options)
+        if args.profile:
+            report_profile(results, main_records, build_start, args.profile)
+        print(f"Batch finished in {time.perf_counter() - build_start:.2f}s")
+        if failures:
+            sys.exit(1)
+        return
+
     # Determine targets
     if args.target == 'all':
         selected_targets = ['resume', 'cv']
     else:
         selected_targets = [args.target]
 
-    def load_and_resolve(path):
-        """Helper to load a YAML layout file and resolve its references against store.yaml"""
-        if not path.exists():
-            print(f"Error: Layout file not found: {path}")
-            return None
-        print(f"Loading Content: {path}")
-        raw = load_yaml(path)
-        
-        if isinstance(raw, dict):
-             sections = raw.get('sections', [])
-        else:
-             sections = raw
-             
-        resolved = resolve_references(sections, store_data)
-        
-        if isinstance(raw, dict):
-             raw['sections'] = resolved
-             return raw
-        else:
-             return {'sections': resolved}
+    build_start = time.perf_counter()
+    jobs = plan_jobs(selected_targets, args.format)
 
-    for target_name in selected_targets:
-        print(f"\n--- Generating Target: {target_name} ---")
-        
-        config_map = targets_config.get(target_name)
-        if not config_map:
-             print(f"Unknown target: {target_name}")
-             continue
-
-        # 1. Render DOCX (Source: *_docx.yaml)
-        if args.format in ['docx', 'all']:
-            content = load_and_resolve(config_map['docx'])
-            if content:
-                renderer_docx = DocxRenderer(theme)
-                renderer_docx.render(content)
-                output_docx = base_dir / f"{target_name}.docx"
-                renderer_docx.save(output_docx)
-        
-        # 2. Render Web/MD (Source: *.yaml)
-        # We load this once for both HTML and MD
-        if args.format in ['html', 'md', 'all']:
-            content_web = load_and_resolve(config_map['web'])
-            if content_web:
-                if args.format in ['html', 'all']:
-                    renderer_html = HtmlRenderer(theme, base_dir)
-                    html_content = renderer_html.render(content_web, mode='web')
-                    output_html = base_dir / "components" / f"{target_name}.html"
-                    renderer_html.save(html_content, output_html)
-                    
-                    # 3. Render PDF (Source: *_pdf.yaml)
-                    # PDF generation uses wkhtmltopdf which takes HTML input.
-                    # BUT the user wants a specific PDF layout (page breaks etc).
-                    # So we must generate a TEMPORARY HTML from the PDF layout,
-                    # and then convert THAT to PDF.
-                
-                if args.format in ['md', 'all']:
-                    from renderers.md_renderer import MdRenderer
-                    renderer_md = MdRenderer(theme)
-                    md_content = renderer_md.render(content_web)
-                    output_md = base_dir / f"{target_name}.md"
-                    renderer_md.save(md_content, output_md)
-
-        # 3. Render PDF (Source: *_pdf.yaml)
-        # Note: We need to do this specifically.
-        if args.format in ['pdf', 'all']:
-            content_pdf = load_and_resolve(config_map['pdf'])
-            if content_pdf:
-                # We need to generate HTML specifically for the PDF renderer
-                renderer_html_for_pdf = HtmlRenderer(theme, base_dir)
-                html_for_pdf = renderer_html_for_pdf.render(content_pdf, mode='pdf')
-                
-                renderer_pdf = PdfRenderer(theme)
-                output_pdf = base_dir / f"{target_name}.pdf"
-                footer_config = content_pdf.get('config', {}).get('footer')
-                renderer_pdf.render_from_html(html_for_pdf, str(output_pdf), footer_config=footer_config)
+    manifest = None
+    if args.incremental:
+        manifest = BuildManifest(base_dir / '.build_manifest.json', base_dir)
+        code = manifest.code_hash(generator_sources(base_dir))
+        fresh = [job for job in jobs
+                 if manifest.is_fresh('/'.join(job), job_input_files(job, base_dir), code,
+                                      get_theme, get_store, style_path, store_files(base_dir),
+                                      job_options(job, pdf_options, render_options))]
+        for target_name, fmt in fresh:
+            print(f"Up to date: {target_name}/{fmt}")
+        jobs = [job for job in jobs if job not in fresh]
+        if not jobs:
+            manifest.save()
+            print(f"Nothing to build ({time.perf_counter() - build_start:.3f}s)")
+            return
+
+    workers = resolve_worker_count(args.jobs, len(jobs))
+    print(f"Scheduling {len(jobs)} job(s) on {workers} worker(s)")
+
+    context = {'theme': get_theme(), 'store_data': get_store(), 'base_dir': base_dir,
+               'pdf_options': pdf_options, 'render_options': render_options}
+    main_records = profiler.take_records()
+    results = run_jobs(jobs, render_job, context, max_workers=workers, shared=('store_data',),
+                       profile=profiler.is_enabled())
+    if pdf_options['defer']:
+        convert_deferred_pdfs(results, context['theme'], pdf_options)
+    failures = print_results(results)
+    update_search_index(results, base_dir)
+    if args.profile:
+        report_profile(results, main_records, build_start, args.profile)
+
+    if manifest:
+        for result in results:
+            key = '/'.join(result['job'])
+            output = result['output']
+            if result['error'] or not output or not output['path']:
+                manifest.discard(key)
+                continue
+            manifest.record(key, output['path'], job_input_files(result['job'], base_dir), code,
+                            context['theme'], context['store_data'], output['store_keys'],
+                            job_options(result['job'], pdf_options, render_options))
+        manifest.save()
+
+    print(f"Build finished in {time.perf_counter() - build_start:.2f}s")
+
+    if failures:
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
@@ -2,17 +2,27 @@ import os
 from pathlib import Path
 from datetime import datetime
 
+from engine.site_bundle import read_routes
+
 BASE_URL = "https://seanlgirgis.github.io"
 BASE_DIR = Path(__file__).parent
-BLOG_DIR = BASE_DIR / "blog"
 
-def generate_sitemap():
+def generate_sitemap(base_dir=BASE_DIR):
+    """
+    Writes base_dir/sitemap.xml, listing only pages that exist under base_dir:
+    the repository's sitemap has the root and blog pages, the one build_site.py
+    writes into _site/ also has the prerendered route pages.
+    Args:
+        base_dir (Path): Site root (the repository, or the build output).
+    """
+    base_dir = Path(base_dir)
+    blog_dir = base_dir / "blog"
     print("Generating sitemap.xml...")
     
     # Static Routes (SPA Sections)
     # Note: Search engines prefer clean URLs. Hash URLs (#about) are often ignored or treated as the same page.
     # However, listing them helps some crawlers discover content context.
-    # We primarily list the root and the actual static blog pages.
+    # We primarily list the root, the prerendered route pages and the actual static blog pages.
     urls = [
         {
             "loc": f"{BASE_URL}/",
@@ -22,9 +32,22 @@ def generate_sitemap():
         }
     ]
 
+    # Add Prerendered Route Pages (written by build_site.py, e.g. _site/cv/index.html)
+    for route in read_routes(base_dir):
+        page = base_dir / route / "index.html"
+        if page.exists():
+            urls.append({
+                "loc": f"{BASE_URL}/{route}/",
+                "lastmod": datetime.fromtimestamp(page.stat().st_mtime).strftime("%Y-%m-%d"),
+                "priority": "0.9",
+                "changefreq": "monthly"
+            })
+
     # Add Static Blog Pages
-    if BLOG_DIR.exists():
-        for html_file in BLOG_DIR.glob("*.html"):
+    if blog_dir.exists():
+        for html_file in blog_dir.glob("*.html"):
+            if html_file.name == "index.html":
+                continue # The prerendered 'blog' route, listed above
             urls.append({
                 "loc": f"{BASE_URL}/blog/{html_file.name}",
                 "lastmod": datetime.fromtimestamp(html_file.stat().st_mtime).strftime("%Y-%m-%d"),
@@ -47,7 +70,7 @@ def generate_sitemap():
     sitemap_content += '</urlset>'
 
     # Save
-    output_path = BASE_DIR / "sitemap.xml"
+    output_path = base_dir / "sitemap.xml"
     with open(output_path, "w", encoding="utf-8") as f:
         f.write(sitemap_content)
     
@@ -0,0 +1,40 @@
+import copy
+
+from docx.parts.document import DocumentPart
+from docx.parts.settings import SettingsPart
+from docx.opc.parts.coreprops import CorePropertiesPart
+
+from engine.manifest import hash_value
+
+# Parts a render modifies: the body (document.xml + its rels), settings and
+# core properties. They are deep-copied for every document. All other parts
+# (styles, numbering, theme, font table, ...) are only ever read, so clones
+# share them with the base document instead of copying them.
+PER_DOCUMENT_PARTS = (DocumentPart, SettingsPart, CorePropertiesPart)
+
+# theme digest -> configured base Document (one per theme per process)
+_base_documents = {}
+
+def clone_base_document(theme, build):
+    """
+    Returns a fresh Document for `theme`, cloned from a warm base document.
+
+    The first call for a theme runs `build()` to create the base (python-docx's
+    default template parsed and configured for the theme, e.g. page margins).
+    Every call then deep-copies only the per-document parts of that base, which
+    is several times cheaper than Document() re-reading and re-parsing the
+    template's styles.xml on every render.
+    Args:
+        theme (dict): The resolved theme (the cache key, by content).
+        build (callable): Returns a new, theme-configured Document.
+    Returns:
+        Document: A document independent of the base except for shared read-only parts.
+    """
+    key = hash_value(theme)
+    base = _base_documents.get(key)
+    if base is None:
+        base = _base_documents[key] = build()
+    # Pre-seeding deepcopy's memo with the shared parts makes the copy reference them as-is
+    memo = {id(part): part for part in base.part.package.parts
+            if not isinstance(part, PER_DOCUMENT_PARTS)}
+    return copy.deepcopy(base, memo)
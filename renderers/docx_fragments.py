@@ -0,0 +1,82 @@
+import copy
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+
+# Prebuilt OOXML fragments (lxml elements), keyed by kind + parameters.
+# Parameters are resolved theme values (colors, widths), so each theme gets its
+# own templates and every render with that theme reuses them. Templates are
+# never inserted into a document themselves, only deep copies (see append_copy).
+_fragments = {}
+
+# Common cell paddings in dxa (1/20 pt), as (side, width) pairs in tcMar order
+PAD_ALL = (('top', '220'), ('bottom', '220'), ('left', '220'), ('right', '220')) # 15px
+PAD_LEFT = (('top', '0'), ('bottom', '0'), ('left', '220'), ('right', '0'))
+
+def _cached(key, build):
+    template = _fragments.get(key)
+    if template is None:
+        template = _fragments[key] = build()
+    return template
+
+def shading(fill):
+    """<w:shd> with a solid fill (valid in tcPr and rPr)."""
+    def build():
+        shd = OxmlElement('w:shd')
+        shd.set(qn('w:val'), 'clear')
+        shd.set(qn('w:color'), 'auto')
+        shd.set(qn('w:fill'), fill)
+        return shd
+    return _cached(('shd', fill), build)
+
+def cell_margins(pads):
+    """<w:tcMar> from (side, width) pairs, e.g. PAD_ALL."""
+    def build():
+        tcMar = OxmlElement('w:tcMar')
+        for side, width in pads:
+            node = OxmlElement(f'w:{side}')
+            node.set(qn('w:w'), width)
+            node.set(qn('w:type'), 'dxa')
+            tcMar.append(node)
+        return tcMar
+    return _cached(('tcMar', tuple(pads)), build)
+
+def cell_border(side, val, size, color):
+    """<w:tcBorders> holding a single border, e.g. cell_border('left', 'single', '32', '1F4E79')."""
+    def build():
+        tcBorders = OxmlElement('w:tcBorders')
+        border = OxmlElement(f'w:{side}')
+        border.set(qn('w:val'), val)
+        border.set(qn('w:sz'), size)
+        border.set(qn('w:space'), '0')
+        border.set(qn('w:color'), color)
+        tcBorders.append(border)
+        return tcBorders
+    return _cached(('tcBorders', side, val, size, color), build)
+
+def page_anchored_position():
+    """<w:tblpPr> floating a table at the top edge of the page, centered (stripe)."""
+    def build():
+        tblpPr = OxmlElement('w:tblpPr')
+        tblpPr.set(qn('w:vertAnchor'), 'page')
+        tblpPr.set(qn('w:horzAnchor'), 'page')
+        tblpPr.set(qn('w:tblpY'), '0') # Top edge
+        tblpPr.set(qn('w:tblpX'), '0') # Left edge
+        # Wrapping 'around' ensures it floats
+        tblpPr.set(qn('w:tblpYSpec'), 'top') # Force Top
+        tblpPr.set(qn('w:tblpXSpec'), 'center') # Center Horizontally
+        return tblpPr
+    return _cached(('tblpPr', 'page_top'), build)
+
+def append_copy(parent, *templates):
+    """Appends a deep copy of each template to `parent` (e.g. a cell's tcPr)."""
+    for template in templates:
+        parent.append(copy.deepcopy(template))
+
+def add_cell_border(tcPr, borders):
+    """Adds a cell_border() fragment, merging into an existing <w:tcBorders> if the cell has one."""
+    existing = tcPr.find(qn('w:tcBorders'))
+    if existing is None:
+        tcPr.append(copy.deepcopy(borders))
+    else:
+        for border in borders:
+            existing.append(copy.deepcopy(border))
@@ -6,6 +6,15 @@ from docx.oxml.ns import qn
 from docx.oxml import OxmlElement
 from docx.enum.table import WD_ROW_HEIGHT_RULE
 
+from engine.profiler import stage
+from renderers.registry import DOCX_BLOCKS
+from renderers.docx_base import clone_base_document
+from renderers.inline_markup import inline_runs
+from renderers.docx_styles import (BODY_STYLE, BOLD_STYLE, ACCENT_STYLE, FOOTER_STYLE,
+                                   add_character_style, character_style_ids, set_run_style)
+from renderers.docx_fragments import (PAD_ALL, PAD_LEFT, shading, cell_margins, cell_border,
+                                      page_anchored_position, append_copy, add_cell_border)
+
 def hex_to_rgb(hex_str):
     if not hex_str: return RGBColor(0, 0, 0)
     hex_str = hex_str.lstrip('#')
@@ -63,8 +72,17 @@ class DocxRenderer:
 
     def __init__(self, theme):
         self.theme = theme
+        # Cloned from a per-theme warm base instead of Document() + setup every time
+        self.doc = clone_base_document(theme, self.build_base_document)
+        self.style_ids = character_style_ids(self.doc)
+        self.accent_color = get_theme_color(self.theme, 'accent_color').lower()
+
+    def build_base_document(self):
+        """Creates the theme's base document (see renderers/docx_base.py)."""
         self.doc = Document()
         self.setup_page_layout()
+        self.setup_character_styles()
+        return self.doc
 
     def setup_page_layout(self):
         """Sets up global page margins based on style.yaml configuration."""
@@ -76,8 +94,27 @@ class DocxRenderer:
             section.left_margin = Mm(margins.get('left', 12.7))
             section.right_margin = Mm(margins.get('right', 12.7))
 
+    def setup_character_styles(self):
+        """
+        Registers the theme's run styles (renderers/docx_styles.py) in styles.xml.
+        Text runs reference these instead of carrying their own font, size and color.
+        """
+        styles = self.doc.styles
+        add_character_style(styles, BODY_STYLE,
+                            font_name=self.theme.get('font_body', 'Arial'),
+                            size=self.get_font_size('base', 10),
+                            color=hex_to_rgb(self.theme.get('text_color', '#333333')))
+        add_character_style(styles, BOLD_STYLE, base=BODY_STYLE, bold=True)
+        add_character_style(styles, ACCENT_STYLE, base=BODY_STYLE,
+                            color=hex_to_rgb(get_theme_color(self.theme, 'accent_color')))
+        theme_footer = self.theme.get('footer', {})
+        add_character_style(styles, FOOTER_STYLE,
+                            size=self.get_font_size('footer', 8),
+                            color=hex_to_rgb(theme_footer.get('text_color', '#666666')))
+
     def save(self, output_path):
-        self.doc.save(output_path)
+        with stage('docx.save'):
+            self.doc.save(output_path)
         print(f"Saved DOCX to: {output_path}")
 
     def render(self, content_data):
@@ -88,54 +125,38 @@ class DocxRenderer:
         """
         # 1. Sections
         for section in content_data.get('sections', []):
-            block_type = section.get('type')
-            config = section.get('config', {})
-            
-            # Handle Page Break
-            if config.get('page_break_before'):
-                # Use Section Break to reset margins (prevent 0mm top margin bleed)
-                self.doc.add_section(WD_SECTION.NEW_PAGE)
-                new_section = self.doc.sections[-1]
-                
-                # Reset margins to theme defaults
-                margins = self.theme.get('margins', {})
-                new_section.top_margin = Mm(margins.get('top', 12.7))
-                new_section.bottom_margin = Mm(margins.get('bottom', 12.7))
-                new_section.left_margin = Mm(margins.get('left', 12.7))
-                new_section.right_margin = Mm(margins.get('right', 12.7))
-                
-                # Since we added a section, we don't need add_page_break
-            
-            if block_type == 'stripe_block':
-                 self.render_stripe(config)
-            elif block_type == 'header_block':
-                self.render_header_block(config)
-            elif block_type == 'section_title_block':
-                self.render_section_title_block(config)
-            elif block_type == 'compound_text_block':
-                self.render_compound_text_block(config)
-            elif block_type == 'text_block':
-                self.render_text_block(config)
-            elif block_type == 'grid_block':
-                self.render_grid_block(config)
-            elif block_type == 'list_block':
-                self.render_list_block(config)
-            elif block_type == 'plain_list_block':
-                self.render_plain_list_block(config)
-            elif block_type == 'compact_list_block':
-                self.render_compact_list_block(config)
-            elif block_type == 'text_grid_block':
-                self.render_text_grid_block(config)
-            elif block_type == 'project_block':
-                self.render_project_block(config)
-            else:
-                print(f"Warning: Unknown block type '{block_type}'")
+            self.render_section(section)
             
         # 2. Apply Footer (Global)
         footer_config = content_data.get('config', {}).get('footer')
         if footer_config:
             self.apply_footer(footer_config)
 
+    def render_section(self, section):
+        """Renders one layout section: its page break (if any), then the block itself."""
+        block_type = section.get('type')
+        config = section.get('config', {})
+        
+        # Handle Page Break
+        if config.get('page_break_before'):
+            # Use Section Break to reset margins (prevent 0mm top margin bleed)
+            self.doc.add_section(WD_SECTION.NEW_PAGE)
+            new_section = self.doc.sections[-1]
+            
+            # Reset margins to theme defaults
+            margins = self.theme.get('margins', {})
+            new_section.top_margin = Mm(margins.get('top', 12.7))
+            new_section.bottom_margin = Mm(margins.get('bottom', 12.7))
+            new_section.left_margin = Mm(margins.get('left', 12.7))
+            new_section.right_margin = Mm(margins.get('right', 12.7))
+            
+            # Since we added a section, we don't need add_page_break
+        
+        if block_type in DOCX_BLOCKS:
+            DOCX_BLOCKS.render(self, block_type, config)
+        else:
+            print(f"Warning: Unknown block type '{block_type}'")
+
     def create_element(self, name):
         return OxmlElement(name)
 
@@ -177,54 +198,50 @@ class DocxRenderer:
         run._r.append(fldChar2)
 
     def apply_footer(self, footer_config):
+        # Iterate all sections
+        for section in self.doc.sections:
+            self.set_section_footer(section, footer_config)
+
+    def set_section_footer(self, section, footer_config):
+        """Gives one section its own footer (and first-page footer if it uses one)."""
+        self.set_footer_content(section.footer, footer_config)
+        
+        if section.different_first_page_header_footer:
+            self.set_footer_content(section.first_page_footer, footer_config)
+
+    def set_footer_content(self, footer_obj, footer_config):
         text = footer_config.get('text', '')
         show_pages = footer_config.get('show_pages', False)
-        theme_footer = self.theme.get('footer', {})
-        font_size = self.get_font_size('footer', 8)
-        color_hex = theme_footer.get('text_color', '#666666').replace('#', '')
+        # Size and color come from the footer character style
+        footer_style = self.style_ids[FOOTER_STYLE]
         
-        def _set_footer_content(footer_obj):
-            footer_obj.is_linked_to_previous = False 
+        footer_obj.is_linked_to_previous = False 
+        
+        # Clear existing
+        for p in footer_obj.paragraphs:
+            p._element.getparent().remove(p._element)
             
-            # Clear existing
-            for p in footer_obj.paragraphs:
-                p._element.getparent().remove(p._element)
-                
-            p = footer_obj.add_paragraph()
-            p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        p = footer_obj.add_paragraph()
+        p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        
+        # Footer Text
+        if text:
+            set_run_style(p.add_run(text), footer_style)
             
-            # Footer Text
+        # Page Numbers
+        if show_pages:
             if text:
-                run = p.add_run(text)
-                run.font.size = font_size
-                run.font.color.rgb = RGBColor.from_string(color_hex)
-                
-            # Page Numbers
-            if show_pages:
-                if text:
-                    run = p.add_run(" | ")
-                    run.font.size = font_size
-                    run.font.color.rgb = RGBColor.from_string(color_hex)
-                
-                run = p.add_run("Page ")
-                run.font.size = font_size
-                run.font.color.rgb = RGBColor.from_string(color_hex)
-                self.add_page_number(p)
-                
-                run = p.add_run(" of ")
-                run.font.size = font_size
-                run.font.color.rgb = RGBColor.from_string(color_hex)
-                self.add_num_pages(p)
-
-        # Iterate all sections
-        for section in self.doc.sections:
-            _set_footer_content(section.footer)
+                set_run_style(p.add_run(" | "), footer_style)
             
-            if section.different_first_page_header_footer:
-                _set_footer_content(section.first_page_footer)
+            set_run_style(p.add_run("Page "), footer_style)
+            self.add_page_number(p)
+            
+            set_run_style(p.add_run(" of "), footer_style)
+            self.add_num_pages(p)
 
     # --- BLOCK RENDERERS ---
 
+    @DOCX_BLOCKS.register('stripe_block')
     def render_stripe(self, config):
         # STRATEGY: Floating Table (Absolute Position)
         # 1. Restore Standard Margins (so Page 2+ works normally)
@@ -258,16 +275,7 @@ class DocxRenderer:
         
         # Table Position Properties (tblpPr)
         tblPr = table._tbl.tblPr
-        tblpPr = OxmlElement('w:tblpPr')
-        tblpPr.set(qn('w:vertAnchor'), 'page')
-        tblpPr.set(qn('w:horzAnchor'), 'page')
-        tblpPr.set(qn('w:tblpY'), '0') # Top edge
-        tblpPr.set(qn('w:tblpX'), '0') # Left edge
-        # Wrapping 'around' ensures it floats
-        tblpPr.set(qn('w:tblpYSpec'), 'top') # Force Top
-        tblpPr.set(qn('w:tblpXSpec'), 'center') # Center Horizontally
-        
-        tblPr.append(tblpPr)
+        append_copy(tblPr, page_anchored_position())
         
         # Width: Full Page Width
         # Letter is 215.9mm. Let's make it slightly wider to be safe (bleed).
@@ -285,11 +293,7 @@ class DocxRenderer:
         hex_color = get_theme_color(self.theme, c_val).lstrip('#')
         
         tcPr = cell._tc.get_or_add_tcPr()
-        shd = OxmlElement('w:shd')
-        shd.set(qn('w:val'), 'clear')
-        shd.set(qn('w:color'), 'auto')
-        shd.set(qn('w:fill'), hex_color)
-        tcPr.append(shd)
+        append_copy(tcPr, shading(hex_color))
         
         # Exact Height (Thin)
         row = table.rows[0]
@@ -310,6 +314,7 @@ class DocxRenderer:
         # if float interaction is weird (though y=0 should be far above margin).
         # Standard margin is 12.7mm. Stripe is 3mm. No overlap.
         pass
+    @DOCX_BLOCKS.register('header_block')
     def render_header_block(self, config):
         # Title (Name)
         title = config.get('title', '')
@@ -332,11 +337,13 @@ class DocxRenderer:
             run_sub.font.size = Pt(11)
             run_sub.font.color.rgb = RGBColor(100, 100, 100) # Grey
 
+    @DOCX_BLOCKS.register('section_title_block')
     def render_section_title_block(self, config):
         content = config.get('content', '')
         style = config.get('style', 'normal')
         self.add_section_title(content, style=style)
 
+    @DOCX_BLOCKS.register('compound_text_block')
     def render_compound_text_block(self, config):
         p = self.doc.add_paragraph()
         
@@ -372,6 +379,7 @@ class DocxRenderer:
                 r.font.size = Pt(default_size)
                 r.font.color.rgb = hex_to_rgb(color_hex)
 
+    @DOCX_BLOCKS.register('text_block')
     def render_text_block(self, config):
         content = config.get('content', '')
         style = config.get('style', 'normal')
@@ -391,39 +399,14 @@ class DocxRenderer:
             
             cell = table.cell(0,0)
             
-            # Shading
-            tcPr = cell._tc.get_or_add_tcPr()
-            shd = OxmlElement('w:shd')
-            shd.set(qn('w:val'), 'clear')
-            shd.set(qn('w:color'), 'auto')
-            shd.set(qn('w:fill'), "F2F2F2") 
-            tcPr.append(shd)
-            
-            # PADDING (Margins)
+            # Shading + PADDING (Margins)
             # 15px ~= 11pt ~= 220 dxa (1/20 pt)
-            tcMar = OxmlElement('w:tcMar')
-            for side in ['top', 'bottom', 'left', 'right']:
-                node = OxmlElement(f'w:{side}')
-                node.set(qn('w:w'), '220')
-                node.set(qn('w:type'), 'dxa')
-                tcMar.append(node)
-            tcPr.append(tcMar)
+            tcPr = cell._tc.get_or_add_tcPr()
+            append_copy(tcPr, shading("F2F2F2"), cell_margins(PAD_ALL))
 
-            # Border (Left Accent) - Always apply for shaded style
-            tcBorders = tcPr.find(qn('w:tcBorders'))
-            if tcBorders is None:
-                tcBorders = OxmlElement('w:tcBorders')
-                tcPr.append(tcBorders)
-            
-            left = OxmlElement('w:left')
-            left.set(qn('w:val'), 'single')
-            left.set(qn('w:sz'), '64') # 8pt (thick)
-            left.set(qn('w:space'), '0')
-            
-            # Resolve accent color
+            # Border (Left Accent, 8pt thick) - Always apply for shaded style
             c_hex = get_theme_color(self.theme, config.get('border_color', 'accent_color'))
-            left.set(qn('w:color'), c_hex.lstrip('#'))
-            tcBorders.append(left)
+            add_cell_border(tcPr, cell_border('left', 'single', '64', c_hex.lstrip('#')))
 
             p = cell.paragraphs[0]
             # Remove spacing inside the box, let padding handle it
@@ -452,27 +435,11 @@ class DocxRenderer:
             tcPr = cell._tc.get_or_add_tcPr()
             
             # PADDING (Left only mostly, but let's give top/bottom slight)
-            tcMar = OxmlElement('w:tcMar')
-            for side, width in [('top', '0'), ('bottom', '0'), ('left', '220'), ('right', '0')]:
-                node = OxmlElement(f'w:{side}')
-                node.set(qn('w:w'), width)
-                node.set(qn('w:type'), 'dxa')
-                tcMar.append(node)
-            tcPr.append(tcMar)
+            append_copy(tcPr, cell_margins(PAD_LEFT))
 
-            # Border (Left Primary)
-            tcBorders = tcPr.find(qn('w:tcBorders'))
-            if tcBorders is None:
-                tcBorders = OxmlElement('w:tcBorders')
-                tcPr.append(tcBorders)
-            
-            left = OxmlElement('w:left')
-            left.set(qn('w:val'), 'single')
-            left.set(qn('w:sz'), '32') # 4pt (Standard for this look)
-            left.set(qn('w:space'), '0')
+            # Border (Left Primary, 4pt - Standard for this look)
             c_hex = get_theme_color(self.theme, 'primary_color')
-            left.set(qn('w:color'), c_hex.lstrip('#'))
-            tcBorders.append(left)
+            add_cell_border(tcPr, cell_border('left', 'single', '32', c_hex.lstrip('#')))
 
             p = cell.paragraphs[0]
             p.paragraph_format.space_before = Pt(0)
@@ -506,35 +473,13 @@ class DocxRenderer:
             cell = table.cell(0,0)
             tcPr = cell._tc.get_or_add_tcPr()
             
-            # Padding
-            tcMar = OxmlElement('w:tcMar')
-            for side, width in [('top', '80'), ('bottom', '80'), ('left', '220'), ('right', '80')]:
-                node = OxmlElement(f'w:{side}')
-                node.set(qn('w:w'), width)
-                node.set(qn('w:type'), 'dxa')
-                tcMar.append(node)
-            tcPr.append(tcMar)
-
-            # Shading
-            shd = OxmlElement('w:shd')
-            shd.set(qn('w:val'), 'clear')
-            shd.set(qn('w:color'), 'auto')
-            shd.set(qn('w:fill'), 'F2F2F2')
-            tcPr.append(shd)
+            # Padding + Shading
+            pads = (('top', '80'), ('bottom', '80'), ('left', '220'), ('right', '80'))
+            append_copy(tcPr, cell_margins(pads), shading('F2F2F2'))
 
             # Border (Left Primary)
-            tcBorders = tcPr.find(qn('w:tcBorders'))
-            if tcBorders is None:
-                tcBorders = OxmlElement('w:tcBorders')
-                tcPr.append(tcBorders)
-            
-            left = OxmlElement('w:left')
-            left.set(qn('w:val'), 'single')
-            left.set(qn('w:sz'), '32')
-            left.set(qn('w:space'), '0')
             c_hex = get_theme_color(self.theme, 'primary_color')
-            left.set(qn('w:color'), c_hex.lstrip('#'))
-            tcBorders.append(left)
+            add_cell_border(tcPr, cell_border('left', 'single', '32', c_hex.lstrip('#')))
 
             p = cell.paragraphs[0]
             p.paragraph_format.space_before = Pt(0)
@@ -550,6 +495,7 @@ class DocxRenderer:
             p = self.doc.add_paragraph()
             self.add_markdown_text(p, content)
 
+    @DOCX_BLOCKS.register('grid_block')
     def render_grid_block(self, config):
         # 2-Column Grid (using Table)
         items = config.get('items', [])
@@ -571,28 +517,12 @@ class DocxRenderer:
             # Apply Left Border & Padding to Container
             tcPr = cell_container._tc.get_or_add_tcPr()
             
-            # Padding
-            tcMar = OxmlElement('w:tcMar')
-            for side in ['top', 'bottom', 'left', 'right']:
-                node = OxmlElement(f'w:{side}')
-                node.set(qn('w:w'), '220') # 15px
-                node.set(qn('w:type'), 'dxa')
-                tcMar.append(node)
-            tcPr.append(tcMar)
+            # Padding (15px)
+            append_copy(tcPr, cell_margins(PAD_ALL))
             
-            # Border
-            tcBorders = tcPr.find(qn('w:tcBorders'))
-            if tcBorders is None:
-                tcBorders = OxmlElement('w:tcBorders')
-                tcPr.append(tcBorders)
-            
-            left = OxmlElement('w:left')
-            left.set(qn('w:val'), 'single')
-            left.set(qn('w:sz'), '64') # 8pt
-            left.set(qn('w:space'), '0')
+            # Border (8pt)
             c_hex = get_theme_color(self.theme, 'accent_color')
-            left.set(qn('w:color'), c_hex.lstrip('#'))
-            tcBorders.append(left)
+            add_cell_border(tcPr, cell_border('left', 'single', '64', c_hex.lstrip('#')))
             
         else:
             target = self.doc
@@ -635,6 +565,7 @@ class DocxRenderer:
                 p_item.style = 'List Bullet' # Use built-in bullet style
                 self.add_markdown_text(p_item, line)
 
+    @DOCX_BLOCKS.register('list_block')
     def render_list_block(self, config):
         title = config.get('title')
         if title:
@@ -705,6 +636,7 @@ class DocxRenderer:
             p_space.paragraph_format.line_spacing = Pt(0)
             p_space.paragraph_format.space_after = self.get_spacing('list_item_after', 6)
 
+    @DOCX_BLOCKS.register('plain_list_block')
     def render_plain_list_block(self, config):
         title = config.get('title')
         if title:
@@ -733,6 +665,7 @@ class DocxRenderer:
             # Let's temporarily override paragraph style or use a custom add_markdown
             self.add_markdown_text(p, text_content, font_size_override=Pt(7) if is_small else None, color_override=RGBColor(100,100,100) if is_small else None)
 
+    @DOCX_BLOCKS.register('compact_list_block')
     def render_compact_list_block(self, config):
         title = config.get('title')
         if title:
@@ -766,17 +699,7 @@ class DocxRenderer:
             # Add dotted bottom border to cells
             for cell in [c1, c2]:
                 tcPr = cell._tc.get_or_add_tcPr()
-                tcBorders = tcPr.find(qn('w:tcBorders'))
-                if tcBorders is None:
-                    tcBorders = OxmlElement('w:tcBorders')
-                    tcPr.append(tcBorders)
-                
-                bottom = OxmlElement('w:bottom')
-                bottom.set(qn('w:val'), 'dotted')
-                bottom.set(qn('w:sz'), '4') # 1/2 pt
-                bottom.set(qn('w:space'), '0')
-                bottom.set(qn('w:color'), 'CCCCCC')
-                tcBorders.append(bottom)
+                add_cell_border(tcPr, cell_border('bottom', 'dotted', '4', 'CCCCCC')) # 1/2 pt
             
             # Small spacing after table?
             # docx tables don't have margin-bottom. 
@@ -785,6 +708,7 @@ class DocxRenderer:
             spacer.paragraph_format.line_spacing = Pt(2)
             spacer.paragraph_format.space_after = Pt(2)
 
+    @DOCX_BLOCKS.register('text_grid_block')
     def render_text_grid_block(self, config):
         title = config.get('title')
         if title:
@@ -836,34 +760,14 @@ class DocxRenderer:
                  # Shaded box - tight padding as requested "gain size"
                  pads = [('top','40'), ('bottom','40'), ('left','220'), ('right','80')]
                  
-             tcMar = OxmlElement('w:tcMar')
-             for side, width in pads:
-                 node = OxmlElement(f'w:{side}')
-                 node.set(qn('w:w'), width)
-                 node.set(qn('w:type'), 'dxa')
-                 tcMar.append(node)
-             tcPr.append(tcMar)
+             append_copy(tcPr, cell_margins(pads))
              
              # Fill
              if fill != 'auto':
-                 shd = OxmlElement('w:shd')
-                 shd.set(qn('w:val'), 'clear')
-                 shd.set(qn('w:color'), 'auto')
-                 shd.set(qn('w:fill'), fill)
-                 tcPr.append(shd)
-                 
-             # Border (Left)
-             tcBorders = tcPr.find(qn('w:tcBorders'))
-             if tcBorders is None:
-                 tcBorders = OxmlElement('w:tcBorders')
-                 tcPr.append(tcBorders)
+                 append_copy(tcPr, shading(fill))
                  
-             left = OxmlElement('w:left')
-             left.set(qn('w:val'), 'single')
-             left.set(qn('w:sz'), '32') # 4pt
-             left.set(qn('w:space'), '0')
-             left.set(qn('w:color'), c_hex)
-             tcBorders.append(left)
+             # Border (Left, 4pt)
+             add_cell_border(tcPr, cell_border('left', 'single', '32', c_hex))
              
              # Remove default paragraph in container
              cell_container.paragraphs[0]._element.getparent().remove(cell_container.paragraphs[0]._element)
@@ -1091,70 +995,44 @@ class DocxRenderer:
             pBdr.append(bottom)
 
     def add_markdown_text(self, paragraph, text, font_size_override=None, color_override=None):
-        # Improved parser: Handle **Bold** and <color hex="..."></color>
-        # We need a regex or state machine. Let's use regex split.
-        import re
-        
-        # Regex to split by bold or color tags
-        # Supports: **Bold**  and  <span style="color: #HEX">Text</span>
-        # We'll stick to a simpler custom tag for robustness in this regex: [color:#HEX]Text[/color]
-        # OR just regex for the standard HTML span we plan to use.
-        
-        # Pattern: (**.*?**) OR (<span style="color:.*?">.*?</span>)
-        pattern = r'(\*\*.*?\*\*|<span style="color:.*?">.*?</span>)'
-        parts = re.split(pattern, text)
-        
-        # Determine base font size
-        base_font_size = self.get_font_size('base', 10)
-        
-        for part in parts:
-            if not part: continue
-            
-            run = paragraph.add_run()
-            
-            # Defaults
-            run.font.name = self.theme.get('font_body', 'Arial')
-            run.font.size = font_size_override if font_size_override else base_font_size
-            run.font.color.rgb = hex_to_rgb(self.theme.get('text_color', '#333333'))
-            
-            # 1. Bold
-            if part.startswith('**') and part.endswith('**'):
-                run.text = part[2:-2]
-                run.bold = True
-                
-            # 2. Color Span
-            elif part.startswith('<span') and 'color:' in part:
-                # Extract color and text
-                # <span style="color: #E65100">Text</span>
-                try:
-                    color_match = re.search(r'color:\s*(#[0-9a-fA-F]{6})', part)
-                    text_match = re.search(r'>(.*?)</span>', part)
-                    
-                    if color_match and text_match:
-                        run.text = text_match.group(1)
-                        hex_c = color_match.group(1).lstrip('#')
-                        run.font.color.rgb = RGBColor(int(hex_c[0:2], 16), int(hex_c[2:4], 16), int(hex_c[4:6], 16))
-                        # Check if internal text was bold? (Nested not supported by this simple split)
-                        if '**' in run.text:
-                             # Very hacky: strip ** and make bold. 
-                             # Real parser would be recursive.
-                             run.text = run.text.replace('**', '')
-                             run.bold = True
-                    else:
-                        run.text = part # Fallback
-                except:
-                    run.text = part
-            
-            # 3. Normal
+        # Handles **Bold**, <span style="color: #HEX">Text</span> and [links](url), nested in any order.
+        # The string is tokenized once per unique value (see renderers/inline_markup.py).
+        # Font, base size and text color come from the theme's character styles; runs
+        # only carry properties that differ from their style.
+        for part, bold, color, url in inline_runs(text):
+            run = paragraph.add_run(part)
+            
+            span_color = color
+            if bold:
+                style_name = BOLD_STYLE
+            elif color and color.lower() == self.accent_color:
+                style_name = ACCENT_STYLE
+                color = None # Provided by the style
             else:
-                run.text = part
+                style_name = BODY_STYLE
+            set_run_style(run, self.style_ids[style_name])
+            
+            if color:
+                run.font.color.rgb = hex_to_rgb(color)
             
             # Apply Overrides (Global for this line)
             if font_size_override:
                 run.font.size = font_size_override
-            if color_override and not part.startswith('<span'): # Don't override explicit spans
+            if color_override and not span_color: # Don't override explicit spans
                 run.font.color.rgb = color_override
+            
+            if url:
+                self.link_run(paragraph, run, url)
 
+    def link_run(self, paragraph, run, url):
+        """Wraps an already formatted run in a hyperlink to `url`."""
+        r_id = paragraph.part.relate_to(url, 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/hyperlink', is_external=True)
+        hyperlink = OxmlElement('w:hyperlink')
+        hyperlink.set(qn('r:id'), r_id)
+        run._r.addprevious(hyperlink)
+        hyperlink.append(run._r)
+
+    @DOCX_BLOCKS.register('project_block')
     def render_project_block(self, config):
         # 1. Render Items (Highlights)
         style = config.get('style', 'simple')
@@ -1179,29 +1057,12 @@ class DocxRenderer:
             # Border & Padding
             tcPr = cell._tc.get_or_add_tcPr()
             
-            # Padding
-            tcMar = OxmlElement('w:tcMar')
-            for side in ['top', 'bottom', 'left', 'right']:
-                width = '220' if side == 'left' else '0' # 11pt left padding
-                node = OxmlElement(f'w:{side}')
-                node.set(qn('w:w'), width)
-                node.set(qn('w:type'), 'dxa')
-                tcMar.append(node)
-            tcPr.append(tcMar)
+            # Padding (11pt left padding)
+            append_copy(tcPr, cell_margins(PAD_LEFT))
             
             # Border
-            tcBorders = tcPr.find(qn('w:tcBorders'))
-            if tcBorders is None:
-                tcBorders = OxmlElement('w:tcBorders')
-                tcPr.append(tcBorders)
-                
-            left = OxmlElement('w:left')
-            left.set(qn('w:val'), 'single')
-            left.set(qn('w:sz'), '32')
-            left.set(qn('w:space'), '0')
             c_hex = get_theme_color(self.theme, config.get('border_color', 'primary_color'))
-            left.set(qn('w:color'), c_hex.lstrip('#'))
-            tcBorders.append(left)
+            add_cell_border(tcPr, cell_border('left', 'single', '32', c_hex.lstrip('#')))
             
             # Clear default paragraph
             target.paragraphs[0]._element.getparent().remove(target.paragraphs[0]._element)
@@ -1267,13 +1128,9 @@ class DocxRenderer:
                 
                 # Apply Shading (Highlight)
                 rPr = run._r.get_or_add_rPr()
-                shd = OxmlElement('w:shd')
-                shd.set(qn('w:val'), 'clear')
-                shd.set(qn('w:color'), 'auto')
                 # Use primary color for background
                 match_color = get_theme_color(self.theme, 'primary_color').lstrip('#')
-                shd.set(qn('w:fill'), match_color)
-                rPr.append(shd)
+                append_copy(rPr, shading(match_color))
 
         # Spacer after block if it was a table
         if style == 'left_border':
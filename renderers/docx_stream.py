@@ -0,0 +1,136 @@
+import zipfile
+
+from lxml import etree
+from docx.oxml.ns import qn
+# Builds [Content_Types].xml exactly as Document.save() does
+from docx.opc.pkgwriter import _ContentTypesItem
+
+from engine.manifest import hash_value
+from engine.profiler import stage
+from renderers.docx_renderer import DocxRenderer
+
+# Package parts the renderer never edits once the document is set up. Their
+# serialized bytes are identical for every document of a theme, so a batch
+# serializes them once per theme (see StreamingDocxWriter.part_blob).
+SHARED_PARTS = (
+    '/word/styles.xml',
+    '/word/numbering.xml',
+    '/word/settings.xml',
+    '/word/fontTable.xml',
+    '/word/webSettings.xml',
+    '/word/theme/theme1.xml',
+)
+
+# (theme digest, partname) -> serialized part
+_shared_blobs = {}
+
+class StreamingDocxWriter(DocxRenderer):
+    """
+    DOCX backend that streams word/document.xml straight into the output zip.
+
+    Accepts the same layout (sections and config.footer) as
+    DocxRenderer.render and reuses its block handlers, but after each
+    layout section (one entry of `sections`: its page break and its block,
+    with all of the block's items) the new body elements are serialized
+    into the zip entry and dropped from the in-memory tree. Peak memory is
+    therefore the largest section (e.g. a long experience list) plus the
+    package parts (styles, headers, footers), instead of the whole document
+    tree and its serialized copy.
+
+    Footers are attached to each Word section as soon as it exists,
+    because its properties are written out with the layout section that
+    ends it.
+
+    Usage:
+        StreamingDocxWriter(theme).write(content_data, 'resume.docx')
+    """
+
+    def __init__(self, theme):
+        super().__init__(theme)
+        self.theme_digest = hash_value(theme)
+
+    def write(self, content_data, output_path):
+        """Renders content_data and writes the complete .docx to output_path."""
+        footer_config = content_data.get('config', {}).get('footer')
+        document = self.doc.element
+        body = document.body
+
+        opening, closing = self.document_shell(document, body)
+        # Namespaces are declared once on <w:document>; repeating them on every block is dead weight
+        self.declarations = [f' xmlns:{prefix}="{uri}"'.encode('utf-8')
+                             for prefix, uri in document.nsmap.items() if prefix]
+
+        with zipfile.ZipFile(output_path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            with archive.open('word/document.xml', 'w') as stream:
+                stream.write(opening)
+                for section in content_data.get('sections', []):
+                    self.render_section(section)
+                    if footer_config:
+                        self.apply_pending_footers(footer_config)
+                    self.flush_body(stream, body)
+                # The final section's properties close the body
+                if body.sectPr is not None:
+                    stream.write(self.serialize(body.sectPr))
+                stream.write(closing)
+
+            with stage('docx.save'):
+                self.write_package(archive)
+        print(f"Saved DOCX to: {output_path}")
+
+    def apply_pending_footers(self, footer_config):
+        """Adds the footer to every section that does not have one yet (new sections)."""
+        for section in self.doc.sections:
+            if section._sectPr.find(qn('w:footerReference')) is None:
+                self.set_section_footer(section, footer_config)
+
+    def document_shell(self, document, body):
+        """
+        Returns the bytes before and after the body's content: the XML
+        declaration, <w:document ...><w:body> and </w:body></w:document>.
+        """
+        shell = etree.Element(document.tag, attrib=dict(document.attrib), nsmap=document.nsmap)
+        etree.SubElement(shell, body.tag).text = 'BODY'
+        serialized = etree.tostring(shell, encoding='UTF-8', standalone=True)
+        opening, closing = serialized.split(b'BODY')
+        return opening, closing
+
+    def serialize(self, element):
+        """Serializes one body element, dropping namespace declarations already made on <w:document>."""
+        fragment = etree.tostring(element, encoding='UTF-8', xml_declaration=False)
+        end = fragment.index(b'>')
+        head = fragment[:end]
+        for declaration in self.declarations:
+            head = head.replace(declaration, b'')
+        return head + fragment[end:]
+
+    def flush_body(self, stream, body):
+        """Writes every rendered body element (all but the final sectPr) and releases it."""
+        sentinel = body.sectPr
+        for child in list(body):
+            if child is sentinel:
+                continue
+            stream.write(self.serialize(child))
+            body.remove(child)
+
+    def write_package(self, archive):
+        """Writes every part except document.xml (already streamed), plus rels and content types."""
+        package = self.doc.part.package
+        parts = list(package.parts)
+        for part in parts:
+            part.before_marshal()
+        archive.writestr('[Content_Types].xml', _ContentTypesItem.from_parts(parts).blob)
+        archive.writestr('_rels/.rels', package.rels.xml)
+        for part in parts:
+            if part is not self.doc.part:
+                archive.writestr(part.partname.membername, self.part_blob(part))
+            if len(part.rels):
+                archive.writestr(part.partname.rels_uri.membername, part.rels.xml)
+
+    def part_blob(self, part):
+        if part.partname not in SHARED_PARTS:
+            return part.blob
+        key = (self.theme_digest, str(part.partname))
+        blob = _shared_blobs.get(key)
+        if blob is None:
+            blob = _shared_blobs[key] = part.blob
+        return blob
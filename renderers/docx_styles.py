@@ -0,0 +1,40 @@
+from docx.enum.style import WD_STYLE_TYPE
+
+# Named character (run) styles registered in styles.xml of each theme's base
+# document (see DocxRenderer.setup_character_styles). Runs reference them with
+# a single <w:rStyle> instead of repeating font, size and color on every run.
+BODY_STYLE = 'Resume Body'
+BOLD_STYLE = 'Resume Bold'
+ACCENT_STYLE = 'Resume Accent'
+FOOTER_STYLE = 'Resume Footer'
+
+def add_character_style(styles, name, base=None, font_name=None, size=None, color=None, bold=None):
+    """
+    Adds a character style to a document's styles (the base document's only;
+    clones share styles.xml and must not change it).
+    Args:
+        styles: The document's Styles collection (doc.styles).
+        name (str): Display name, e.g. 'Resume Body'.
+        base (str): Name of the style this one inherits from, if any.
+        font_name, size, color, bold: Run properties; None leaves the property unset.
+    """
+    style = styles.add_style(name, WD_STYLE_TYPE.CHARACTER)
+    if base:
+        style.base_style = styles[base]
+    if font_name:
+        style.font.name = font_name
+    if size:
+        style.font.size = size
+    if color:
+        style.font.color.rgb = color
+    if bold is not None:
+        style.font.bold = bold
+
+def character_style_ids(doc):
+    """Maps each style name above to its id in `doc` (what <w:rStyle> references)."""
+    return {name: doc.styles[name].style_id
+            for name in (BODY_STYLE, BOLD_STYLE, ACCENT_STYLE, FOOTER_STYLE)}
+
+def set_run_style(run, style_id):
+    """Points a run at a character style by id (skips python-docx's lookup by name for every run)."""
+    run._r.style = style_id
@@ -1,4 +1,52 @@
-from jinja2 import Environment, FileSystemLoader
+import json
+import hashlib
+from pathlib import Path
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache
+
+from engine.profiler import stage
+from engine.html_minify import minify_html, minify_css
+from renderers.registry import HTML_BLOCKS
+from renderers.inline_markup import inline_html
+
+# Process-wide Jinja environments, one per templates directory (see get_environment)
+_environments = {}
+
+# Generated stylesheets keyed on (theme digest, stripe config digest, mode).
+# Shared by every HtmlRenderer in the process (targets, PDF pass, batch variants).
+_css_cache = {}
+
+# Where external stylesheets are written (relative to the project root) when enabled
+GENERATED_CSS_DIR = 'assets/css/generated'
+
+def config_digest(value):
+    """Stable hash of a theme/config dict (key order independent)."""
+    encoded = json.dumps(value, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha1(encoded).hexdigest()
+
+def markdown_filter(text):
+    """Jinja filter converting **bold**, [text](link) and color spans (see renderers/inline_markup.py)."""
+    if not text: return ""
+    return inline_html(text)
+
+def get_environment(templates_dir):
+    """
+    Returns the shared Jinja2 Environment for a templates directory.
+    Created once per process, so every HtmlRenderer (web, PDF, every target and
+    batch variant) reuses the same compiled templates from the environment's cache.
+    Compiled template bytecode is also persisted in .cache/jinja/ next to the
+    templates folder, so new processes (build workers) skip parsing/compiling too.
+    """
+    templates_dir = Path(templates_dir).resolve()
+    env = _environments.get(templates_dir)
+    if env is None:
+        cache_dir = templates_dir.parent / '.cache' / 'jinja'
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        env = Environment(loader=FileSystemLoader(str(templates_dir)),
+                          bytecode_cache=FileSystemBytecodeCache(str(cache_dir)))
+        # Register Markdown Filter for converting bold/links in text blocks
+        env.filters['markdown'] = markdown_filter
+        _environments[templates_dir] = env
+    return env
 
 def get_theme_color(theme, color_key):
     """Resolves 'primary_color' to actual hex, or checks if it's already hex."""
@@ -12,19 +60,23 @@ class HtmlRenderer:
     Responsible for generating dynamic CSS based on the theme (style.yaml).
     """
 
-    def __init__(self, theme, base_dir):
+    def __init__(self, theme, base_dir, external_css=False, minify=True):
         """
-        Initialize with theme data and setup Jinja2 environment.
+        Initialize with theme data and the shared Jinja2 environment.
         Args:
             theme (dict): The resolved theme configuration.
             base_dir (Path): Root directory to locate 'templates/'.
+            external_css (bool): Web mode only. Write the generated CSS once to
+                                 assets/css/generated/web.<hash>.css and link it,
+                                 instead of inlining it into every page.
+            minify (bool): Minify saved pages and linked stylesheets (engine/html_minify.py).
         """
         self.theme = theme
-        self.env = Environment(loader=FileSystemLoader(str(base_dir / 'templates')))
-        
-        # Register Markdown Filter for converting bold/links in text blocks
-        self.env.filters['markdown'] = self.markdown_filter
-        
+        self.base_dir = Path(base_dir)
+        self.external_css = external_css
+        self.minify = minify
+        # Shared, bytecode-cached environment (see get_environment)
+        self.env = get_environment(base_dir / 'templates')
         self.template = self.env.get_template('base.html')
 
     def render(self, content_data, mode='web'):
@@ -58,18 +110,61 @@ class HtmlRenderer:
                  print("DEBUG: Using Theme Fallback for Stripe")
                  stripe_config = theme_stripe
         
-        # 2. Process Sections (Resolution)
+        # 2. Process Sections (Resolution), then render each block through the registry
         processed_sections = self.process_sections(sections)
-        
-        # 3. Generate CSS (Pass stripe config and mode)
-        css_content = self.generate_css(stripe_config, mode)
-        
-        return self.template.render(
-            theme=self.theme,
-            sections=processed_sections,
-            css_content=css_content,
-            stripe_config=stripe_config # Pass to template
-        )
+        blocks = []
+        for section in processed_sections:
+            block_type = section.get('type')
+            # Blocks without an HTML handler (e.g. stripe_block, drawn from stripe_config) are skipped
+            if block_type in HTML_BLOCKS:
+                blocks.append(HTML_BLOCKS.render(self, block_type, section.get('config', {})))
+        
+        # 3. Generate CSS (Pass stripe config and mode), memoized per theme/stripe/mode
+        with stage('html.css'):
+            css_content = self.get_css(stripe_config, mode)
+        if self.external_css and mode == 'web':
+            css_content = self.link_css_file(css_content, mode)
+        
+        with stage('html.template'):
+            return self.template.render(
+                theme=self.theme,
+                sections=processed_sections,
+                blocks=blocks,
+                css_content=css_content,
+                stripe_config=stripe_config # Pass to template
+            )
+
+    def get_css(self, stripe_config=None, mode='web'):
+        """
+        Returns generate_css() output, building it only once per distinct
+        (theme, stripe config, mode) in this process.
+        Keyed on the theme's content (not identity), so renderers holding
+        equal themes share entries and a modified theme gets a new one.
+        """
+        key = (config_digest(self.theme), config_digest(stripe_config), mode)
+        css = _css_cache.get(key)
+        if css is None:
+            css = _css_cache[key] = self.generate_css(stripe_config, mode)
+        return css
+
+    def link_css_file(self, css_content, mode):
+        """
+        Writes the stylesheet to a content-hashed file (skipped if it already
+        exists) and returns the <link> tag that replaces the inline <style>.
+        Pages with identical CSS share one cacheable file.
+        """
+        css = css_content.strip()
+        if css.startswith('<style>') and css.endswith('</style>'):
+            css = css[len('<style>'):-len('</style>')]
+        css = (minify_css(css) if self.minify else css) + "\n"
+        name = f"{mode}.{hashlib.sha1(css.encode('utf-8')).hexdigest()[:12]}.css"
+        css_path = self.base_dir / GENERATED_CSS_DIR / name
+        if not css_path.exists():
+            css_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(css_path, 'w', encoding='utf-8') as f:
+                f.write(css)
+            print(f"Saved CSS to: {css_path}")
+        return f'<link rel="stylesheet" href="{GENERATED_CSS_DIR}/{name}">'
 
     def generate_css(self, stripe_config=None, mode='web'):
         t = self.theme
@@ -350,12 +445,16 @@ class HtmlRenderer:
         </style>
         """
     
-    def markdown_filter(self, text):
-        if not text: return ""
-        import re
-        text = re.sub(r'\*\*(.*?)\*\*', r'<strong>\1</strong>', text)
-        text = re.sub(r'\[(.*?)\]\((.*?)\)', r'<a href="\2">\1</a>', text)
-        return text
+    markdown_filter = staticmethod(markdown_filter)
+
+    def render_block_template(self, block_type, config):
+        """Renders templates/blocks/<block_type>.html for one section."""
+        template = self.env.get_template(f'blocks/{block_type}.html')
+        return template.render(
+            section={'type': block_type, 'config': config},
+            theme=self.theme,
+            pb_class='page-break' if config.get('page_break_before') else ''
+        )
         
     def preprocess_theme_colors(self):
         for key in ['primary_color', 'accent_color', 'text_color', 'background_color']:
@@ -395,6 +494,29 @@ class HtmlRenderer:
         return processed
 
     def save(self, html_content, output_path):
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        """
+        Writes the page, minified unless disabled (engine/html_minify.py):
+        whitespace collapsed, and the inline CSS reduced to the rules for
+        classes this page uses.
+        """
+        with stage('html.save'):
+            if self.minify:
+                html_content = minify_html(html_content)
+            with open(output_path, 'w', encoding='utf-8') as f:
+                f.write(html_content)
         print(f"Saved HTML to: {output_path}")
+
+# Built-in block types, each rendered by its template in templates/blocks/
+TEMPLATE_BLOCKS = (
+    'header_block', 'section_title_block', 'compound_text_block', 'text_block', 'grid_block',
+    'list_block', 'plain_list_block', 'compact_list_block', 'text_grid_block', 'project_block',
+)
+
+def template_block(block_type):
+    """Returns an HTML_BLOCKS handler rendering templates/blocks/<block_type>.html."""
+    def render(renderer, config):
+        return renderer.render_block_template(block_type, config)
+    return render
+
+for _block_type in TEMPLATE_BLOCKS:
+    HTML_BLOCKS.register(_block_type)(template_block(_block_type))
@@ -0,0 +1,106 @@
+import re
+from functools import lru_cache
+
+# Inline markup accepted in content strings (store.yaml / layouts):
+#   **bold**
+#   [label](url)
+#   <span style="color: #E65100">colored</span>
+# Each may contain the others, e.g. <span style="color: #E65100">**10x**</span>.
+# Like the original per-renderer regexes, markup does not span lines.
+INLINE_PATTERN = re.compile(
+    r'\*\*(?P<bold>.*?)\*\*'
+    r'|<span style="(?P<style>color:[^"]*)">(?P<span>.*?)</span>'
+    r'|\[(?P<label>.*?)\]\((?P<url>.*?)\)'
+)
+HEX_COLOR = re.compile(r'color:\s*(#[0-9a-fA-F]{6})')
+
+@lru_cache(maxsize=4096)
+def parse_inline(text):
+    """
+    Parses a content string into a tree of nodes (cached per unique string):
+        ('text', str)
+        ('bold', children)
+        ('color', style, children)   # style is the span's style attribute, e.g. 'color: #E65100'
+        ('link', url, children)
+    Returns:
+        tuple: The top-level nodes. Tuples are immutable, so cached trees are safe to share.
+    """
+    nodes = []
+    position = 0
+    for match in INLINE_PATTERN.finditer(text):
+        if match.start() > position:
+            nodes.append(('text', text[position:match.start()]))
+        if match.group('bold') is not None:
+            nodes.append(('bold', parse_inline(match.group('bold'))))
+        elif match.group('style') is not None:
+            nodes.append(('color', match.group('style'), parse_inline(match.group('span'))))
+        else:
+            nodes.append(('link', match.group('url'), parse_inline(match.group('label'))))
+        position = match.end()
+    if position < len(text):
+        nodes.append(('text', text[position:]))
+    return tuple(nodes)
+
+@lru_cache(maxsize=4096)
+def inline_runs(text):
+    """
+    Flattens parse_inline(text) into formatted runs for run-based output (DOCX).
+    Returns:
+        tuple: (text, bold, color, url) per run; color is '#RRGGBB' or None.
+    """
+    runs = []
+
+    def walk(nodes, bold, color, url):
+        for node in nodes:
+            kind = node[0]
+            if kind == 'text':
+                runs.append((node[1], bold, color, url))
+            elif kind == 'bold':
+                walk(node[1], True, color, url)
+            elif kind == 'color':
+                match = HEX_COLOR.search(node[1])
+                walk(node[2], bold, match.group(1) if match else color, url)
+            else:
+                walk(node[2], bold, color, node[1])
+
+    walk(parse_inline(text), False, None, None)
+    return tuple(runs)
+
+def _html(nodes):
+    parts = []
+    for node in nodes:
+        kind = node[0]
+        if kind == 'text':
+            parts.append(node[1])
+        elif kind == 'bold':
+            parts.append(f"<strong>{_html(node[1])}</strong>")
+        elif kind == 'color':
+            parts.append(f'<span style="{node[1]}">{_html(node[2])}</span>')
+        else:
+            parts.append(f'<a href="{node[1]}">{_html(node[2])}</a>')
+    return ''.join(parts)
+
+@lru_cache(maxsize=4096)
+def inline_html(text):
+    """HTML for a content string. Text is passed through unescaped (content may contain HTML)."""
+    return _html(parse_inline(text))
+
+def _markdown(nodes):
+    parts = []
+    for node in nodes:
+        kind = node[0]
+        if kind == 'text':
+            parts.append(node[1])
+        elif kind == 'bold':
+            parts.append(f"**{_markdown(node[1])}**")
+        elif kind == 'color':
+            # Markdown viewers (e.g. GitHub) strip inline styles; keep the content only
+            parts.append(_markdown(node[2]))
+        else:
+            parts.append(f"[{_markdown(node[2])}]({node[1]})")
+    return ''.join(parts)
+
+@lru_cache(maxsize=4096)
+def inline_markdown(text):
+    """Markdown for a content string: bold and links as-is, color spans reduced to their content."""
+    return _markdown(parse_inline(text))
@@ -1,3 +1,11 @@
+from engine.profiler import stage
+from renderers.registry import MD_BLOCKS
+from renderers.inline_markup import inline_markdown
+
+def md_inline(value):
+    """Content string in Markdown form (color spans reduced to text); non-strings pass through."""
+    return inline_markdown(value) if isinstance(value, str) else value
+
 class MdRenderer:
     def __init__(self, theme):
         self.theme = theme
@@ -14,40 +22,20 @@ class MdRenderer:
             if config.get('page_break_before'):
                 self.output.append("\n---\n") # Horizontal Rule as Page Break
             
-            if block_type == 'header_block':
-                self.render_header_block(config)
-            elif block_type == 'section_title_block':
-                self.render_section_title_block(config)
-            elif block_type == 'compound_text_block':
-                self.render_compound_text_block(config)
-            elif block_type == 'text_block':
-                self.render_text_block(config)
-            elif block_type == 'grid_block':
-                self.render_grid_block(config)
-            elif block_type == 'list_block':
-                self.render_list_block(config)
-            elif block_type == 'plain_list_block':
-                self.render_plain_list_block(config)
-            elif block_type == 'compact_list_block':
-                self.render_compact_list_block(config)
-            elif block_type == 'text_grid_block':
-                self.render_text_grid_block(config)
-            elif block_type == 'project_block':
-                self.render_project_block(config)
-            elif block_type == 'stripe_block':
-                pass # Ignore stripe in Markdown
-            else:
-                pass # Unknown
+            # Blocks without a Markdown handler (e.g. stripe_block) are skipped
+            if block_type in MD_BLOCKS:
+                MD_BLOCKS.render(self, block_type, config)
 
         return "\n".join(self.output)
 
     def save(self, content, output_path):
-        with open(output_path, 'w', encoding='utf-8') as f:
+        with stage('md.save'), open(output_path, 'w', encoding='utf-8') as f:
             f.write(content)
         print(f"Saved MD to: {output_path}")
 
     # --- BLOCK RENDERERS ---
 
+    @MD_BLOCKS.register('header_block')
     def render_header_block(self, config):
         title = config.get('title', '')
         self.output.append(f"# {title}")
@@ -56,10 +44,12 @@ class MdRenderer:
         if subtitle:
             self.output.append(f"**{subtitle}**\n")
 
+    @MD_BLOCKS.register('section_title_block')
     def render_section_title_block(self, config):
         title = config.get('content', '')
         self.output.append(f"## {title}")
 
+    @MD_BLOCKS.register('compound_text_block')
     def render_compound_text_block(self, config):
         # Center aligned usually, but MD is just text.
         # We will join them with the separator.
@@ -77,8 +67,9 @@ class MdRenderer:
         
         self.output.append(" ".join(line_parts) + "\n")
 
+    @MD_BLOCKS.register('text_block')
     def render_text_block(self, config):
-        content = config.get('content', '')
+        content = md_inline(config.get('content', ''))
         style = config.get('style', 'normal')
         
         if style == 'shaded':
@@ -91,6 +82,7 @@ class MdRenderer:
         else:
             self.output.append(content + "\n")
 
+    @MD_BLOCKS.register('grid_block')
     def render_grid_block(self, config):
         # 2-Column Grid. MD Tables or just Header/Content?
         # Let's use simple Header/Content sequence for readability in raw markdown,
@@ -107,9 +99,10 @@ class MdRenderer:
             
             content_list = item.get('content', [])
             for line in content_list:
-                self.output.append(f"- {line}")
+                self.output.append(f"- {md_inline(line)}")
         self.output.append("")
 
+    @MD_BLOCKS.register('list_block')
     def render_list_block(self, config):
         title = config.get('title')
         if title:
@@ -134,9 +127,10 @@ class MdRenderer:
                 self.output.append(f"_{sub}_")
                 
             for detail in item.get('details', []):
-                self.output.append(f"- {detail}")
+                self.output.append(f"- {md_inline(detail)}")
         self.output.append("")
 
+    @MD_BLOCKS.register('plain_list_block')
     def render_plain_list_block(self, config):
         title = config.get('title')
         if title:
@@ -144,9 +138,10 @@ class MdRenderer:
 
         items = config.get('items', [])
         for item in items:
-            self.output.append(f"- {item}")
+            self.output.append(f"- {md_inline(item)}")
         self.output.append("")
 
+    @MD_BLOCKS.register('compact_list_block')
     def render_compact_list_block(self, config):
         title = config.get('title')
         if title:
@@ -154,11 +149,12 @@ class MdRenderer:
             
         items = config.get('items', [])
         for item in items:
-            content = item.get('content', '')
+            content = md_inline(item.get('content', ''))
             date = item.get('date', '')
             self.output.append(f"- {content} (*{date}*)")
         self.output.append("")
 
+    @MD_BLOCKS.register('text_grid_block')
     def render_text_grid_block(self, config):
         # Similar to grid but just paragraphs
         if config.get('title'):
@@ -167,10 +163,11 @@ class MdRenderer:
         items = config.get('items', [])
         for item in items:
             for line in item.get('content', []):
-                self.output.append(line)
+                self.output.append(md_inline(line))
             self.output.append("")
         self.output.append("")
 
+    @MD_BLOCKS.register('project_block')
     def render_project_block(self, config):
         title = config.get('title', '')
         if title:
@@ -187,5 +184,5 @@ class MdRenderer:
         # Items
         items = config.get('items', [])
         for item in items:
-             self.output.append(f"- {item}")
+             self.output.append(f"- {md_inline(item)}")
         self.output.append("")
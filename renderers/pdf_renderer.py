@@ -1,17 +1,47 @@
+import io
+import os
+import time
+import tempfile
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor
 import pdfkit
 
+from engine import profiler
+
+# Supported PDF engines:
+# - 'wkhtmltopdf': pdfkit driving the wkhtmltopdf binary (one subprocess per document).
+# - 'weasyprint': pure in-process rendering (optional dependency, `pip install weasyprint`).
+PDF_ENGINES = ('wkhtmltopdf', 'weasyprint')
+
 class PdfRenderer:
-    def __init__(self, theme):
+    def __init__(self, theme, engine='wkhtmltopdf'):
         self.theme = theme
-        # Hardcoded path for Windows dev environment
-        # user might need to adjust this path if different
-        self.wkhtmltopdf_path = r'C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe'
-        self.config = pdfkit.configuration(wkhtmltopdf=self.wkhtmltopdf_path)
-        
+        self.engine = engine
+        self._footer_template = None
+        if engine == 'weasyprint':
+            # Imported lazily: WeasyPrint is optional and heavy to import
+            import weasyprint
+            self.weasyprint = weasyprint
+        elif engine == 'wkhtmltopdf':
+            # Hardcoded path for Windows dev environment
+            # user might need to adjust this path if different
+            self.wkhtmltopdf_path = r'C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe'
+            self.config = pdfkit.configuration(wkhtmltopdf=self.wkhtmltopdf_path)
+        else:
+            raise ValueError(f"Unknown PDF engine '{engine}', expected one of {PDF_ENGINES}")
+
     def render_from_html(self, html_content, output_path, footer_config=None):
+        """
+        Converts rendered HTML to a PDF file.
+        Returns:
+            bool: True if the PDF was written.
+        """
+        if self.engine == 'weasyprint':
+            return self.render_with_weasyprint(html_content, output_path, footer_config)
+
         options = {
             'page-size': 'Letter',
-            'margin-top': '0mm', 
+            'margin-top': '0mm',
             'margin-right': '0mm', # Revert to 0 for full bleed stripe
             'margin-bottom': '15mm', # Space for footer
             'margin-left': '0mm',  # Revert to 0 for full bleed stripe
@@ -21,44 +51,40 @@ class PdfRenderer:
             'disable-smart-shrinking': None,
             'print-media-type': None
         }
-        
+
         # Handle Footer using HTML Template (to support padding + full bleed body)
         temp_footer_path = None
         if footer_config:
-            import os
-            
             text = footer_config.get('text', '')
             show_pages = footer_config.get('show_pages', False)
-            
-            # Read Template
-            footer_template_path = os.path.join(os.path.dirname(self.wkhtmltopdf_path).replace('bin', ''), '..', 'templates', 'footer_template.html') 
-            # Note: We are in renderers/, so templates/ is ../templates
-            # Better: use explicit path relative to Cwd
-            
+
+            # Read Template (relative to Cwd, templates/footer_template.html).
+            # Cached on the instance, so long-lived renderers (see PdfRenderPool) read it once.
             base_dir = os.getcwd()
-            template_path = os.path.join(base_dir, 'templates', 'footer_template.html')
-            
-            with open(template_path, 'r', encoding='utf-8') as f:
-                template_str = f.read()
-                
+            template_str = self.get_footer_template(base_dir)
+
             # Simple String Replace (avoid jinja env overhead here or reuse if passed? String replace is fine for simple)
             rendered_footer = template_str.replace('{{ footer_text }}', text)
             rendered_footer = rendered_footer.replace('{{ display_pages_style }}', '' if show_pages else 'display: none;')
-            
+
             # Save Temp Footer
-            temp_footer_path = os.path.join(base_dir, 'temp_footer.html')
-            with open(temp_footer_path, 'w', encoding='utf-8') as f:
+            # Unique name per render so parallel PDF jobs don't overwrite each other's footer
+            fd, temp_footer_path = tempfile.mkstemp(prefix='temp_footer_', suffix='.html', dir=base_dir)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
                 f.write(rendered_footer)
-                
+
             options['footer-html'] = temp_footer_path
             options['footer-spacing'] = '5'
-        
+
         try:
-            pdfkit.from_string(html_content, output_path, configuration=self.config, options=options)
+            with profiler.stage('pdf.pdfkit'):
+                pdfkit.from_string(html_content, output_path, configuration=self.config, options=options)
             print(f"Saved PDF to: {output_path}")
+            return True
         except OSError as e:
             print(f"Error generating PDF: {e}")
             print("Make sure wkhtmltopdf is installed and the path is correct.")
+            return False
         finally:
             # Cleanup
             if temp_footer_path and os.path.exists(temp_footer_path):
@@ -66,3 +92,98 @@ class PdfRenderer:
                     os.remove(temp_footer_path)
                 except:
                     pass
+
+    def get_footer_template(self, base_dir):
+        if self._footer_template is None:
+            template_path = os.path.join(base_dir, 'templates', 'footer_template.html')
+            with open(template_path, 'r', encoding='utf-8') as f:
+                self._footer_template = f.read()
+        return self._footer_template
+
+    def render_with_weasyprint(self, html_content, output_path, footer_config=None):
+        """
+        In-process rendering with WeasyPrint. No subprocess and no temp files:
+        the footer is expressed as CSS @page margin boxes instead of footer-html.
+        """
+        margins = self.theme.get('margins', {})
+        footer_css = ""
+        if footer_config:
+            text = footer_config.get('text', '').replace('\\', '\\\\').replace('"', '\\"')
+            footer_color = self.theme.get('footer', {}).get('text_color', '#666666')
+            box_style = f'font-family: Arial, sans-serif; font-size: 8pt; color: {footer_color};'
+            footer_css = f'@bottom-center {{ content: "{text}"; {box_style} }}'
+            if footer_config.get('show_pages', False):
+                footer_css += (f' @bottom-right {{ content: "Page " counter(page) " of " counter(pages);'
+                               f' margin-right: {margins.get("right", 12.7)}mm; {box_style} }}')
+
+        # Same page box as the wkhtmltopdf options: Letter, full bleed, 15mm footer band
+        page_css = f"@page {{ size: Letter; margin: 0mm 0mm 15mm 0mm; {footer_css} }}"
+        try:
+            with profiler.stage('pdf.weasyprint'):
+                document = self.weasyprint.HTML(string=html_content, base_url=os.getcwd())
+                document.write_pdf(output_path, stylesheets=[self.weasyprint.CSS(string=page_css)])
+            print(f"Saved PDF to: {output_path}")
+            return True
+        except Exception as e:
+            print(f"Error generating PDF: {e}")
+            return False
+
+# Per-process renderer for PdfRenderPool workers (created once by the initializer)
+_pool_renderer = None
+
+def _init_pool_worker(theme, engine, profile=False):
+    global _pool_renderer
+    if profile:
+        profiler.enable()
+    _pool_renderer = PdfRenderer(theme, engine=engine)
+
+def _render_in_pool_worker(html_content, output_path, footer_config, theme):
+    if theme is not None:
+        _pool_renderer.theme = theme
+    log = io.StringIO()
+    start = time.perf_counter()
+    with redirect_stdout(log):
+        ok = _pool_renderer.render_from_html(html_content, output_path, footer_config=footer_config)
+    return {'ok': ok, 'log': log.getvalue(), 'wall': time.perf_counter() - start,
+            'profile': profiler.take_records()}
+
+class PdfRenderPool:
+    """
+    A pool of long-lived PDF renderer processes fed through a work queue.
+
+    Each worker builds its PdfRenderer once (engine setup, footer template)
+    and then converts documents as they are submitted, so a batch of N PDFs
+    does not pay renderer setup N times and up to `workers` conversions run
+    concurrently. Temp footer files are unique per render, so concurrent
+    conversions never collide.
+
+    Usage:
+        with PdfRenderPool(theme, workers=4) as pool:
+            future = pool.submit(html, 'resume.pdf', footer_config)
+        future.result()  # {'ok': bool, 'log': captured output, 'wall': seconds, 'profile': stages}
+    """
+
+    def __init__(self, theme, workers=2, engine='wkhtmltopdf', profile=False):
+        self.executor = ProcessPoolExecutor(max_workers=max(1, workers),
+                                            initializer=_init_pool_worker,
+                                            initargs=(theme, engine, profile))
+
+    def submit(self, html_content, output_path, footer_config=None, theme=None):
+        """
+        Queues a conversion.
+        Args:
+            theme (dict, optional): Overrides the pool's theme for this document (batch variants).
+        Returns:
+            Future: resolves to {'ok', 'log', 'wall', 'profile'}.
+        """
+        return self.executor.submit(_render_in_pool_worker, html_content, str(output_path), footer_config, theme)
+
+    def close(self):
+        """Waits for all queued conversions and shuts the workers down."""
+        self.executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
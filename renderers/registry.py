@@ -0,0 +1,111 @@
+import time
+from contextlib import contextmanager
+from importlib.metadata import entry_points
+
+# Entry point group scanned for third-party block types (see load_plugins)
+PLUGIN_GROUP = 'resume_generator.blocks'
+
+class BlockRegistry:
+    """
+    Maps a block 'type' (from the layout YAML) to the handler that renders it
+    for one output format. Handlers are registered with a decorator:
+
+        @DOCX_BLOCKS.register('text_block')
+        def render_text_block(self, config): ...
+
+    and called as handler(renderer, config). Dispatch is a single dict lookup,
+    and every block goes through render(), so per-block instrumentation lives
+    in one place (see set_block_probe).
+    """
+
+    def __init__(self, name):
+        """
+        Args:
+            name (str): Format this registry renders ('docx', 'md', 'html').
+        """
+        self.name = name
+        self.handlers = {}
+
+    def register(self, *block_types):
+        """Decorator registering a handler for one or more block types. Later registrations win."""
+        def decorator(handler):
+            for block_type in block_types:
+                self.handlers[block_type] = handler
+            return handler
+        return decorator
+
+    def __contains__(self, block_type):
+        load_plugins()
+        return block_type in self.handlers
+
+    def render(self, renderer, block_type, config):
+        """
+        Renders one block with its registered handler.
+        Returns:
+            Whatever the handler returns (HTML handlers return markup).
+        Raises:
+            KeyError: No handler is registered for block_type.
+        """
+        load_plugins()
+        handler = self.handlers[block_type]
+        if _block_probe is None:
+            return handler(renderer, config)
+        with _block_probe(self.name, block_type):
+            return handler(renderer, config)
+
+DOCX_BLOCKS = BlockRegistry('docx')
+MD_BLOCKS = BlockRegistry('md')
+HTML_BLOCKS = BlockRegistry('html')
+
+REGISTRIES = {registry.name: registry for registry in (DOCX_BLOCKS, MD_BLOCKS, HTML_BLOCKS)}
+
+# Optional probe(format, block_type) -> context manager wrapped around every block render
+_block_probe = None
+
+def set_block_probe(probe):
+    """Installs (or with None, removes) the per-block probe, e.g. a timer."""
+    global _block_probe
+    _block_probe = probe
+
+_plugins_loaded = False
+
+def load_plugins():
+    """
+    Imports block type plugins once per process.
+    A plugin is any installed package declaring an entry point in the
+    'resume_generator.blocks' group, e.g. in its pyproject.toml:
+
+        [project.entry-points."resume_generator.blocks"]
+        timeline = "my_blocks.timeline"
+
+    Loading the entry point imports the module, whose decorators register its
+    handlers on DOCX_BLOCKS / MD_BLOCKS / HTML_BLOCKS. If the entry point
+    refers to a callable instead, it is called with REGISTRIES.
+    """
+    global _plugins_loaded
+    if _plugins_loaded:
+        return
+    _plugins_loaded = True
+    for entry_point in entry_points(group=PLUGIN_GROUP):
+        try:
+            plugin = entry_point.load()
+            if callable(plugin):
+                plugin(REGISTRIES)
+        except Exception as e:
+            print(f"Warning: Could not load block plugin '{entry_point.name}': {e}")
+
+def block_timer(timings):
+    """
+    Probe factory accumulating wall time per (format, block_type) into `timings`.
+    Usage: set_block_probe(block_timer(timings)).
+    """
+    @contextmanager
+    def probe(fmt, block_type):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry = timings.setdefault((fmt, block_type), [0, 0.0])
+            entry[0] += 1
+            entry[1] += time.perf_counter() - start
+    return probe
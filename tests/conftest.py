@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The build scripts (generate.py, build_blog.py, ...) live in the project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
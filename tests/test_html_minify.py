@@ -0,0 +1,34 @@
+from engine.html_minify import minify_css, minify_html
+
+def test_raw_elements_are_preserved():
+    html = ('<div>\n  <pre>  a\n   b </pre>\n<textarea>  x  </textarea>\n'
+            '<script>\n if (a  <  b) {}\n</script>\n</div>')
+    assert minify_html(html) == ('<div><pre>  a\n   b </pre><textarea>  x  </textarea> '
+                                 '<script>\n if (a  <  b) {}\n</script></div>')
+
+def test_style_blocks_are_minified_as_css():
+    html = '<style> .a  { color : red } p { margin : 0 } </style><p class="a">x</p>'
+    assert minify_html(html) == '<style>.a{color:red}p{margin:0}</style><p class="a">x</p>'
+
+def test_whitespace_collapses_inline_and_drops_at_blocks():
+    html = '<div>\n  <p>Hello   <b>bold</b>   <i>it</i>\n</p>\n</div>'
+    assert minify_html(html) == '<div><p>Hello <b>bold</b> <i>it</i></p></div>'
+
+def test_unused_classes_are_pruned():
+    html = ('<style>.used{color:red}.unused{color:blue}.used .unused{top:0}p{margin:0}</style>'
+            '<p class="used">x</p>')
+    assert minify_html(html) == '<style>.used{color:red}p{margin:0}</style><p class="used">x</p>'
+    assert '.unused{color:blue}' in minify_html(html, prune_css=False)
+
+def test_pages_with_scripts_keep_every_rule():
+    html = ('<style>.used{color:red}.unused{color:blue}</style><p class="used">x</p>'
+            '<script>el.classList.add("unused")</script>')
+    assert '.unused{color:blue}' in minify_html(html)
+
+def test_fallback_declarations_are_kept():
+    css = '.a{height:100vh;height:100dvh}.b{display:block;display:grid}'
+    assert minify_css(css) == css
+    assert minify_css('.a{color:red;color:red!important}') == '.a{color:red;color:red!important}'
+
+def test_repeated_declarations_are_dropped():
+    assert minify_css('.a{color:red;top:0;color:red}.a{top:0}') == '.a{color:red}.a{top:0}'
@@ -0,0 +1,58 @@
+from engine.manifest import BuildManifest
+from generate import job_options
+
+PDF_OPTIONS = {'engine': 'wkhtmltopdf', 'workers': 0, 'defer': False}
+RENDER_OPTIONS = {'external_css': False, 'minify': True, 'docx_writer': 'python-docx'}
+
+def make_manifest(tmp_path):
+    (tmp_path / 'style.yaml').write_text('theme: {}\n', encoding='utf-8')
+    (tmp_path / 'store.yaml').write_text('{}\n', encoding='utf-8')
+    (tmp_path / 'layout.yaml').write_text('sections: []\n', encoding='utf-8')
+    (tmp_path / 'out.html').write_text('<p></p>', encoding='utf-8')
+    return BuildManifest(tmp_path / 'manifest.json', tmp_path)
+
+def record(manifest, tmp_path, key, options):
+    files = [tmp_path / 'style.yaml', tmp_path / 'store.yaml', tmp_path / 'layout.yaml']
+    manifest.record(key, tmp_path / 'out.html', files, 'code', {}, {}, [], options)
+    manifest.save()
+
+def is_fresh(tmp_path, key, options):
+    manifest = BuildManifest(tmp_path / 'manifest.json', tmp_path)
+    files = [tmp_path / 'style.yaml', tmp_path / 'store.yaml', tmp_path / 'layout.yaml']
+    return manifest.is_fresh(key, files, 'code', dict, dict, tmp_path / 'style.yaml',
+                             [tmp_path / 'store.yaml'], options)
+
+def test_unchanged_options_are_fresh(tmp_path):
+    options = job_options(('resume', 'html'), PDF_OPTIONS, RENDER_OPTIONS)
+    record(make_manifest(tmp_path), tmp_path, 'resume/html', options)
+    assert is_fresh(tmp_path, 'resume/html', options)
+
+def test_external_css_switch_rebuilds_html(tmp_path):
+    record(make_manifest(tmp_path), tmp_path, 'resume/html',
+           job_options(('resume', 'html'), PDF_OPTIONS, RENDER_OPTIONS))
+    external = dict(RENDER_OPTIONS, external_css=True)
+    assert not is_fresh(tmp_path, 'resume/html', job_options(('resume', 'html'), PDF_OPTIONS, external))
+
+def test_minify_switch_rebuilds_html(tmp_path):
+    record(make_manifest(tmp_path), tmp_path, 'resume/html',
+           job_options(('resume', 'html'), PDF_OPTIONS, RENDER_OPTIONS))
+    unminified = dict(RENDER_OPTIONS, minify=False)
+    assert not is_fresh(tmp_path, 'resume/html', job_options(('resume', 'html'), PDF_OPTIONS, unminified))
+
+def test_docx_writer_switch_rebuilds_docx(tmp_path):
+    record(make_manifest(tmp_path), tmp_path, 'resume/docx',
+           job_options(('resume', 'docx'), PDF_OPTIONS, RENDER_OPTIONS))
+    streaming = dict(RENDER_OPTIONS, docx_writer='streaming')
+    assert not is_fresh(tmp_path, 'resume/docx', job_options(('resume', 'docx'), PDF_OPTIONS, streaming))
+    # The DOCX writer does not affect other formats
+    record(make_manifest(tmp_path), tmp_path, 'resume/md', job_options(('resume', 'md'), PDF_OPTIONS, RENDER_OPTIONS))
+    assert is_fresh(tmp_path, 'resume/md', job_options(('resume', 'md'), PDF_OPTIONS, streaming))
+
+def test_pdf_engine_switch_rebuilds_pdf(tmp_path):
+    record(make_manifest(tmp_path), tmp_path, 'resume/pdf',
+           job_options(('resume', 'pdf'), PDF_OPTIONS, RENDER_OPTIONS))
+    weasyprint = dict(PDF_OPTIONS, engine='weasyprint')
+    assert not is_fresh(tmp_path, 'resume/pdf', job_options(('resume', 'pdf'), weasyprint, RENDER_OPTIONS))
+    # The renderer pool size only changes how PDFs are scheduled, not their content
+    pooled = dict(PDF_OPTIONS, workers=4, defer=True)
+    assert is_fresh(tmp_path, 'resume/pdf', job_options(('resume', 'pdf'), pooled, RENDER_OPTIONS))
@@ -0,0 +1,33 @@
+import markdown
+
+from engine import markdown_cache
+from engine.markdown_cache import MARKDOWN_EXTENSIONS, convert_markdown
+
+TEXT = """# Post
+
+```python
+def add(a, b):
+    return a + b
+```
+
+```{.js .wide hl_lines="2"}
+const a = 1;
+const b = 2;
+```
+
+    :::python
+    print("indented")
+"""
+
+def test_output_matches_python_markdown():
+    assert convert_markdown(TEXT) == markdown.markdown(TEXT, extensions=MARKDOWN_EXTENSIONS)
+
+def test_repeated_snippets_are_highlighted_once(monkeypatch):
+    calls = []
+    hilite = markdown_cache.CodeHilite.hilite
+    monkeypatch.setattr(markdown_cache, '_highlight_cache', {})
+    monkeypatch.setattr(markdown_cache.CodeHilite, 'hilite', lambda self, shebang=True: calls.append(1) or hilite(self, shebang))
+    first = convert_markdown(TEXT)
+    assert len(calls) == 3
+    assert convert_markdown(TEXT) == first
+    assert len(calls) == 3
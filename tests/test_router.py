@@ -0,0 +1,61 @@
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+ROUTER_JS = Path(__file__).resolve().parent.parent / 'assets' / 'js' / 'router.js'
+
+BLOG_INDEX = {'page_size': 10, 'posts': 25, 'pages': 3, 'tags': [
+    {'name': 'SPA', 'slug': 'spa', 'posts': 12, 'pages': 2},
+    {'name': 'Serverless', 'slug': 'serverless', 'posts': 1, 'pages': 1},
+]}
+
+# Loads router.js in Node with a stubbed DOM and fetch (serving `index` as
+# components/blog/index.json, or a 404 when it is null), then prints the
+# components resolveComponents returns for each page name.
+NODE_HARNESS = """
+const fs = require('fs');
+const [script, index, pages] = process.argv.slice(1);
+globalThis.document = { addEventListener() {} };
+globalThis.window = { addEventListener() {} };
+globalThis.fetch = async () => JSON.parse(index) === null
+    ? { ok: false }
+    : { ok: true, json: async () => JSON.parse(index) };
+eval(fs.readFileSync(script, 'utf8') + '\\nglobalThis.resolveComponents = resolveComponents;');
+(async () => {
+    const results = [];
+    for (const page of JSON.parse(pages)) {
+        results.push(await resolveComponents(page));
+    }
+    console.log(JSON.stringify(results));
+})();
+"""
+
+def resolve(index, pages):
+    output = subprocess.run(['node', '-e', NODE_HARNESS, str(ROUTER_JS), json.dumps(index), json.dumps(pages)],
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output)
+
+@pytest.mark.skipif(not shutil.which('node'), reason='Node.js is needed to run assets/js/router.js')
+def test_blog_sub_routes_are_checked_against_the_index():
+    results = resolve(BLOG_INDEX, ['blog/3', 'blog/4', 'blog/x', 'blog/tag/spa/2', 'blog/tag/spa/3',
+                                   'blog/tag/serverless', 'blog/tag/unknown', 'cv'])
+    assert results == [
+        ['components/blog/page-3.html'],
+        ['components/blog.html'],
+        ['components/blog.html'],
+        ['components/blog/tag/spa-2.html'],
+        ['components/blog.html'],
+        ['components/blog/tag/serverless.html'],
+        ['components/blog.html'],
+        ['components/cv.html', 'components/downloads.html'],
+    ]
+
+@pytest.mark.skipif(not shutil.which('node'), reason='Node.js is needed to run assets/js/router.js')
+def test_blog_sub_routes_without_an_index():
+    assert resolve(None, ['blog/4', 'blog/tag/unknown']) == [
+        ['components/blog/page-4.html'],
+        ['components/blog/tag/unknown.html'],
+    ]
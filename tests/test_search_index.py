@@ -0,0 +1,56 @@
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from engine.search_index import SearchIndex, STOP_WORDS, tokenize
+
+SEARCH_JS = Path(__file__).resolve().parent.parent / 'assets' / 'js' / 'search.js'
+
+# Loads search.js in Node with a stubbed DOM and fetch, then prints the URLs
+# searchSite returns for each query.
+NODE_HARNESS = """
+const fs = require('fs');
+const [script, indexPath, queries] = process.argv.slice(1);
+globalThis.document = { addEventListener() {} };
+globalThis.fetch = async () => ({ ok: true, json: async () => JSON.parse(fs.readFileSync(indexPath, 'utf8')) });
+eval(fs.readFileSync(script, 'utf8') + '\\nglobalThis.searchSite = searchSite;');
+(async () => {
+    const results = [];
+    for (const query of JSON.parse(queries)) {
+        results.push((await searchSite(query)).map(result => result.url).sort());
+    }
+    console.log(JSON.stringify(results));
+})();
+"""
+
+def build_index(tmp_path):
+    index = SearchIndex(tmp_path / 'search-index.json')
+    index.add('blog/pipeline.html', 'SageMaker Pipeline', 'Training the model in the pipeline', 'blog')
+    index.add('blog/ml.html', 'Machine Learning Realities', 'Machine learning and the data behind it', 'blog')
+    index.save()
+    return index.path
+
+def search(index_path, queries):
+    output = subprocess.run(['node', '-e', NODE_HARNESS, str(SEARCH_JS), str(index_path), json.dumps(queries)],
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output)
+
+def test_stop_words_are_not_indexed_and_are_shipped(tmp_path):
+    data = json.loads(build_index(tmp_path).read_text(encoding='utf-8'))
+    assert 'the' not in tokenize('the pipeline')
+    assert set(data['stop_words']) == STOP_WORDS
+    assert not STOP_WORDS & set(data['terms'])
+
+@pytest.mark.skipif(not shutil.which('node'), reason='Node.js is needed to run assets/js/search.js')
+def test_query_with_stop_words_matches(tmp_path):
+    index_path = build_index(tmp_path)
+    results = search(index_path, ['the pipeline', 'machine and learning ', 'the ', 'pipe'])
+    assert results == [
+        ['blog/pipeline.html'],
+        ['blog/ml.html'],
+        [],
+        ['blog/pipeline.html'],
+    ]
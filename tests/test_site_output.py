@@ -0,0 +1,77 @@
+import json
+
+from build_site import build_site
+from engine.site_fingerprint import Fingerprinter
+from engine.site_output import copy_sources
+from generate_sitemap import generate_sitemap
+
+INDEX = '<link rel="stylesheet" href="assets/css/style.css"><script src="assets/js/main.js"></script>'
+
+def make_site(tmp_path):
+    source = tmp_path / 'src'
+    (source / 'assets' / 'css').mkdir(parents=True)
+    (source / 'assets' / 'js').mkdir(parents=True)
+    (source / 'index.html').write_text(INDEX, encoding='utf-8')
+    (source / 'README.md').write_text('notes', encoding='utf-8')
+    (source / 'assets' / 'js' / 'main.js').write_text('main();', encoding='utf-8')
+    return source
+
+def build(source, css):
+    (source / 'assets' / 'css' / 'style.css').write_text(css, encoding='utf-8')
+    site = source.parent / '_site'
+    copy_sources(source, site)
+    return site, Fingerprinter(site).run()['assets/css/style.css']
+
+def test_build_leaves_sources_untouched(tmp_path):
+    source = make_site(tmp_path)
+    site, hashed = build(source, 'body{}')
+    assert (source / 'index.html').read_text(encoding='utf-8') == INDEX
+    assert not list(source.glob('assets/css/style.*.css'))
+    assert hashed in (site / 'index.html').read_text(encoding='utf-8')
+    assert not (site / 'README.md').exists()
+
+def test_previous_hashed_copies_are_kept_for_one_build(tmp_path):
+    source = make_site(tmp_path)
+    site, first = build(source, 'body{color:red}')
+    _, second = build(source, 'body{color:blue}')
+    assert (site / first).exists() and (site / second).exists()
+    _, third = build(source, 'body{color:green}')
+    assert not (site / first).exists()
+    assert (site / second).exists() and (site / third).exists()
+
+def test_removed_sources_are_removed_from_the_site(tmp_path):
+    source = make_site(tmp_path)
+    site, _ = build(source, 'body{}')
+    (source / 'assets' / 'js' / 'main.js').unlink()
+    build(source, 'body{}')
+    assert not (site / 'assets' / 'js' / 'main.js').exists()
+
+def test_sitemap_lists_only_pages_under_its_root(tmp_path):
+    (tmp_path / 'assets' / 'js').mkdir(parents=True)
+    (tmp_path / 'assets' / 'js' / 'router.js').write_text(
+        "const routes = { 'home': ['components/resume.html'], 'cv': ['components/cv.html'] };", encoding='utf-8')
+    (tmp_path / 'blog').mkdir()
+    (tmp_path / 'blog' / 'post.html').write_text('<p></p>', encoding='utf-8')
+    generate_sitemap(tmp_path)
+    sitemap = (tmp_path / 'sitemap.xml').read_text(encoding='utf-8')
+    assert '/blog/post.html' in sitemap and '/cv/' not in sitemap
+    (tmp_path / 'cv').mkdir()
+    (tmp_path / 'cv' / 'index.html').write_text('<p></p>', encoding='utf-8')
+    generate_sitemap(tmp_path)
+    assert '/cv/' in (tmp_path / 'sitemap.xml').read_text(encoding='utf-8')
+
+def test_bundles_reference_hashed_assets(tmp_path):
+    source = make_site(tmp_path)
+    (source / 'index.html').write_text(INDEX + '<main id="content-area"></main>', encoding='utf-8')
+    (source / 'assets' / 'css' / 'style.css').write_text('body{}', encoding='utf-8')
+    (source / 'assets' / 'js' / 'router.js').write_text(
+        "const routes = { 'home': ['components/about.html'] };", encoding='utf-8')
+    (source / 'components').mkdir()
+    (source / 'components' / 'about.html').write_text('<img src="assets/img/me.png">', encoding='utf-8')
+    (source / 'assets' / 'img').mkdir()
+    (source / 'assets' / 'img' / 'me.png').write_bytes(b'png')
+    build_site(source, jobs=1)
+    site = source / '_site'
+    hashed = json.loads((site / 'assets' / 'asset-manifest.json').read_text(encoding='utf-8'))['assets/img/me.png']
+    bundle = json.loads((site / 'assets' / 'bundles' / 'manifest.json').read_text(encoding='utf-8'))['home']
+    assert hashed in (site / bundle).read_text(encoding='utf-8')